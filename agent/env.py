@@ -0,0 +1,325 @@
+import contextlib
+import multiprocessing
+
+import numpy as np
+
+from src.board import Board
+from src.clock import SimulationClock
+from src.config import get as get_config
+from src.game_state import GameState, current_game_state
+from src.map_loader import GENERATED_MAP, load_map
+from src.randomness import RandomStreams
+from src.observation import ObservationBuilder
+from agent.scheduler import JobScheduler
+from agent.replay import Recorder, config_settings
+
+# Entries of the observation vector, in order
+OBSERVATION_FIELDS = ('wood', 'food', 'score', 'wood_workers', 'food_workers', 'trees', 'berry_bushes', 'minutes')
+# Roles an action can give a villager; None keeps the scheduler's choice
+ROLES = ('wood', 'food')
+
+
+class EmpireEnv:
+    """Gym-style environment over a headless Board.
+
+    reset(seed) builds a fresh world and returns the first observation;
+    step(actions) runs ticks_per_step simulation ticks and returns
+    (obs, reward, done, info). An action holds one entry per villager: 0 to
+    chop wood, 1 to gather food, None to leave the villager to the job
+    scheduler; None as a whole leaves everything to the scheduler. The
+    reward is the score gained during the step, and an episode is done when
+    every resource has been delivered or after max_steps steps.
+
+    With observation='grid' the observation is the read-only
+    (channels, rows, cols) tensor of an ObservationBuilder instead of the
+    OBSERVATION_FIELDS vector; it is the live tensor, updated in place by
+    the next step, so copy it to keep it. out gives the builder an array
+    to build into.
+
+    The world and the run only depend on the seed and the actions;
+    record(path) logs an episode for agent.replay. On the generated map
+    each episode's world is built from the reset() seed, unless world_seed
+    fixes it; other maps are the same for every seed.
+
+    Each environment keeps its own GameState; activate() swaps it into the
+    shared current_game_state, so several environments can live in one
+    process as long as only one steps at a time. reset() and step() enforce
+    that: activating another environment while one of them runs raises
+    RuntimeError. Everything a step changes (game state, board, units and
+    their animation clock) belongs to the environment; the process-wide
+    asset, map, animation, text and health bar caches that environments share
+    only hold images that are never modified, so sharing them cannot leak
+    one run into another.
+    """
+
+    # The environment whose reset() or step() is running
+    _running = None
+
+    def __init__(self, map_name=None, villagers=None, food_share=None, ticks_per_step=15, max_steps=2000,
+                 observation='vector', workers_per_resource=None, world_seed=None):
+        if observation not in ('vector', 'grid'):
+            raise ValueError(f"observation must be 'vector' or 'grid', not {observation!r}")
+        self.map_name = map_name or get_config('SELECTED_MAP', 'map_1')
+        self.villagers = get_config('VILLAGERS', 1) if villagers is None else villagers
+        self.food_share = get_config('FOOD_SHARE', 0.0) if food_share is None else food_share
+        self.workers_per_resource = (get_config('WORKERS_PER_RESOURCE', 1) if workers_per_resource is None
+                                     else workers_per_resource)
+        self.fps = get_config('FPS', 60)
+        self.ticks_per_step = ticks_per_step
+        self.max_steps = max_steps
+        self.observation = observation
+        self.world_seed = world_seed
+        self.state = GameState()
+        self.board = None
+        self.scheduler = None
+        self.builder = None
+        self.out = None
+        self.recorder = None
+        self.steps = 0
+
+    def activate(self):
+        # Every module reads the same current_game_state object; give it
+        # this environment's attributes. Swapping them mid-step would leave
+        # the rest of the running environment's step acting on this world
+        running = EmpireEnv._running
+        if running is not None and running is not self:
+            raise RuntimeError("another EmpireEnv is running; environments in one process must step one at a time")
+        current_game_state.__dict__ = self.state.__dict__
+
+    @contextlib.contextmanager
+    def _running_alone(self):
+        self.activate()
+        EmpireEnv._running = self
+        try:
+            yield
+        finally:
+            EmpireEnv._running = None
+
+    def reset(self, seed=None):
+        self.close_recording()
+        self.state = GameState()
+        self.state.random = RandomStreams(seed)
+        with self._running_alone():
+            width, height, tile_size, world_map = load_map(self.map_name, self.episode_world_seed())
+            state = self.state
+            state.WIDTH, state.HEIGHT, state.TILE_SIZE, state.WORLD_MAP = width, height, tile_size, world_map
+            state.MAP_NAME = self.map_name
+            state.clock = SimulationClock(self.fps)
+            self.board = Board(headless=True, villagers=self.villagers)
+            self.scheduler = JobScheduler(self.food_share, self.workers_per_resource)
+            self.scheduler.sync()
+            if self.observation == 'grid':
+                self.builder = ObservationBuilder(self.board, self.out)
+        self.steps = 0
+        return self.observe()
+
+    def step(self, actions=None):
+        score = self.state.score
+        board, scheduler, clock, recorder = self.board, self.scheduler, self.state.clock, self.recorder
+        with self._running_alone():
+            if actions is not None:
+                scheduler.set_roles([None if action is None else ROLES[action] for action in actions])
+            for _ in range(self.ticks_per_step):
+                board.run()
+                scheduler.run()
+                if recorder is not None:
+                    recorder.tick(self.state, board)
+                clock.advance()
+        self.steps += 1
+        depleted = not board.tree_sprites and not board.berry_bush_sprites and not any(
+            scheduler.is_carrying(job) for job in scheduler.jobs.values())
+        truncated = self.steps >= self.max_steps
+        info = scheduler.metrics()
+        info['truncated'] = truncated and not depleted
+        return self.observe(), self.state.score - score, depleted or truncated, info
+
+    def episode_world_seed(self):
+        """Seed of this episode's generated world; None for other maps."""
+        if self.map_name != GENERATED_MAP:
+            return None
+        return self.state.random.seed if self.world_seed is None else self.world_seed
+
+    def settings(self):
+        """What it takes to build this episode's world again."""
+        settings = {'map_name': self.map_name, 'seed': self.state.random.seed, 'villagers': self.villagers,
+                    'food_share': self.food_share, 'workers_per_resource': self.workers_per_resource,
+                    'fps': self.fps, **config_settings(self.map_name)}
+        if self.map_name == GENERATED_MAP:
+            # The world comes from world_seed, not from the configured WORLD_SEED
+            del settings['WORLD_SEED']
+            settings['world_seed'] = self.episode_world_seed()
+        return settings
+
+    def record(self, path):
+        """Log the actions and the per-tick state checksums of this episode
+        to path; call right after reset(). The log is closed by the next
+        reset() or close_recording()."""
+        if self.steps:
+            raise RuntimeError("record() must be called before the first step of an episode")
+        self.close_recording()
+        self.recorder = self.scheduler.recorder = Recorder(path, self.settings())
+
+    def close_recording(self):
+        if self.recorder is not None:
+            self.recorder.close()
+            self.recorder = self.scheduler.recorder = None
+
+    def observe(self):
+        if self.builder is not None:
+            self.builder.sync()
+            return self.builder.observation()
+        metrics = self.scheduler.metrics()
+        state, board = self.state, self.board
+        return np.array([
+            state.wood, state.food, state.score, metrics['wood_workers'], metrics['food_workers'],
+            len(board.tree_sprites), len(board.berry_bush_sprites), state.clock.get_ticks() / 60000,
+        ], dtype=np.float32)
+
+
+class SyncVectorEnv:
+    """N independent environments stepped in lockstep in this process.
+
+    Environment i starts from seed + i. Finished environments are reset on
+    the spot with their seed advanced by stride (default count), and the
+    observation returned for them is the first one of the new episode, as
+    in Gym's vector environments.
+
+    With grid observations every environment builds into its own slot of
+    one (count, channels, rows, cols) array, and reset() and step() return
+    a read-only view of it rather than stacking copies.
+    """
+
+    def __init__(self, count, seed=0, stride=None, **env_options):
+        self.envs = [EmpireEnv(**env_options) for _ in range(count)]
+        self.seeds = [seed + index for index in range(count)]
+        self.stride = stride or count
+        self.batch = None
+
+    def _share_batch(self):
+        # Move every builder into its slot of one batch array, once
+        shape = (len(self.envs),) + self.envs[0].builder.tensor.shape
+        self.batch = np.zeros(shape, dtype=np.float32)
+        for env, out in zip(self.envs, self.batch):
+            env.activate()
+            env.builder.detach()
+            env.out = out
+            env.builder = ObservationBuilder(env.board, out)
+
+    def _stack(self, observations):
+        if self.envs[0].observation != 'grid':
+            return np.stack(observations)
+        if self.batch is None:
+            self._share_batch()
+        view = self.batch.view()
+        view.flags.writeable = False
+        return view
+
+    def __len__(self):
+        return len(self.envs)
+
+    def reset(self, seed=None):
+        if seed is not None:
+            self.seeds = [seed + index for index in range(len(self.envs))]
+        return self._stack([env.reset(seed) for env, seed in zip(self.envs, self.seeds)])
+
+    def step(self, actions=None):
+        if actions is None:
+            actions = [None] * len(self.envs)
+        observations, rewards, dones, infos = [], [], [], []
+        # Strictly one environment after the other: they share
+        # current_game_state, and EmpireEnv.activate() raises if another
+        # environment is still running
+        for index, (env, action) in enumerate(zip(self.envs, actions)):
+            obs, reward, done, info = env.step(action)
+            if done:
+                self.seeds[index] += self.stride
+                obs = env.reset(self.seeds[index])
+            observations.append(obs)
+            rewards.append(reward)
+            dones.append(done)
+            infos.append(info)
+        return self._stack(observations), np.array(rewards, dtype=np.float32), np.array(dones), infos
+
+    def close(self):
+        pass
+
+
+def _serve(connection, count, seed, stride, env_options):
+    # Worker process: hosts a SyncVectorEnv and answers commands until closed
+    envs = SyncVectorEnv(count, seed, stride, **env_options)
+    try:
+        while True:
+            command, data = connection.recv()
+            if command == 'reset':
+                connection.send(envs.reset(data))
+            elif command == 'step':
+                connection.send(envs.step(data))
+            else:
+                break
+    finally:
+        connection.close()
+
+
+class ProcessVectorEnv:
+    """N environments spread over worker processes, stepped in lockstep.
+
+    Each worker hosts a contiguous block of environments as a SyncVectorEnv;
+    step() sends every worker its block of actions first and then collects
+    the results, so workers on different cores can simulate at the same
+    time. Every step pickles each environment's observation, reward and
+    full info dict back to this process, which can outweigh the gain for
+    short steps or small grids, and on one core the workers only take
+    turns; measure with benchmarks.vector_env before choosing workers.
+    """
+
+    def __init__(self, count, workers=None, seed=0, **env_options):
+        workers = min(workers or multiprocessing.cpu_count() or 1, count)
+        sizes = [count // workers + (index < count % workers) for index in range(workers)]
+        self.blocks = []
+        self.connections = []
+        self.processes = []
+        start = 0
+        for size in sizes:
+            parent, child = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=_serve, args=(child, size, seed + start, count, env_options), daemon=True)
+            process.start()
+            child.close()
+            self.blocks.append((start, start + size))
+            self.connections.append(parent)
+            self.processes.append(process)
+            start += size
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def reset(self, seed=None):
+        for (start, _), connection in zip(self.blocks, self.connections):
+            connection.send(('reset', None if seed is None else seed + start))
+        return np.concatenate([connection.recv() for connection in self.connections])
+
+    def step(self, actions=None):
+        for (start, stop), connection in zip(self.blocks, self.connections):
+            connection.send(('step', None if actions is None else list(actions[start:stop])))
+        results = [connection.recv() for connection in self.connections]
+        infos = [info for result in results for info in result[3]]
+        return (np.concatenate([result[0] for result in results]), np.concatenate([result[1] for result in results]),
+                np.concatenate([result[2] for result in results]), infos)
+
+    def close(self):
+        for connection in self.connections:
+            try:
+                connection.send(('close', None))
+            except (BrokenPipeError, OSError):
+                pass
+            connection.close()
+        for process in self.processes:
+            process.join()
+
+
+def make_vector_env(count, workers=1, seed=0, **env_options):
+    """count environments stepped in this process (workers=1) or spread
+    over that many worker processes (workers=0: one per core)."""
+    if workers == 1:
+        return SyncVectorEnv(count, seed, **env_options)
+    return ProcessVectorEnv(count, workers or None, seed, **env_options)
@@ -0,0 +1,183 @@
+import argparse
+import json
+import struct
+import time
+import zlib
+
+import numpy as np
+
+from src.config import get as get_config
+from src.map_loader import GENERATED_MAP
+
+MAGIC = b'EREC'
+VERSION = 1
+# magic, version, length of the JSON settings that follow
+HEADER = struct.Struct('<4sHI')
+# After every tick: tag, state checksum
+TICK = struct.Struct('<cI')
+# Before a tick: tag, tick, villager count; followed by one role code per villager
+ACTIONS = struct.Struct('<cIH')
+TICK_TAG = b'T'
+ACTIONS_TAG = b'A'
+# Role codes of the action records; 255 leaves the villager to the scheduler
+ROLE_CODES = {'wood': 0, 'food': 1, None: 255}
+ROLE_NAMES = {code: role for role, code in ROLE_CODES.items()}
+# score, wood, food, revealed cells, trees, berry bushes, wood and berries left on damaged resources
+SUMMARY = struct.Struct('<dqqqqqq')
+# Config settings that change the run, with the defaults their readers use;
+# the WORLD_* ones only matter for the generated map
+RUN_CONFIG = {'FOG_OF_WAR': True}
+GENERATED_CONFIG = {'WORLD_ROWS': 64, 'WORLD_COLS': 64, 'WORLD_TILE_SIZE': 48, 'WORLD_SEED': 0}
+
+
+class RecordingError(ValueError):
+    pass
+
+
+def state_checksum(state, board):
+    """CRC32 of what a tick can change: unit positions, health and liveness,
+    the stockpile and score, the fog and the resources left."""
+    units = board.units
+    n = units.used
+    checksum = zlib.crc32(units.pos[:, :n].tobytes())
+    checksum = zlib.crc32(units.health[:n].tobytes(), checksum)
+    checksum = zlib.crc32(units.alive[:n].tobytes(), checksum)
+    left = sum(getattr(resource, 'wood', 0) + getattr(resource, 'berries', 0)
+               for resource in board.damaged_resources)
+    summary = SUMMARY.pack(state.score, state.wood, state.food, board.fog.revealed_count,
+                           len(board.tree_index), len(board.berry_bush_index), left)
+    return zlib.crc32(summary, checksum)
+
+
+def config_settings(map_name):
+    """The current values of the config settings a run of map_name depends on."""
+    keys = dict(RUN_CONFIG)
+    if map_name == GENERATED_MAP:
+        keys.update(GENERATED_CONFIG)
+    return {key: get_config(key, default) for key, default in keys.items()}
+
+
+def check_config(settings):
+    """Raise RecordingError if a config setting recorded in settings differs
+    from the current one; the replay would build a different world."""
+    current = config_settings(settings['map_name'])
+    differ = [f"{key} recorded {settings[key]!r}, configured {value!r}"
+              for key, value in current.items() if key in settings and settings[key] != value]
+    if differ:
+        raise RecordingError("recorded with different settings: " + "; ".join(differ))
+
+
+class Recorder:
+    """Writes a run to a compact binary log as it happens.
+
+    The header holds the settings needed to build the same world again
+    (map, seed, villagers, economy settings, FPS and the config settings of
+    config_settings()) as JSON. Then come, in
+    tick order, the roles the scheduler was given before a tick (7 bytes
+    plus one per villager, only when roles are given) and the state
+    checksum after every tick (5 bytes). Hand the recorder to a
+    JobScheduler as its recorder and call tick() after every tick.
+    """
+
+    def __init__(self, path, settings):
+        self.file = open(path, 'wb')
+        header = json.dumps(settings, sort_keys=True).encode()
+        self.file.write(HEADER.pack(MAGIC, VERSION, len(header)) + header)
+        self.ticks = 0
+
+    def actions(self, roles):
+        codes = bytes(ROLE_CODES[role] for role in roles)
+        self.file.write(ACTIONS.pack(ACTIONS_TAG, self.ticks, len(codes)) + codes)
+
+    def tick(self, state, board):
+        self.file.write(TICK.pack(TICK_TAG, state_checksum(state, board)))
+        self.ticks += 1
+
+    def close(self):
+        self.file.close()
+
+
+def read_recording(path):
+    """(settings, actions, checksums) of a log: actions maps a tick to the
+    roles given before it, checksums is a uint32 array with one entry per
+    recorded tick."""
+    with open(path, 'rb') as file:
+        data = file.read()
+    if len(data) < HEADER.size:
+        raise RecordingError(f"{path}: not a recording")
+    magic, version, length = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise RecordingError(f"{path}: not a version {VERSION} recording")
+    offset = HEADER.size + length
+    settings = json.loads(data[HEADER.size:offset])
+    actions = {}
+    checksums = []
+    while offset < len(data):
+        tag = data[offset:offset + 1]
+        if tag == TICK_TAG and offset + TICK.size <= len(data):
+            checksums.append(TICK.unpack_from(data, offset)[1])
+            offset += TICK.size
+        elif tag == ACTIONS_TAG and offset + ACTIONS.size <= len(data):
+            _, tick, count = ACTIONS.unpack_from(data, offset)
+            offset += ACTIONS.size
+            actions[tick] = [ROLE_NAMES[code] for code in data[offset:offset + count]]
+            offset += count
+        else:
+            # A run killed mid-write leaves a partial record; keep what came before
+            break
+    return settings, actions, np.array(checksums, dtype=np.uint32)
+
+
+def replay(path, ticks=None):
+    """Run a recording again headless, as fast as possible.
+
+    Returns (checksums, expected, ticks per second), where checksums are the
+    state checksums of the replay, one per tick, and expected the recorded
+    ones; they differ from the first tick at which the simulation no longer
+    behaves as it did when recorded. Raises RecordingError when the config
+    settings the run depends on (fog of war, generated world) differ from
+    the recorded ones.
+    """
+    from agent.env import EmpireEnv
+
+    settings, actions, expected = read_recording(path)
+    check_config(settings)
+    if ticks is not None:
+        expected = expected[:ticks]
+    # Runs of main.py build the generated world from WORLD_SEED
+    env = EmpireEnv(settings['map_name'], settings['villagers'], settings['food_share'],
+                    workers_per_resource=settings['workers_per_resource'],
+                    world_seed=settings.get('world_seed', settings.get('WORLD_SEED')))
+    env.fps = settings['fps']
+    env.reset(settings['seed'])
+    state, board, scheduler, clock = env.state, env.board, env.scheduler, env.state.clock
+    checksums = np.empty(len(expected), dtype=np.uint32)
+    start = time.perf_counter()
+    for tick in range(len(expected)):
+        roles = actions.get(tick)
+        if roles is not None:
+            scheduler.set_roles(roles)
+        board.run()
+        scheduler.run()
+        checksums[tick] = state_checksum(state, board)
+        clock.advance()
+    elapsed = time.perf_counter() - start
+    return checksums, expected, len(expected) / elapsed if elapsed > 0 else float('inf')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Replay a recorded run and compare state checksums.")
+    parser.add_argument('recording')
+    parser.add_argument('--ticks', type=int, help="replay only the first TICKS ticks")
+    parser.add_argument('--checksums', action='store_true', help="print the checksum of every tick")
+    args = parser.parse_args()
+    checksums, expected, tps = replay(args.recording, args.ticks)
+    if args.checksums:
+        for tick, (checksum, recorded) in enumerate(zip(checksums.tolist(), expected.tolist())):
+            print(f"{tick} {checksum:08x}" + ('' if checksum == recorded else f" expected {recorded:08x}"))
+    diverged = np.flatnonzero(checksums != expected)
+    print(f"{len(checksums)} ticks at {tps:.0f} ticks/sec")
+    if len(diverged):
+        print(f"diverged at tick {diverged[0]} ({len(diverged)} ticks differ)")
+    else:
+        print("checksums match")
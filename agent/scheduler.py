@@ -0,0 +1,220 @@
+from src.game_state import current_game_state
+from src.villager.villager import WoodVillager, FoodVillager
+
+# Milliseconds of simulated time per minute, for throughput rates
+MS_PER_MINUTE = 60 * 1000
+
+
+class Job:
+    """What one villager is doing: its resource role ('wood' or 'food'), the
+    tree or berry bush it has reserved (None while it has none) and the role
+    it was told to take (None leaves the choice to the scheduler)."""
+
+    __slots__ = ('villager', 'role', 'target', 'wanted')
+
+    def __init__(self, villager, role):
+        self.villager = villager
+        self.role = role
+        self.target = None
+        self.wanted = None
+
+
+class JobScheduler:
+    """Assigns every villager a chop, gather or haul job each tick.
+
+    Villagers are split between wood and food by food_share. Each tree or
+    berry bush can be reserved by at most workers_per_resource villagers, so
+    workers spread over the nearest free resources instead of all walking to
+    the closest one. Targets are handed out in one batch per tick, to every
+    villager that lost its resource (depleted, unreachable) or just joined.
+    A villager whose kind of resource has run out switches to the other kind
+    once it has dropped what it carries.
+
+    Deliveries go through WoodVillager.drop_wood / FoodVillager.drop_food
+    (and so GameState.add_wood / add_food); metrics() turns them into wood
+    and food per simulated minute.
+    """
+
+    def __init__(self, food_share=0.0, workers_per_resource=1):
+        self.food_share = food_share
+        self.workers_per_resource = workers_per_resource
+        self.jobs = {}
+        self.reservations = {}
+        # Resources no villager could find a route to; retried when an
+        # obstacle disappears
+        self.unreachable = set()
+        self.delivered = {'wood': 0, 'food': 0}
+        self.start_ticks = None
+        self.obstacle_count = None
+        # Logs the roles given by set_roles (see agent.replay.Recorder)
+        self.recorder = None
+
+    def resources(self, role):
+        board = current_game_state.board
+        return board.tree_index if role == 'wood' else board.berry_bush_index
+
+    def enlist(self, villager):
+        # New villagers take the role that is short of its share
+        food_workers = sum(job.role == 'food' for job in self.jobs.values())
+        wanted = round(self.food_share * (len(self.jobs) + 1))
+        role = 'food' if food_workers < wanted else 'wood'
+        self.jobs[villager] = job = Job(villager, role)
+        self.become(job, role)
+        villager.ai_mode = False
+        villager.agent_controlled = True
+        villager.direction.x = 0
+        villager.direction.y = 0
+
+    @staticmethod
+    def become(job, role):
+        job.role = role
+        villager = job.villager
+        if role == 'wood' and not isinstance(villager, WoodVillager):
+            villager.__class__ = WoodVillager
+            villager.init_as_wood_villager()
+        elif role == 'food' and not isinstance(villager, FoodVillager):
+            villager.__class__ = FoodVillager
+            villager.init_as_food_villager()
+
+    def reserve(self, job, resource):
+        job.target = resource
+        self.reservations[resource] = self.reservations.get(resource, 0) + 1
+
+    def release(self, job):
+        resource, job.target = job.target, None
+        if resource is None:
+            return
+        left = self.reservations[resource] - 1
+        if left:
+            self.reservations[resource] = left
+        else:
+            del self.reservations[resource]
+
+    def sync(self):
+        """Enlist new villagers, forget dead ones and free the reservations
+        of depleted resources."""
+        board = current_game_state.board
+        for villager in board.villager_sprites:
+            if villager not in self.jobs:
+                self.enlist(villager)
+        for villager in [villager for villager in self.jobs if not villager.alive()]:
+            self.release(self.jobs.pop(villager))
+        for job in self.jobs.values():
+            if job.target is not None and not job.target.alive():
+                self.release(job)
+        obstacle_count = len(board.tree_index) + len(board.berry_bush_index)
+        if obstacle_count != self.obstacle_count:
+            self.unreachable.clear()
+            self.obstacle_count = obstacle_count
+
+    def free_resource(self, role, x, y):
+        # Nearest resource with room left, widening the search until found
+        index = self.resources(role)
+        total = len(index)
+        k = 4
+        while True:
+            for resource in index.nearest(x, y, k):
+                if resource not in self.unreachable and self.reservations.get(resource, 0) < self.workers_per_resource:
+                    return resource
+            if k >= total:
+                return None
+            k *= 4
+
+    def set_roles(self, roles):
+        """Tell villagers, in enlistment order, which role to take: 'wood',
+        'food' or None to let the scheduler decide. A villager carrying a
+        load delivers it before switching."""
+        if self.recorder is not None:
+            self.recorder.actions(roles)
+        for job, role in zip(self.jobs.values(), roles):
+            job.wanted = role
+
+    def assign(self):
+        """Give every idle villager a target, in one batch."""
+        for job in self.jobs.values():
+            if job.wanted is not None and job.wanted != job.role and not self.is_carrying(job):
+                self.release(job)
+                self.become(job, job.wanted)
+            if job.target is not None or self.is_full(job):
+                continue
+            x, y = job.villager.rect.center
+            resource = self.free_resource(job.role, x, y)
+            if resource is None and job.wanted is None and not self.is_carrying(job):
+                # Rebalance: this kind has run out, help with the other one
+                other = 'food' if job.role == 'wood' else 'wood'
+                resource = self.free_resource(other, x, y)
+                if resource is not None:
+                    self.become(job, other)
+            if resource is not None:
+                self.reserve(job, resource)
+
+    @staticmethod
+    def is_full(job):
+        villager = job.villager
+        return villager.should_drop_wood() if job.role == 'wood' else villager.should_drop_food()
+
+    @staticmethod
+    def is_carrying(job):
+        villager = job.villager
+        return (villager.wood_carried if job.role == 'wood' else villager.food_carried) > 0
+
+    def work(self, job):
+        villager = job.villager
+        if self.is_full(job) or (job.target is None and self.is_carrying(job)):
+            # Haul the load home; a partial one when nothing is left to work
+            villager.working = False
+            villager.walk_home()
+            if villager.is_at_home():
+                dropped = villager.drop_wood() if job.role == 'wood' else villager.drop_food()
+                self.delivered[job.role] += dropped
+            return
+        resource = job.target
+        if resource is None:
+            villager.working = False
+            villager.direction.x = 0
+            villager.direction.y = 0
+            return
+        if job.role == 'wood':
+            if villager.is_at_tree(resource):
+                villager.chopping_wood(resource)
+                return
+            villager.chopping = False
+            walking = villager.walk_to_tree(resource)
+        else:
+            if villager.is_at_berry_bush(resource):
+                villager.gathering_food(resource)
+                return
+            villager.gathering = False
+            walking = villager.walk_to_berry_bush(resource)
+        if not walking:
+            # No route to it: skip it until an obstacle disappears
+            self.unreachable.add(resource)
+            self.release(job)
+            villager.direction.x = 0
+            villager.direction.y = 0
+
+    def run(self):
+        if self.start_ticks is None:
+            self.start_ticks = current_game_state.clock.get_ticks()
+        self.sync()
+        self.assign()
+        for job in self.jobs.values():
+            self.work(job)
+
+    def metrics(self):
+        """Workers per role, reservations and delivered totals, with wood
+        and food per simulated minute since the scheduler started."""
+        elapsed = 0
+        if self.start_ticks is not None:
+            elapsed = current_game_state.clock.get_ticks() - self.start_ticks
+        minutes = elapsed / MS_PER_MINUTE
+        roles = [job.role for job in self.jobs.values()]
+        return {
+            'wood_workers': roles.count('wood'),
+            'food_workers': roles.count('food'),
+            'reserved': len(self.reservations),
+            'wood': self.delivered['wood'],
+            'food': self.delivered['food'],
+            'wood_per_minute': self.delivered['wood'] / minutes if minutes else 0.0,
+            'food_per_minute': self.delivered['food'] / minutes if minutes else 0.0,
+        }
@@ -0,0 +1,47 @@
+"""Scrolling cost of the chunked terrain on worlds of growing size.
+
+Pans a 1280x720 view diagonally across square worlds and reports the time
+per frame and how many chunks are held at the end. With chunked baking
+both stay flat as the world grows; only the first sight of a chunk costs.
+
+Run from the repo root:
+    python -m benchmarks.chunked_terrain
+"""
+import time
+
+import pygame
+
+from src.camera import Camera
+from src.terrain import TerrainLayer
+
+TILE_SIZE = 48
+VIEW_SIZE = (1280, 720)
+WORLD_SIDES = [64, 512, 4096]
+FRAMES = 600
+SPEED = 24
+
+
+def main():
+    tile = pygame.Surface((TILE_SIZE, TILE_SIZE))
+    tile.fill((40, 140, 40))
+
+    def draw_cell(surface, row, col, origin):
+        surface.blit(tile, (col * TILE_SIZE - origin[0], row * TILE_SIZE - origin[1]))
+
+    print(f"{'world':>6} {'ms/frame':>9} {'chunks held':>12} {'baked':>6} {'held MB':>8}")
+    for side in WORLD_SIDES:
+        camera = Camera(VIEW_SIZE, (side * TILE_SIZE, side * TILE_SIZE))
+        terrain = TerrainLayer(camera.rect.size, TILE_SIZE, (side, side), draw_cell)
+        terrain.bake(camera.rect)
+        start = time.perf_counter()
+        for _ in range(FRAMES):
+            camera.move(SPEED, SPEED // 2)
+            terrain.flush(camera.rect)
+        ms = (time.perf_counter() - start) / FRAMES * 1000
+        held = sum(s.get_width() * s.get_height() * s.get_bytesize() for s in terrain.chunks.values())
+        stats = terrain.stats()
+        print(f"{side:6d} {ms:9.3f} {stats['loaded']:12d} {stats['baked']:6d} {held / 2**20:8.1f}")
+
+
+if __name__ == '__main__':
+    main()
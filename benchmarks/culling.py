@@ -0,0 +1,100 @@
+"""Frame cost of view culling as the unit count grows.
+
+Scatters units over a 256x256-tile world, walks them a little every frame
+(so the block index is brought up to date each frame, as after every tick
+of the game) and draws the ones in a fixed 1280x720 view. Compares picking
+the visible units with a mask over every unit, as query_rect did before
+the block index, with UnitStore.query_rect, and times the draw of the
+units the culler submitted. Ends each row with the culler's counters.
+
+Run from the repo root:
+    python -m benchmarks.culling
+"""
+import os
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import numpy as np
+import pygame
+
+from src.camera import Camera
+from src.culling import ViewCuller
+from src.render import LAYER_UNITS, RenderPipeline
+from src.units import UnitStore
+
+TILE_SIZE = 48
+WORLD_SIDE = 256
+VIEW_SIZE = (1280, 720)
+UNIT_SIZE = 32
+UNIT_COUNTS = [100, 1000, 10000, 100000]
+FRAMES = 100
+STEP = 4
+
+
+class Unit:
+    _layer = LAYER_UNITS
+
+    def __init__(self, store, index, image):
+        self.store = store
+        self.index = index
+        self.image = image
+
+    @property
+    def rect(self):
+        return self.store.rect(self.index)
+
+
+def scan_rect(store, rect):
+    # UnitStore.query_rect before the block index: every live unit tested
+    index = store.indices()
+    (x, y), (w, h) = store.pos[:, index], store.size[:, index]
+    inside = (x < rect.right) & (x + w > rect.left) & (y < rect.bottom) & (y + h > rect.top)
+    return [store.owners[i] for i in index[inside].tolist()]
+
+
+def main():
+    pygame.init()
+    screen = pygame.display.set_mode(VIEW_SIZE)
+    background = pygame.Surface(VIEW_SIZE)
+    image = pygame.Surface((UNIT_SIZE, UNIT_SIZE))
+    image.fill((200, 160, 60))
+    world = WORLD_SIDE * TILE_SIZE
+    camera = Camera(VIEW_SIZE, (world, world))
+    camera.center_on(world // 2, world // 2)
+    print(f"{world}x{world} px world, {VIEW_SIZE[0]}x{VIEW_SIZE[1]} view")
+    print(f"{'units':>7} {'scan ms':>8} {'index ms':>9} {'draw ms':>8} {'submitted':>10} {'culled':>8}")
+    for count in UNIT_COUNTS:
+        rng = np.random.default_rng(0)
+        store = UnitStore(count)
+        for x, y in rng.integers(0, world - UNIT_SIZE, size=(count, 2)).tolist():
+            index = store.add((x, y, UNIT_SIZE, UNIT_SIZE), 1)
+            store.owners[index] = Unit(store, index, image)
+        culler = ViewCuller(margin=TILE_SIZE)
+        renderer = RenderPipeline(screen, background, camera.screen_rect())
+        steps = rng.integers(-STEP, STEP + 1, size=(FRAMES, 2, count))
+        scan = index = draw = 0.0
+        for frame in range(FRAMES):
+            store.pos += steps[frame]
+            store.moved()
+            view = camera.rect.inflate(2 * TILE_SIZE, 2 * TILE_SIZE)
+
+            start = time.perf_counter()
+            scan_rect(store, view)
+            scan += time.perf_counter() - start
+
+            start = time.perf_counter()
+            culler.begin_frame()
+            visible = culler.query('units', store, camera.rect, len(store))
+            index += time.perf_counter() - start
+
+            start = time.perf_counter()
+            renderer.render(visible, (), list, lambda: None, camera.offset)
+            draw += time.perf_counter() - start
+        stats = culler.stats()
+        print(f"{count:7d} {scan / FRAMES * 1000:8.3f} {index / FRAMES * 1000:9.3f} "
+              f"{draw / FRAMES * 1000:8.3f} {stats['submitted']:10d} {stats['culled']:8d}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+"""Economy throughput against the number of villagers.
+
+Runs the headless simulation on the generated map, which has trees and
+berry bushes around home, for a few simulated minutes per villager count
+and prints the wood and food delivered per simulated minute by the job
+scheduler, with the simulation speed. Half the villagers gather food; a
+lone villager chops wood, which is what the agent used to control.
+
+Run from the repo root:
+    python -m benchmarks.economy
+"""
+import time
+
+import main as game_main
+from src import config, current_game_state
+from agent import rl_agent
+from agent.scheduler import JobScheduler
+
+MAP_NAME = 'generated'
+VILLAGER_COUNTS = [1, 2, 4, 8, 16]
+MINUTES = 3
+FOOD_SHARE = 0.5
+
+
+def main():
+    config.config['SELECTED_MAP'] = MAP_NAME
+    ticks = MINUTES * 60 * config.get('FPS', 60)
+    print(f"{MAP_NAME}, {MINUTES} simulated minutes")
+    print(f"{'villagers':>9} {'wood/min':>9} {'food/min':>9} {'ticks/sec':>10}")
+    for count in VILLAGER_COUNTS:
+        config.config['VILLAGERS'] = count
+        current_game_state.reset()
+        rl_agent.scheduler = JobScheduler(food_share=FOOD_SHARE)
+        game = game_main.Game(headless=True)
+        start = time.perf_counter()
+        game.run_headless(ticks)
+        elapsed = time.perf_counter() - start
+        metrics = rl_agent.scheduler.metrics()
+        print(f"{count:9d} {metrics['wood_per_minute']:9.1f} {metrics['food_per_minute']:9.1f} {ticks / elapsed:10.0f}")
+
+
+if __name__ == '__main__':
+    main()
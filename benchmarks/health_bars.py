@@ -0,0 +1,84 @@
+"""Frame cost of resource health bars.
+
+A view full of trees of which only a few have been chopped. Compares the
+old overlay pass (every on-screen tree checked with hasattr, each bar drawn
+with three pygame.draw.rect calls) with the damaged-resource set and
+pre-rendered bars (one blit per damaged tree).
+
+Run from the repo root:
+    python -m benchmarks.health_bars
+"""
+import os
+import random
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+
+from src.game_state import current_game_state
+from src.health_bars import health_bars
+
+FRAMES = 200
+TILE_SIZE = 48
+VIEW_SIZE = (1296, 576)
+DAMAGED_COUNTS = [0, 10, 100, 324]
+
+
+class Tree:
+    def __init__(self, rect, wood):
+        self.rect = rect
+        self.wood = wood
+        self.max_wood = 10
+
+    def draw_health_bar_rects(self, surface, offset):
+        # Tree.draw_health_bar before the bar cache
+        bar_width = TILE_SIZE * 0.8
+        bar_x = self.rect.centerx - offset[0] - bar_width // 2
+        bar_y = self.rect.top - offset[1]
+        pygame.draw.rect(surface, (60, 60, 60), (bar_x, bar_y, bar_width, 6))
+        fill_width = int(bar_width * max(0, min(1, self.wood / self.max_wood)))
+        pygame.draw.rect(surface, (139, 69, 19), (bar_x, bar_y, fill_width, 6))
+        return pygame.draw.rect(surface, (255, 255, 255), (bar_x, bar_y, bar_width, 6), 1)
+
+    def draw_health_bar(self, surface, offset):
+        return health_bars.draw(surface, 'tree', self.wood / self.max_wood, self.rect, offset)
+
+
+def main():
+    pygame.init()
+    screen = pygame.display.set_mode(VIEW_SIZE)
+    current_game_state.TILE_SIZE = TILE_SIZE
+    view = screen.get_rect()
+    trees = [Tree(pygame.Rect(col * TILE_SIZE, row * TILE_SIZE, TILE_SIZE, TILE_SIZE), 10)
+             for row in range(VIEW_SIZE[1] // TILE_SIZE) for col in range(VIEW_SIZE[0] // TILE_SIZE)]
+    rng = random.Random(0)
+    print(f"{len(trees)} trees on screen")
+    print(f"{'damaged':>8} {'draw.rect us/frame':>19} {'cached us/frame':>16}")
+    for count in DAMAGED_COUNTS:
+        for tree in trees:
+            tree.wood = tree.max_wood
+        damaged = set(rng.sample(trees, count))
+        for tree in damaged:
+            tree.wood = rng.randint(1, 9)
+
+        start = time.perf_counter()
+        for _ in range(FRAMES):
+            for tree in trees:
+                if hasattr(tree, 'draw_health_bar') and hasattr(tree, 'wood') and hasattr(tree, 'max_wood'):
+                    if tree.wood < tree.max_wood:
+                        tree.draw_health_bar_rects(screen, (0, 0))
+        immediate = (time.perf_counter() - start) / FRAMES * 1e6
+
+        start = time.perf_counter()
+        for _ in range(FRAMES):
+            for tree in damaged:
+                if view.colliderect(tree.rect):
+                    tree.draw_health_bar(screen, (0, 0))
+        cached = (time.perf_counter() - start) / FRAMES * 1e6
+        print(f"{count:8d} {immediate:19.1f} {cached:16.1f}")
+    print(f"health bars: {health_bars.stats()}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""Frame cost of the bottom panel.
+
+Compares drawing the panel immediate-mode, as utils.bottom_panel did
+(font lookup and every label rendered each frame), with the retained
+BottomPanel on frames where nothing changed, where the score changes every
+frame, and where it cycles through the same few values, so labels show
+text they showed before and TextCache hands back the rendered surfaces.
+
+Run from the repo root:
+    python -m benchmarks.hud
+"""
+import math
+import os
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+
+from src.game_state import current_game_state
+from src.hud import BottomPanel, text_cache
+
+FRAMES = 2000
+VIEW_SIZE = (1296, 576)
+PANEL_HEIGHT = 120
+# Score change per frame in each scenario: none, always new, cycling over 10 values
+SCENARIOS = (
+    ('nothing changed', None),
+    ('score changes', lambda frame: 1),
+    ('score repeats', lambda frame: -9 if frame % 10 == 9 else 1),
+)
+
+
+def immediate_panel(surface):
+    # The per-frame work of the old utils.bottom_panel
+    panel_rect = pygame.Rect(0, VIEW_SIZE[1], VIEW_SIZE[0], PANEL_HEIGHT)
+    pygame.draw.rect(surface, (40, 40, 40), panel_rect)
+    font = pygame.font.SysFont(None, 32)
+    y = panel_rect.top + 8
+    surface.blit(font.render(f"Score: {math.ceil(current_game_state.score)}", True, (255, 255, 255)), (16, y))
+    surface.blit(font.render(f"Wood: {current_game_state.wood}", True, (255, 255, 255)), (128, y))
+    surface.blit(font.render(f"Food: {current_game_state.food}", True, (255, 255, 255)), (240, y))
+    return panel_rect
+
+
+def time_frames(draw, change):
+    start = time.perf_counter()
+    for frame in range(FRAMES):
+        if change is not None:
+            current_game_state.update_score(change(frame))
+        draw()
+    return (time.perf_counter() - start) / FRAMES * 1e6
+
+
+def main():
+    pygame.init()
+    screen = pygame.display.set_mode((VIEW_SIZE[0], VIEW_SIZE[1] + PANEL_HEIGHT))
+    current_game_state.VIEW_WIDTH, current_game_state.VIEW_HEIGHT = VIEW_SIZE
+    panel = BottomPanel()
+    print(f"{'frames':>16} {'immediate us':>13} {'retained us':>12}")
+    for name, change in SCENARIOS:
+        current_game_state.reset()
+        immediate = time_frames(lambda: immediate_panel(screen), change)
+        current_game_state.reset()
+        hits = text_cache.hits
+        retained = time_frames(lambda: panel.draw(screen), change)
+        print(f"{name:>16} {immediate:13.1f} {retained:12.1f}")
+        if name == 'score repeats':
+            assert text_cache.hits - hits >= FRAMES - 10, "repeated labels were rendered again"
+    print(f"text cache: {text_cache.stats()}")
+
+
+if __name__ == '__main__':
+    main()
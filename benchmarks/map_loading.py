@@ -0,0 +1,75 @@
+"""Map load time and size: .py map modules vs the binary map format.
+
+Writes square maps of mostly grass with clustered trees, as a .py module
+and as binary maps with each compression, then times loading each one.
+The .py variant is skipped on the largest size, where it gets too slow.
+
+Run from the repo root:
+    python -m benchmarks.map_loading
+"""
+import importlib.util
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from src.map_format import TILE_TYPES, TILE_CODES, read_map, write_map
+
+SIDES = [256, 1024, 4096]
+PY_MAX_SIDE = 1024
+TILE_SIZE = 48
+
+
+def make_tiles(side, seed):
+    rng = np.random.default_rng(seed)
+    # Coarse random blocks of trees so runs are realistic for RLE
+    blocks = rng.random((side // 16 + 1, side // 16 + 1)) < 0.2
+    tiles = np.repeat(np.repeat(blocks, 16, 0), 16, 1)[:side, :side].astype(np.uint8) * TILE_CODES['tree']
+    tiles[side // 2, side // 2] = TILE_CODES['home']
+    return tiles
+
+
+def write_py_map(path, tiles):
+    with open(path, 'w') as f:
+        f.write(f"WIDTH = {tiles.shape[1] * TILE_SIZE}\nHEIGHT = {tiles.shape[0] * TILE_SIZE}\nTILE_SIZE = {TILE_SIZE}\n")
+        f.write("WORLD_MAP = [\n")
+        for row in tiles.tolist():
+            f.write("[" + ",".join(repr(TILE_TYPES[code]) for code in row) + "],\n")
+        f.write("]\n")
+
+
+def load_py_map(path):
+    spec = importlib.util.spec_from_file_location('bench_map', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.WORLD_MAP
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    print(f"{'side':>5} {'format':>8} {'file KB':>10} {'load ms':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for side in SIDES:
+            tiles = make_tiles(side, side)
+            if side <= PY_MAX_SIDE:
+                path = os.path.join(tmp, f'map_{side}.py')
+                write_py_map(path, tiles)
+                _, ms = timed(lambda: load_py_map(path))
+                print(f"{side:5d} {'py':>8} {os.path.getsize(path) / 1024:10.0f} {ms:10.2f}")
+            for compression in ('none', 'zlib', 'rle'):
+                path = os.path.join(tmp, f'map_{side}_{compression}.emap')
+                write_map(path, tiles, TILE_SIZE, compression=compression)
+                loaded, ms = timed(lambda: read_map(path))
+                assert np.array_equal(loaded.world_map.tiles, tiles)
+                print(f"{side:5d} {compression:>8} {os.path.getsize(path) / 1024:10.0f} {ms:10.2f}")
+                del loaded
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""Nearest-resource query time: bucketed SpatialHash vs a linear scan.
+
+Scatters N tree-sized rects over a square world and asks for the
+Manhattan-nearest one from random points, the way the agent picks a tree.
+
+Run from the repo root:
+    python -m benchmarks.nearest_resource
+"""
+import random
+import time
+
+import pygame
+
+from src.spatial_hash import SpatialHash
+
+TILE_SIZE = 48
+RESOURCE_COUNTS = [100, 1000, 10000, 50000]
+QUERIES = 200
+
+
+def linear_nearest(resources, x, y):
+    # The scan Agent.pick_closest_tree used before the resource index
+    closest, min_distance = None, float('inf')
+    for item, rect in resources:
+        distance = abs(x - rect.centerx) + abs(y - rect.centery)
+        if distance < min_distance:
+            closest, min_distance = item, distance
+    return closest
+
+
+def main():
+    print(f"{'resources':>9} {'linear ms/query':>16} {'index ms/query':>15}")
+    for count in RESOURCE_COUNTS:
+        rng = random.Random(count)
+        side = int((count * 10) ** 0.5) * TILE_SIZE
+        index = SpatialHash(TILE_SIZE * 8)
+        resources = []
+        for _ in range(count):
+            rect = pygame.Rect(rng.randrange(side), rng.randrange(side), TILE_SIZE, TILE_SIZE)
+            item = object()
+            index.insert(item, rect)
+            resources.append((item, rect))
+        points = [(rng.randrange(side), rng.randrange(side)) for _ in range(QUERIES)]
+
+        start = time.perf_counter()
+        for x, y in points:
+            linear_nearest(resources, x, y)
+        linear_ms = (time.perf_counter() - start) / QUERIES * 1000
+
+        start = time.perf_counter()
+        for x, y in points:
+            index.nearest(x, y)
+        index_ms = (time.perf_counter() - start) / QUERIES * 1000
+        print(f"{count:9d} {linear_ms:16.3f} {index_ms:15.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+"""Peak memory and time of fractal noise: vendored float64 generator vs
+the windowed float32 NoiseField.
+
+Peak memory is measured with tracemalloc (numpy reports its buffers) and
+shown as a multiple of the output array size.
+
+Run from the repo root:
+    python -m benchmarks.noise_memory
+"""
+import time
+import tracemalloc
+
+import numpy as np
+
+from vendor.perlin2d import generate_fractal_noise_2d
+from src.noise import NoiseField
+
+SIDES = [512, 1024, 2048]
+OCTAVES = 4
+PERIOD = 64
+
+
+def measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    out = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return out, elapsed * 1000, peak / out.nbytes
+
+
+def main():
+    print(f"{'side':>5} {'generator':>10} {'ms':>8} {'peak / output':>14}")
+    for side in SIDES:
+        # The vendored generator draws from the global numpy random state
+        np.random.seed(side)
+        res = (side // PERIOD, side // PERIOD)
+        _, ms, ratio = measure(lambda: generate_fractal_noise_2d((side, side), res, OCTAVES))
+        print(f"{side:5d} {'vendor':>10} {ms:8.1f} {ratio:14.2f}")
+        _, ms, ratio = measure(lambda: NoiseField(side, PERIOD, OCTAVES).generate(side, side))
+        print(f"{side:5d} {'field':>10} {ms:8.1f} {ratio:14.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+"""Cost of keeping the observation tensor up to date.
+
+Steps an environment and times, per env-step, the incremental sync() of
+an ObservationBuilder fed by board events against building the whole
+(channels, rows, cols) tensor from the board again.
+
+Run from the repo root:
+    python -m benchmarks.observation
+"""
+import time
+
+import numpy as np
+
+from agent.env import EmpireEnv
+from src.observation import ObservationBuilder
+
+MAP_NAMES = ['map_1', 'map_2', 'map_3']
+STEPS = 300
+
+
+def main():
+    print(f"{'map':>6} {'shape':>16} {'sync us':>8} {'rebuild us':>11}")
+    for map_name in MAP_NAMES:
+        env = EmpireEnv(map_name)
+        env.reset(0)
+        live = ObservationBuilder(env.board)
+        scratch = ObservationBuilder(env.board)
+        scratch.detach()
+        synced = rebuilt = 0.0
+        for steps in range(1, STEPS + 1):
+            _, _, done, _ = env.step()
+            start = time.perf_counter()
+            live.sync()
+            synced += time.perf_counter() - start
+            start = time.perf_counter()
+            scratch.rebuild()
+            rebuilt += time.perf_counter() - start
+            if done:
+                break
+        assert np.array_equal(scratch.tensor, live.tensor)
+        shape = 'x'.join(map(str, live.tensor.shape))
+        print(f"{map_name:>6} {shape:>16} {synced / steps * 1e6:8.1f} {rebuilt / steps * 1e6:11.1f}")
+
+
+if __name__ == '__main__':
+    main()
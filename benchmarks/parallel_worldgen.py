@@ -0,0 +1,42 @@
+"""World generation scaling from 1 to N worker processes.
+
+Generates the same world serially and with process pools of growing size,
+checks every result matches the serial one, and prints time and speedup.
+N defaults to the number of cores; pass it as the first argument to
+override, and the map side as the second.
+
+Run from the repo root:
+    python -m benchmarks.parallel_worldgen [N] [SIDE]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+from src.worldgen import generate_world
+
+SEED = 11
+
+
+def timed(workers, side):
+    start = time.perf_counter()
+    tiles = generate_world(side, side, SEED, workers)
+    return tiles, time.perf_counter() - start
+
+
+def main():
+    max_workers = int(sys.argv[1]) if len(sys.argv) > 1 else (os.cpu_count() or 1)
+    side = int(sys.argv[2]) if len(sys.argv) > 2 else 2048
+    serial, base = timed(1, side)
+    print(f"{side}x{side} world, {os.cpu_count()} cores available")
+    print(f"{'workers':>8} {'ms':>9} {'speedup':>8}")
+    print(f"{'serial':>8} {base * 1000:9.1f} {1.0:8.2f}")
+    for workers in range(2, max_workers + 1):
+        tiles, elapsed = timed(workers, side)
+        assert np.array_equal(tiles, serial), "parallel world differs from serial"
+        print(f"{workers:8d} {elapsed * 1000:9.1f} {base / elapsed:8.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""Tick time of unit-vs-unit collision detection against unit count.
+
+Compares the old all-pairs colliderect scan with Board.avoid_unit_collisions
+(the unit store tests every pair in one array comparison up to
+ALL_PAIRS_LIMIT units and uses sorted cell buckets above). Units random-walk over an area that
+grows with the unit count, keeping density at roughly one unit per 16 tiles.
+
+Run from the repo root:
+    python -m benchmarks.unit_collisions
+"""
+import time
+
+import numpy as np
+
+from src import current_game_state
+from src.board import Board
+from src.config import get as get_config
+from src.map_loader import load_map
+
+UNIT_COUNTS = [2, 50, 100, 250, 500, 1000, 2000, 5000, 10000]
+TICKS = 50
+TILES_PER_UNIT = 16
+
+
+def all_pairs(store):
+    # The check Board.avoid_unit_collisions made originally: colliderect on
+    # every pair of units
+    index = store.indices().tolist()
+    rects = [store.rect(i) for i in index]
+    for i in range(len(rects)):
+        for j in range(i + 1, len(rects)):
+            if rects[i].colliderect(rects[j]):
+                store.reverse[index[i]] = True
+                store.reverse[index[j]] = True
+
+
+def random_walk(store, rng, speed):
+    index = store.indices()
+    store.pos[:, index] += rng.integers(-speed, speed + 1, size=(2, len(index)))
+
+
+def main():
+    map_name = get_config('SELECTED_MAP', 'map_1')
+    width, height, tile_size, world_map = load_map(map_name)
+    current_game_state.WIDTH, current_game_state.HEIGHT = width, height
+    current_game_state.TILE_SIZE = tile_size
+    current_game_state.WORLD_MAP = world_map
+    board = Board(headless=True)
+
+    print(f"{'units':>6} {'all pairs ms/tick':>18} {'unit store ms/tick':>19}")
+    for count in UNIT_COUNTS:
+        rng = np.random.default_rng(count)
+        side = int((count * TILES_PER_UNIT) ** 0.5) * tile_size
+        for unit in list(board.villager_sprites) + list(board.scout_sprites):
+            unit.kill()
+        board.units.clear()
+        for x, y in rng.integers(0, side, size=(count, 2)).tolist():
+            board.units.add((x - tile_size // 2, y - tile_size // 2, tile_size, tile_size), 0, reverses=True)
+
+        naive = None
+        if count <= 2000:
+            start = time.perf_counter()
+            for _ in range(TICKS):
+                random_walk(board.units, rng, 2)
+                all_pairs(board.units)
+            naive = (time.perf_counter() - start) / TICKS * 1000
+
+        start = time.perf_counter()
+        for _ in range(TICKS):
+            random_walk(board.units, rng, 2)
+            board.avoid_unit_collisions()
+        stored = (time.perf_counter() - start) / TICKS * 1000
+
+        naive_text = f"{naive:18.3f}" if naive is not None else f"{'skipped':>18}"
+        print(f"{count:6d} {naive_text} {stored:19.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+"""Tick time of the unit engine against unit count.
+
+Random-walking AI units (scouts) on a generated world, one unit per 16
+tiles. Compares a per-sprite update loop, as units were moved before the
+unit store, with UnitStore: one vectorized step, unit-vs-unit and
+unit-vs-terrain collisions per tick.
+
+Run from the repo root:
+    python -m benchmarks.unit_engine
+"""
+import random
+import time
+
+import numpy as np
+import pygame
+
+from src.map_format import TILE_CODES
+from src.occupancy import OccupancyGrid, EMPTY
+from src.units import UnitStore
+from src.worldgen import generate_world
+
+UNIT_COUNTS = [10, 100, 1000, 5000, 10000]
+# Ticks timed per count; small counts run more so fixed costs are measured reliably
+TICKS = 100
+MIN_UNIT_TICKS = 100000
+TILE_SIZE = 48
+TILES_PER_UNIT = 16
+# Milliseconds per tick at 60 FPS
+TICK_MS = 1000 // 60
+
+
+class SpriteUnit:
+    # The per-sprite movement Scout.update used to do
+    def __init__(self, rect, rng):
+        self.rect = rect
+        self.prev_rect = rect.copy()
+        self.direction = pygame.math.Vector2()
+        self.reverse_next_move = False
+        self.ai_next_change = 0
+        self.rng = rng
+
+    def update(self, now, bounds):
+        if self.reverse_next_move:
+            if abs(self.direction.x) == 1:
+                self.direction.x *= -1
+            elif abs(self.direction.y) == 1:
+                self.direction.y *= -1
+            self.reverse_next_move = False
+        self.prev_rect = self.rect.copy()
+        if now > self.ai_next_change:
+            self.direction.xy = self.rng.choices([(0, -1), (0, 1), (-1, 0), (1, 0), (0, 0)], weights=[4, 4, 4, 4, 1])[0]
+            self.ai_next_change = now + self.rng.randint(300, 1500)
+        if self.direction.magnitude() > 0:
+            self.direction = self.direction.normalize()
+        self.rect.x += self.direction.x * 3
+        self.rect.y += self.direction.y * 3
+        if not bounds.contains(self.rect):
+            self.rect.clamp_ip(bounds)
+            self.reverse_next_move = True
+
+
+def spawn_cells(kinds, count, rng):
+    free = np.flatnonzero(kinds.ravel() == EMPTY)
+    return np.divmod(rng.choice(free, size=count, replace=len(free) < count), kinds.shape[1])
+
+
+def per_sprite_tick(units, occupancy, now, bounds):
+    for unit in units:
+        unit.update(now, bounds)
+    for unit in units:
+        if occupancy.collide(unit.rect):
+            unit.rect = unit.prev_rect.copy()
+            unit.reverse_next_move = True
+
+
+def main():
+    print(f"{'units':>6} {'per sprite ms/tick':>19} {'unit store ms/tick':>19} {'us/unit':>8}")
+    for count in UNIT_COUNTS:
+        side = max(int((count * TILES_PER_UNIT) ** 0.5), 16)
+        kinds = generate_world(side, side, seed=count)
+        # Water, trees, bushes and home all block units
+        kinds[kinds == TILE_CODES['sand']] = EMPTY
+        occupancy = OccupancyGrid(side, side, TILE_SIZE)
+        occupancy.kinds[:] = kinds
+        ticks = max(TICKS, MIN_UNIT_TICKS // count)
+        rng = np.random.default_rng(count)
+        rows, cols = spawn_cells(occupancy.kinds, count, rng)
+        width = height = side * TILE_SIZE
+
+        naive = None
+        if count <= 1000:
+            sprite_rng = random.Random(count)
+            units = [SpriteUnit(pygame.Rect(col * TILE_SIZE, row * TILE_SIZE, TILE_SIZE, TILE_SIZE), sprite_rng)
+                     for row, col in zip(rows.tolist(), cols.tolist())]
+            bounds = pygame.Rect(0, 0, width, height)
+            start = time.perf_counter()
+            for tick in range(ticks):
+                per_sprite_tick(units, occupancy, tick * TICK_MS, bounds)
+            naive = (time.perf_counter() - start) / ticks * 1000
+
+        store = UnitStore(count, seed=count)
+        for row, col in zip(rows.tolist(), cols.tolist()):
+            store.add((col * TILE_SIZE, row * TILE_SIZE, TILE_SIZE, TILE_SIZE), 3, ai=True, reverses=True)
+        start = time.perf_counter()
+        for tick in range(ticks):
+            store.step(tick * TICK_MS, width, height)
+            store.collide_units(TILE_SIZE)
+            store.collide_terrain(occupancy.kinds, TILE_SIZE)
+        vectorized = (time.perf_counter() - start) / ticks * 1000
+
+        naive_text = f"{naive:19.3f}" if naive is not None else f"{'skipped':>19}"
+        print(f"{count:6d} {naive_text} {vectorized:19.3f} {vectorized * 1000 / count:8.2f}")
+
+
+if __name__ == '__main__':
+    main()
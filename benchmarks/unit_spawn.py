@@ -0,0 +1,78 @@
+"""Cost of spawning villagers with shared animation frames.
+
+Before the animation library every villager sliced, scaled and colorkeyed
+its own copy of the walk sheet (and the chopping sheet when it became a
+wood villager). Now a sheet is cut once per tile size and every unit
+shares its frames, so a spawn only claims a slot in the unit store.
+
+Run from the repo root:
+    python -m benchmarks.unit_spawn
+"""
+import os
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+
+from src.animation import FACINGS, animations
+from src.assets import load_image
+from src.game_state import current_game_state
+from src.units import UnitStore
+from src.villager.villager import Villager, WoodVillager
+
+SPAWN_COUNTS = [10, 100, 1000]
+TILE_SIZE = 48
+WALK_SHEET = 'graphics/villager/walk.png'
+
+
+def slice_per_unit(path, rows, cols, size):
+    # What every Villager.__init__ used to do with its walk sheet
+    sprite_sheet = load_image(path)
+    sheet_width, sheet_height = sprite_sheet.get_size()
+    frame_width, frame_height = sheet_width // cols, sheet_height // rows
+    frames = {facing: [] for facing in FACINGS}
+    for row, facing in enumerate(FACINGS):
+        for col in range(cols):
+            rect = pygame.Rect(col * frame_width, row * frame_height, frame_width, frame_height)
+            frame = pygame.transform.scale(sprite_sheet.subsurface(rect).copy(), (size, size))
+            frame.set_colorkey(frame.get_at((0, 0))[:3])
+            frames[facing].append(frame)
+    return frames
+
+
+def spawn(count):
+    store = UnitStore(count)
+    group = pygame.sprite.Group()
+    for index in range(count):
+        villager = Villager((index % 64 * TILE_SIZE, index // 64 * TILE_SIZE), (group,), store=store)
+        villager.__class__ = WoodVillager
+        villager.init_as_wood_villager()
+    return group
+
+
+def main():
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    current_game_state.TILE_SIZE = TILE_SIZE
+    print(f"{'villagers':>9} {'per unit ms':>12} {'shared ms':>10} {'us/spawn':>9}")
+    for count in SPAWN_COUNTS:
+        naive = None
+        if count <= 100:
+            start = time.perf_counter()
+            for _ in range(count):
+                slice_per_unit(WALK_SHEET, 4, 9, TILE_SIZE)
+            naive = (time.perf_counter() - start) * 1000
+
+        animations.clear()
+        start = time.perf_counter()
+        spawn(count)
+        shared = (time.perf_counter() - start) * 1000
+
+        naive_text = f"{naive:12.2f}" if naive is not None else f"{'skipped':>12}"
+        print(f"{count:9d} {naive_text} {shared:10.2f} {shared * 1000 / count:9.1f}")
+    print(f"animations: {animations.stats()}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""Training throughput of the vectorized environment.
+
+Steps ENVS independent environments in lockstep, in this process and over
+worker processes, and prints env-steps/sec (one env-step is TICKS_PER_STEP
+simulation ticks). Worker counts above the number of usable cores are
+skipped: the workers would only take turns on the same cores. Whether
+workers beat the in-process run at all depends on the machine, since every
+step pickles each environment's observation and full info dict back to
+this process.
+
+Run from the repo root:
+    python -m benchmarks.vector_env
+"""
+import os
+import time
+
+from agent.env import make_vector_env
+
+MAP_NAME = 'map_2'
+ENVS = 8
+WORKER_COUNTS = [1, 2, 4, 8]
+STEPS = 200
+TICKS_PER_STEP = 15
+
+
+def usable_cores():
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def main():
+    cores = usable_cores()
+    print(f"{MAP_NAME}, {ENVS} environments, {cores} usable cores")
+    print(f"{'workers':>7} {'env-steps/sec':>14} {'ticks/sec':>10}")
+    for workers in WORKER_COUNTS:
+        if workers > 1 and workers > cores:
+            print(f"{workers:7d} {'skipped':>14} {'':>10}")
+            continue
+        envs = make_vector_env(ENVS, workers=workers, map_name=MAP_NAME, ticks_per_step=TICKS_PER_STEP)
+        try:
+            envs.reset(0)
+            start = time.perf_counter()
+            for _ in range(STEPS):
+                envs.step()
+            elapsed = time.perf_counter() - start
+        finally:
+            envs.close()
+        rate = STEPS * ENVS / elapsed
+        print(f"{workers:7d} {rate:14.0f} {rate * TICKS_PER_STEP:10.0f}")
+
+
+if __name__ == '__main__':
+    main()
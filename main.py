@@ -1,21 +1,32 @@
+import argparse
+import time
+
 import pygame
 import sys
 from src import Board
 from src.config import get as get_config
 from src import current_game_state
 from src.map_loader import load_map
+from src.clock import SimulationClock
+from src.randomness import RandomStreams
+from src.assets import asset_cache
+from src.animation import animations
 from src import utils
 from agent import rl_agent
+from agent.replay import Recorder, config_settings
 
 class Game:
 
-    def __init__(self):
+    def __init__(self, headless=False, seed=None):
         """
         Initializes the Game environment:
         - Sets up Pygame and the display window with configured WIDTH and HEIGHT.
+          In headless mode no window is opened and the SDL video driver is never
+          initialized; a fixed-timestep SimulationClock drives unit timers instead.
         - Sets the window caption to "EMPIRES".
         - Initializes the game clock for frame rate control.
         - Instantiates the Objects world, which manages all sprites and world generation.
+          Every random draw comes from streams seeded with seed (a fresh one when None).
         """
 
         # Load selected map from config and store in game_state
@@ -26,11 +37,23 @@ class Game:
         current_game_state.TILE_SIZE = TILE_SIZE
         current_game_state.WORLD_MAP = WORLD_MAP
         current_game_state.MAP_NAME = map_name
+        current_game_state.random = RandomStreams(seed)
+        # The window shows at most VIEW_WIDTH x VIEW_HEIGHT of the world; larger maps scroll
+        current_game_state.VIEW_WIDTH = min(WIDTH, get_config('VIEW_WIDTH', 1296))
+        current_game_state.VIEW_HEIGHT = min(HEIGHT, get_config('VIEW_HEIGHT', 720))
+
+        self.headless = headless
+        if headless:
+            current_game_state.clock = SimulationClock(get_config('FPS', 60))
+            self.screen = None
+            self.clock = None
+            self.board = Board(headless=True)
+            return
 
         pygame.init()
         panel_height = get_config('PANEL_HEIGHT', 120)
-        screen_height = current_game_state.HEIGHT + panel_height
-        self.screen = pygame.display.set_mode((current_game_state.WIDTH, screen_height))
+        screen_height = current_game_state.VIEW_HEIGHT + panel_height
+        self.screen = pygame.display.set_mode((current_game_state.VIEW_WIDTH, screen_height))
         pygame.display.set_caption(f"EMPIRES --Under Construction--")
         self.clock = pygame.time.Clock()
         self.board = Board()
@@ -53,11 +76,78 @@ class Game:
             if keys[pygame.K_ESCAPE]:
                 pygame.quit()
                 sys.exit()
+            self.scroll_camera(keys)
             self.board.run()
             rl_agent.run()
-            pygame.display.update()
+            pygame.display.update(self.board.dirty_rects)
             self.clock.tick(get_config('FPS', 60))
 
+    def scroll_camera(self, keys):
+        """Move the camera with the arrow keys."""
+
+        speed = get_config('CAMERA_SPEED', 16)
+        dx = (keys[pygame.K_RIGHT] - keys[pygame.K_LEFT]) * speed
+        dy = (keys[pygame.K_DOWN] - keys[pygame.K_UP]) * speed
+        if dx or dy:
+            self.board.camera.move(dx, dy)
+
+    def run_headless(self, ticks, recorder=None):
+        """
+        Steps the board and the agent as fast as the CPU allows, advancing the
+        simulation clock by one fixed timestep per tick. Returns ticks per second.
+        With a recorder, the agent's actions and the state checksum of every
+        tick are logged for python -m agent.replay.
+        """
+
+        sim_clock = current_game_state.clock
+        rl_agent.scheduler.recorder = recorder
+        start = time.perf_counter()
+        for _ in range(ticks):
+            self.board.run()
+            rl_agent.run()
+            if recorder is not None:
+                recorder.tick(current_game_state, self.board)
+            sim_clock.advance()
+        elapsed = time.perf_counter() - start
+        return ticks / elapsed if elapsed > 0 else float('inf')
+
 if __name__ == '__main__':
-    game = Game()
-    game.run()
+    parser = argparse.ArgumentParser(description="EMPIRES --Under Construction--")
+    parser.add_argument('--headless', action='store_true', default=get_config('HEADLESS', False),
+                        help="simulate without a window at maximum speed")
+    parser.add_argument('--ticks', type=int, default=get_config('HEADLESS_TICKS', 10000),
+                        help="number of ticks to simulate in headless mode")
+    parser.add_argument('--seed', type=int, default=get_config('SEED', None),
+                        help="seed of every random draw (default: a fresh one, printed in headless mode)")
+    parser.add_argument('--record', metavar='PATH',
+                        help="log the agent's actions and per-tick state checksums (headless only)")
+    args = parser.parse_args()
+    if args.record and not args.headless:
+        parser.error("--record needs --headless")
+
+    if args.headless:
+        game = Game(headless=True, seed=args.seed)
+        recorder = None
+        if args.record:
+            recorder = Recorder(args.record, {
+                'map_name': current_game_state.MAP_NAME, 'seed': current_game_state.random.seed,
+                'villagers': get_config('VILLAGERS', 1), 'food_share': rl_agent.scheduler.food_share,
+                'workers_per_resource': rl_agent.scheduler.workers_per_resource, 'fps': get_config('FPS', 60),
+                **config_settings(current_game_state.MAP_NAME),
+            })
+        try:
+            tps = game.run_headless(args.ticks, recorder)
+        finally:
+            if recorder is not None:
+                recorder.close()
+        print(f"{args.ticks} ticks at {tps:.0f} ticks/sec "
+              f"(wood: {current_game_state.wood}, food: {current_game_state.food}, score: {current_game_state.score:.1f}, "
+              f"explored: {game.board.fog.percent_explored():.1f}%, seed: {current_game_state.random.seed})")
+        economy = rl_agent.scheduler.metrics()
+        print(f"economy: {economy['wood_workers']} wood / {economy['food_workers']} food villagers, "
+              f"{economy['wood_per_minute']:.1f} wood/min, {economy['food_per_minute']:.1f} food/min")
+        print(f"asset cache: {asset_cache.stats()}")
+        print(f"animations: {animations.stats()}")
+    else:
+        game = Game(seed=args.seed)
+        game.run()
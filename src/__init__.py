@@ -2,11 +2,11 @@
 from src.board import Board
 from src.villager.villager import Villager
 from src.scout import Scout
-from src.tile import GreenGrass, Sand, Water, Grid, Home
+from src.tile import Home
 from src.objects import Tree
 from src.game_state import current_game_state
 
-__all__ = ['Board', 'Villager', 'Scout', 'AnimatedPlayer', 'GreenGrass', 'Tree', 'Sand', 'Water', 'Grid', 'Home', 'current_game_state']
+__all__ = ['Board', 'Villager', 'Scout', 'AnimatedPlayer', 'Tree', 'Home', 'current_game_state']
 
 from src.test.settler import Settler, WoodSettler
 
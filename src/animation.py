@@ -0,0 +1,99 @@
+from types import MappingProxyType
+
+import pygame
+
+from src.assets import convert_alpha, display_ready, load_image
+
+# One row per facing in every unit sprite sheet, in this order
+FACINGS = ('up', 'left', 'down', 'right')
+# Animation frames advanced per simulation tick
+ANIMATION_SPEED = 0.15
+
+
+class AnimationClock:
+    """Global animation time, advanced once per simulation tick.
+
+    Units only remember the tick their current animation started; the frame
+    to show is derived from the clock when they are drawn, so nothing is
+    advanced per unit and off-screen units cost nothing.
+    """
+
+    def __init__(self, speed=ANIMATION_SPEED):
+        self.speed = speed
+        self.ticks = 0
+
+    def advance(self, steps=1):
+        self.ticks += steps
+
+    def frame(self, start, count):
+        """Index of the frame to show in an animation of count frames that
+        started at tick start."""
+        return int((self.ticks - start) * self.speed) % count if count else 0
+
+
+class AnimationLibrary:
+    """Process-wide cache of animations cut from sprite sheets.
+
+    A sheet is loaded, sliced, scaled and colorkeyed once per (path, grid,
+    size, crop, convert mode); every unit gets the same read-only mapping of
+    facing to a tuple of frames, so spawning a unit or changing its class
+    does no image work. The frames are shared and must never be mutated.
+    """
+
+    def __init__(self):
+        self._sheets = {}
+        self.hits = 0
+        self.misses = 0
+
+    def sheet(self, path, rows, cols, size, crop=None, optional=False):
+        """Frames of a rows x cols sheet, one FACINGS row each, scaled to
+        size x size. crop (w, h) keeps only the middle of each cell. A
+        missing optional sheet gives empty animations instead of raising."""
+        key = (path, rows, cols, size, crop, 'alpha' if display_ready() else 'raw')
+        frames = self._sheets.get(key)
+        if frames is not None:
+            self.hits += 1
+            return frames
+        self.misses += 1
+        try:
+            frames = self._slice(load_image(path), rows, cols, size, crop)
+        except Exception:
+            if not optional:
+                raise
+            frames = {facing: () for facing in FACINGS}
+        frames = self._sheets[key] = MappingProxyType(frames)
+        return frames
+
+    @staticmethod
+    def _slice(sprite_sheet, rows, cols, size, crop):
+        sheet_width, sheet_height = sprite_sheet.get_size()
+        frame_width = sheet_width // cols
+        frame_height = sheet_height // rows
+        frames = {}
+        for row, facing in enumerate(FACINGS[:rows]):
+            row_frames = []
+            for col in range(cols):
+                rect = pygame.Rect(col * frame_width, row * frame_height, frame_width, frame_height)
+                if crop is not None:
+                    rect = pygame.Rect(0, 0, *crop)
+                    rect.center = (col * frame_width + frame_width // 2, row * frame_height + frame_height // 2)
+                frame = pygame.transform.scale(sprite_sheet.subsurface(rect), (size, size))
+                if frame.get_flags() & pygame.SRCALPHA:
+                    frame = convert_alpha(frame)
+                else:
+                    frame.set_colorkey(frame.get_at((0, 0))[:3])
+                row_frames.append(frame)
+            frames[facing] = tuple(row_frames)
+        return frames
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'sheets': len(self._sheets)}
+
+    def clear(self):
+        self._sheets.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+animation_clock = AnimationClock()
+animations = AnimationLibrary()
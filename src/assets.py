@@ -0,0 +1,88 @@
+from glob import glob
+
+import pygame
+
+
+def display_ready():
+    """True when a display mode is set and surfaces can be converted."""
+    return pygame.display.get_init() and pygame.display.get_surface() is not None
+
+
+def convert_alpha(surface):
+    """Convert surface to the display pixel format, or leave it as is when headless."""
+    if display_ready():
+        return surface.convert_alpha()
+    return surface
+
+
+def load_image(path):
+    """Load an image from disk, converting it only when a display exists."""
+    return convert_alpha(pygame.image.load(path))
+
+
+class AssetCache:
+    """Process-wide flyweight cache of decoded and scaled images.
+
+    Each (path, size, convert mode) is decoded and scaled once; every sprite
+    asking for it gets the same Surface. Shared surfaces must never be mutated.
+    Sprites that need a translucent variant of an image ask for it with
+    alpha=..., which copies the base surface on first use and shares
+    that copy from then on.
+    """
+
+    def __init__(self):
+        self._surfaces = {}
+        self._globs = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _convert_mode():
+        # Surfaces loaded before the display exists are kept unconverted, so
+        # they must not be mixed up with converted ones loaded later.
+        return 'alpha' if display_ready() else 'raw'
+
+    def image(self, path, size=None, alpha=None):
+        """Return the shared surface for path scaled to size (int or (w, h))."""
+        if isinstance(size, int):
+            size = (size, size)
+        key = (path, size, self._convert_mode(), alpha)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            return surface
+        self.misses += 1
+        if alpha is not None:
+            # Copy-on-write: derive the variant from the shared base surface
+            surface = self.image(path, size).copy()
+            surface.set_alpha(alpha)
+        else:
+            surface = load_image(path)
+            if size is not None:
+                surface = pygame.transform.scale(surface, size)
+        self._surfaces[key] = surface
+        return surface
+
+    def variants(self, pattern):
+        """Return the sorted list of files matching pattern, globbed once."""
+        paths = self._globs.get(pattern)
+        if paths is None:
+            paths = sorted(glob(pattern))
+            self._globs[pattern] = paths
+        return paths
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'surfaces': len(self._surfaces),
+        }
+
+    def clear(self):
+        self._surfaces.clear()
+        self._globs.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+asset_cache = AssetCache()
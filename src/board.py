@@ -1,30 +1,51 @@
-import random
-import itertools
-import string
-
 import pygame
 import numpy as np
 
 from src.config import get as get_config
-from src.tile import GreenGrass, Sand, Water, Grid, Home
+from src.tile import Home
+from src.assets import asset_cache
 from src.objects import Tree, BerryBush
 from src.villager.villager import Villager
 from src.scout import Scout
 from src.game_state import current_game_state
+from src.terrain import TerrainLayer
+from src.fog import FogOfWar
+from src.spatial_hash import SpatialHash
+from src.units import UnitStore
+from src.animation import AnimationClock
+from src.occupancy import OccupancyGrid, TREE, BERRY_BUSH, HOME, WATER
+from src.pathfinding import GridPathfinder
+from src.navigation import HomeDistanceField
+from src.cells import CellGrid
+from src.render import RenderPipeline
+from src.camera import Camera
+from src.culling import ViewCuller
 # from agent import rl_agent
 
-from src.utils import bottom_panel
+from src.hud import BottomPanel
 
 from src.config import get as get_config
 from src.map_loader import load_map
+from src.map_format import TILE_CODES, TILE_TYPES
 
-class Board:
-    def __init__(self):
+# Flat ground colours for tile types without artwork
+GROUND_COLORS = {'water': (52, 108, 178), 'sand': (214, 192, 134)}
 
-        # Load map details directly
-        map_name = get_config('SELECTED_MAP', 'map_1')
-        self.width, self.height, self.tile_size, self.world_map = load_map(map_name)
-        self.display_surface = pygame.display.get_surface()
+class Board:
+    def __init__(self, headless=False, villagers=None):
+
+        # The map the game state was set up with (a generated world may
+        # differ per episode), else load the selected one
+        state = current_game_state
+        if state.WORLD_MAP is not None:
+            self.width, self.height, self.tile_size, self.world_map = (
+                state.WIDTH, state.HEIGHT, state.TILE_SIZE, state.WORLD_MAP)
+        else:
+            map_name = state.MAP_NAME or get_config('SELECTED_MAP', 'map_1')
+            self.width, self.height, self.tile_size, self.world_map = load_map(map_name)
+        # Headless boards only simulate; nothing is ever drawn
+        self.headless = headless
+        self.display_surface = None if headless else pygame.display.get_surface()
 
         self.visible_sprites = pygame.sprite.Group()
         self.obstacles_sprites = pygame.sprite.Group()
@@ -32,31 +53,68 @@ class Board:
         self.villager_sprites = pygame.sprite.Group()
         self.scout_sprites = pygame.sprite.Group()
         self.berry_bush_sprites = pygame.sprite.Group()
-
-        self.cell_labels = []
+        # Position, movement and health of every villager and scout, with
+        # this board's own animation clock
+        self.units = UnitStore(seed=current_game_state.random.generator('units'), clock=AnimationClock())
+        # Trees and berry bushes bucketed in 8x8 tile blocks for nearest-resource queries
+        self.tree_index = SpatialHash(self.tile_size * 8)
+        self.berry_bush_index = SpatialHash(self.tile_size * 8)
+        # Trees and berry bushes that have lost wood or berries
+        self.damaged_resources = set()
+        # Told about resource, obstacle and fog changes (see src.observation)
+        self.observers = []
+
+        self.cells = None
         self.selected_cell_idx = None
         self.last_cell_change = 0
         self.discovered_trees = []
-        self.grid_sprites = {}
+        self.fog = None
+        # Resource sprites of each cell, painted into the terrain chunks
+        self.cell_sprites = {}
+        self.terrain = None
+        self.camera = None
+        # Units inside the view this frame, picked by the culler
+        self.culler = ViewCuller(margin=self.tile_size)
+        self.visible_units = []
+        self.renderer = None
+        self.dirty_rects = []
+        self.panel = BottomPanel()
+        self.home_cell = None
         self.render_map()
+        self.pathfinder = GridPathfinder(self.occupancy.walkable())
+        # Distance to home for every cell, shared by all villagers hauling resources
+        self.home_navigator = None
+        if self.home_cell is not None:
+            self.home_navigator = HomeDistanceField(self.occupancy.walkable(), self.home_cell)
+        if not headless:
+            self.fog.build_tiles()
+            view_size = (current_game_state.VIEW_WIDTH or self.width, current_game_state.VIEW_HEIGHT or self.height)
+            self.camera = Camera(view_size, (self.grid_cols * self.tile_size, self.grid_rows * self.tile_size))
+            if self.home_cell is not None:
+                self.camera.center_on(*self.cells.center(self.cells.cell_id(*self.home_cell)))
+            self.terrain = TerrainLayer(self.camera.rect.size, self.tile_size, (self.grid_rows, self.grid_cols),
+                                        self.draw_terrain_cell, get_config('CHUNK_SIZE', 32))
+            self.terrain.bake(self.camera.rect)
+            self.renderer = RenderPipeline(self.display_surface, self.terrain.surface, self.camera.screen_rect())
         
-        self.add_villager()
+        for _ in range(get_config('VILLAGERS', 1) if villagers is None else villagers):
+            self.add_villager()
 
         current_game_state.board = self
         
     def add_villager(self):
 
         # Use Villager.spawn_position to determine spawn location
-        pos, cell_id = Villager.spawn_position(self.cell_labels)
-        if pos and cell_id:
-            Villager(pos, (self.villager_sprites,), start_cell=cell_id)
+        pos, cell_id = Villager.spawn_position(self.cells)
+        if pos and cell_id is not None:
+            Villager(pos, (self.villager_sprites,), start_cell=cell_id, store=self.units)
     
     def add_scout(self):
 
         # Use Scout.spawn_position to determine spawn location
-        pos, cell_id = Scout.spawn_position(self.cell_labels)
-        if pos and cell_id:
-            Scout(pos, (self.scout_sprites,), start_cell=cell_id)
+        pos, cell_id = Scout.spawn_position(self.cells)
+        if pos and cell_id is not None:
+            Scout(pos, (self.scout_sprites,), start_cell=cell_id, store=self.units)
 
     def reset(self):
 
@@ -69,18 +127,23 @@ class Board:
             p.kill()
         for p in list(self.scout_sprites):
             p.kill()
+        self.units.clear()
 
         # Spawn villagers and scouts again at random tiles
-        if self.cell_labels and len(self.cell_labels) > 2:
-            cell_choices = random.sample(self.cell_labels, min(3, len(self.cell_labels)))
-            for i, (cell_id, (center_x, center_y)) in enumerate(cell_choices):
+        if self.cells and len(self.cells) > 2:
+            cell_choices = current_game_state.random.stream('spawn').sample(range(len(self.cells)), 3)
+            for i, cell_id in enumerate(cell_choices):
+                center_x, center_y = self.cells.center(cell_id)
                 if i == 0:
-                    Villager((center_x, center_y), (self.villager_sprites,), start_cell=cell_id)
+                    Villager((center_x, center_y), (self.villager_sprites,), start_cell=cell_id,
+                             store=self.units)
                 elif i == 1:
-                    Scout((center_x, center_y), (self.scout_sprites,), start_cell=cell_id)
+                    Scout((center_x, center_y), (self.scout_sprites,), start_cell=cell_id,
+                          store=self.units)
                 else:
                     # Add more villagers if we have more cells
-                    Villager((center_x, center_y), (self.villager_sprites,), start_cell=cell_id)
+                    Villager((center_x, center_y), (self.villager_sprites,), start_cell=cell_id,
+                             store=self.units)
 
     def render_map(self):
         world_map = self.world_map
@@ -91,139 +154,220 @@ class Board:
             rows = int(self.height / self.tile_size)
             cols = int(self.width / self.tile_size)
         self.map_size = [rows, cols]
-        a = string.ascii_lowercase
-        com = itertools.product(a, a)
+        self.fog = FogOfWar(rows, cols, self.tile_size, enabled=get_config('FOG_OF_WAR', True))
+        self.occupancy = OccupancyGrid(rows, cols, self.tile_size)
+        self.cells = CellGrid(rows, cols, self.tile_size)
+        # Ground images per tile code; resource tiles stand on grass
+        grass = asset_cache.variants('graphics/grass/*.png')
+        self.ground_variants = [grass] * len(TILE_TYPES)
+        self.ground_variants[TILE_CODES['water']] = asset_cache.variants('graphics/water/*.png')
+        self.ground_variants[TILE_CODES['sand']] = asset_cache.variants('graphics/sand/*.png')
+        self.ground_fills = {}
         for row_idx in range(rows):
             y = row_idx * self.tile_size
-            row_str = "".join(next(com))
+            # Tile codes of the whole row in one conversion
+            row_codes = world_map.tiles[row_idx].tolist() if world_map else [TILE_CODES['grass']] * cols
             for col_idx in range(cols):
                 x = col_idx * self.tile_size
-                cell = row_str + str(col_idx)
-                tile_type = None
-                if world_map and row_idx < len(world_map) and col_idx < len(world_map[row_idx]):
-                    tile_type = world_map[row_idx][col_idx]
+                cell = self.cells.cell_id(row_idx, col_idx)
+                tile_type = TILE_TYPES[row_codes[col_idx]]
                 center_x = x + self.tile_size // 2
                 center_y = y + self.tile_size // 2
-                GreenGrass((x, y), (self.visible_sprites,), cell)
+                cell_sprites = []
                 if tile_type in ('tree'):
-                    Tree((center_x, center_y), (self.visible_sprites, self.obstacles_sprites, self.tree_sprites), cell)
+                    tree = Tree((center_x, center_y), (self.visible_sprites, self.obstacles_sprites, self.tree_sprites), cell)
+                    cell_sprites.append(tree)
+                    self.occupancy.add(tree, TREE)
+                    self.tree_index.insert(tree, tree.rect)
                 if tile_type in ('home'):
-                    Home((center_x, center_y), (self.visible_sprites, self.obstacles_sprites), cell)
-                    current_game_state.home_cell = (int(row_idx), int(col_idx))
+                    home = Home((center_x, center_y), (self.visible_sprites, self.obstacles_sprites), cell)
+                    cell_sprites.append(home)
+                    self.occupancy.add(home, HOME)
+                    self.home_cell = (int(row_idx), int(col_idx))
+                    current_game_state.home_cell = self.home_cell
+                if tile_type == 'water':
+                    self.occupancy.block(row_idx, col_idx, WATER)
                 if tile_type in ('berry_bush'):
-                    BerryBush((center_x, center_y), (self.visible_sprites, self.obstacles_sprites, self.berry_bush_sprites), cell)
-                grid_sprite = Grid((center_x, center_y), (self.visible_sprites,), cell)
-                self.grid_sprites[(row_idx, col_idx)] = grid_sprite
+                    berry_bush = BerryBush((center_x, center_y), (self.visible_sprites, self.obstacles_sprites, self.berry_bush_sprites), cell)
+                    cell_sprites.append(berry_bush)
+                    self.occupancy.add(berry_bush, BERRY_BUSH)
+                    self.berry_bush_index.insert(berry_bush, berry_bush.rect)
+                if cell_sprites:
+                    self.cell_sprites[(row_idx, col_idx)] = cell_sprites
                 if tile_type == 'home':
-                    grid_sprite.image.set_alpha(20)
-                self.cell_labels.append((cell, (center_x, center_y)))
+                    self.fog.reveal(row_idx, col_idx)
         self.grid_rows = rows
         self.grid_cols = cols
 
     def avoid_unit_collisions(self):
-        
-        # Check for unit collisions
-        all_entities = list(self.villager_sprites) + list(self.scout_sprites)
-        for i in range(len(all_entities)):
-            for j in range(i + 1, len(all_entities)):
-                if all_entities[i].rect.colliderect(all_entities[j].rect):
-                    # Set both to reverse next move
-                    if hasattr(all_entities[i], 'reverse_next_move'):
-                        all_entities[i].reverse_next_move = True
-                    if hasattr(all_entities[j], 'reverse_next_move'):
-                        all_entities[j].reverse_next_move = True
+
+        # Overlapping units both reverse on their next move; villagers walk
+        # through each other, so without scouts there is nothing to flag
+        if self.units.reversing_units:
+            self.units.collide_units(self.tile_size)
 
     def avoid_collisions(self):
 
-        all_entities = list(self.villager_sprites) + list(self.scout_sprites)
-        # Check for collisions between entities and obstacles
-        for entity in all_entities:
-            collided = pygame.sprite.spritecollideany(entity, self.obstacles_sprites)
-            if collided:
-                # Reveal fog for obstacle tile when unit collides
-                self.reveal_cell(collided.rect.centerx, collided.rect.centery)
-                # Revert position to previous rect if available
-                if hasattr(entity, 'prev_rect'):
-                    entity.rect = entity.prev_rect.copy()
-                # Always reverse direction
-                if hasattr(entity, 'reverse_next_move'):
-                    entity.reverse_next_move = True
+        # Units standing on an obstacle cell go back to where they were and
+        # reverse; the fog of the obstacle they hit is revealed
+        _, rows, cols = self.units.collide_terrain(self.occupancy.kinds, self.tile_size)
+        if len(rows) and self.fog.revealed_count < self.fog.mask.size:
+            self.reveal(rows, cols)
+
+    def reveal(self, rows, cols, radius=0):
+
+        # Lift the fog around (rows, cols) and pass the newly revealed cells on
+        rows, cols = self.fog.reveal(rows, cols, radius)
+        self.invalidate_cells(rows, cols)
+        for observer in self.observers:
+            observer.cells_revealed(rows, cols)
 
     def reveal_cell(self, x, y):
 
-        col = x // self.tile_size
-        row = y // self.tile_size
-        grid_sprite = self.grid_sprites.get((row, col))
-        if grid_sprite:
-            grid_sprite.image.set_alpha(20)
+        self.reveal(y // self.tile_size, x // self.tile_size)
+
+    def reveal_around_units(self):
+
+        # Reveal fog for all units in one array operation per vision radius;
+        # units still standing in the cell they revealed last are skipped
+        if self.fog.revealed_count == self.fog.mask.size:
+            return
+        units, rows, cols = self.units.moved_cells(self.tile_size)
+        radii = self.units.vision[units]
+        for radius in np.unique(radii).tolist():
+            mine = radii == radius
+            self.reveal(rows[mine], cols[mine], radius)
+
+    def remove_obstacle(self, sprite):
+
+        # Called when a tree or berry bush is depleted and killed
+        row, col = self.occupancy.remove(sprite)
+        self.damaged_resources.discard(sprite)
+        self.tree_index.remove(sprite)
+        self.berry_bush_index.remove(sprite)
+        self.pathfinder.set_walkable(row, col)
+        if self.home_navigator is not None:
+            self.home_navigator.open_cell(row, col)
+        self.invalidate_cell(*sprite.rect.center)
+        for observer in self.observers:
+            observer.obstacle_removed(sprite, row, col)
+
+    def resource_changed(self, sprite):
+
+        # Called when a tree or berry bush loses wood or berries; only
+        # damaged resources show a health bar
+        self.damaged_resources.add(sprite)
+        for observer in self.observers:
+            observer.resource_changed(sprite)
+
+    def invalidate_cell(self, x, y):
+
+        # Repaint the baked terrain under (x, y) on the next draw
+        if self.terrain is not None:
+            self.terrain.mark_dirty(y // self.tile_size, x // self.tile_size)
+
+    def invalidate_cells(self, rows, cols):
+
+        if self.terrain is not None:
+            for row, col in zip(rows.tolist(), cols.tolist()):
+                self.terrain.mark_dirty(row, col)
+
+    def ground_image(self, row, col):
+
+        # Ground variant picked by a hash of the cell, so a chunk baked again
+        # after eviction looks the same as before
+        code = int(self.world_map.tiles[row, col]) if self.world_map else TILE_CODES['grass']
+        variants = self.ground_variants[code]
+        if not variants:
+            fill = self.ground_fills.get(code)
+            if fill is None:
+                fill = self.ground_fills[code] = pygame.Surface((self.tile_size, self.tile_size))
+                fill.fill(GROUND_COLORS.get(TILE_TYPES[code], (0, 0, 0)))
+            return fill
+        path = variants[((row * 73856093) ^ (col * 19349663)) % len(variants)]
+        return asset_cache.image(path, self.tile_size)
+
+    def draw_terrain_cell(self, surface, row, col, origin=(0, 0)):
+
+        # Ground, then resources of one cell with depleted ones skipped, then
+        # the fog tile on top; origin is the world position of surface's top-left
+        origin_x, origin_y = origin
+        cell_rect = pygame.Rect(col * self.tile_size - origin_x, row * self.tile_size - origin_y, self.tile_size, self.tile_size)
+        surface.blit(self.ground_image(row, col), cell_rect)
+        for sprite in sorted(self.cell_sprites.get((row, col), ()), key=lambda s: s._layer):
+            if sprite.alive():
+                surface.blit(sprite.image, sprite.rect.move(-origin_x, -origin_y))
+        surface.blit(self.fog.cell_tile(row, col), cell_rect)
 
     def draw_health_bars(self):
 
-        living_entities = list(self.villager_sprites) + list(self.scout_sprites)
-        # Draw health bars above each entity
+        # Returns the rects of all bars drawn, so they can be repainted next frame
+        rects = []
+        offset = self.camera.offset
+        view = self.camera.rect
+        # Draw health bars above each entity on screen
         if get_config('SHOW_HEALTH', True):
-            for entity in living_entities:
-                if hasattr(entity, 'draw_health_bar'):
-                    entity.draw_health_bar(self.display_surface)
+            for entity in self.visible_units:
+                rects.append(entity.draw_health_bar(self.display_surface, offset))
         
-        # Draw health bars above trees that have been chopped
-        for tree in self.tree_sprites:
-            if hasattr(tree, 'draw_health_bar') and hasattr(tree, 'wood') and hasattr(tree, 'max_wood'):
-                if tree.wood < tree.max_wood:  # Only show if tree has been chopped
-                    tree.draw_health_bar(self.display_surface)
-
-        # Draw health bars above berry bushes that have been chopped
-        for berry_bush in self.berry_bush_sprites:
-            if hasattr(berry_bush, 'draw_health_bar') and hasattr(berry_bush, 'berries') and hasattr(berry_bush, 'max_berries'):
-                if berry_bush.berries < berry_bush.max_berries:  # Only show if berry bush has been harvested
-                    berry_bush.draw_health_bar(self.display_surface)
-
-    def run(self):
-
-        # Update animation and movement
-        self.villager_sprites.update()
-        self.scout_sprites.update()
+        # Draw health bars above on-screen trees and berry bushes that have
+        # been harvested; untouched ones are never looked at
+        for resource in self.damaged_resources:
+            if view.colliderect(resource.rect):
+                rects.append(resource.draw_health_bar(self.display_surface, offset))
+        return rects
+
+    def update(self):
+
+        # Move and animate every unit in one step; animations read the
+        # board's clock when units are drawn
+        self.units.clock.advance()
+        self.units.step(current_game_state.clock.get_ticks(), current_game_state.WIDTH, current_game_state.HEIGHT)
         
-        # Reveal fog for scouts
-        for scout in self.scout_sprites:
-            self.reveal_cell(scout.rect.centerx, scout.rect.centery)
-
-        # Reveal fog for villagers
-        for villager in self.villager_sprites:
-            self.reveal_cell(villager.rect.centerx, villager.rect.centery)
+        # Reveal fog around scouts and villagers
+        self.reveal_around_units()
 
         self.avoid_unit_collisions()
         self.avoid_collisions()
 
         # Replace any dead entities individually
-        all_entities = list(self.villager_sprites) + list(self.scout_sprites)
-        for entity in all_entities:
-            if hasattr(entity, 'health') and entity.health <= 0:
+        for index in self.units.dead().tolist():
+            entity = self.units.owners[index]
+            if entity is not None:
                 entity.kill()
+            else:
+                self.units.remove(index)
 
-        # Draw world (grass, sprites) in area 0 to self.height
-        world_clip = pygame.Rect(0, 0, self.width, self.height)
-        prev_clip = self.display_surface.get_clip()
-        self.display_surface.set_clip(world_clip)
-        self.visible_sprites.draw(self.display_surface)
-
-        # Draw trees on top of base tiles but beneath entities
-        if get_config('FOG_OF_WAR', True):
-            # Only draw trees in revealed areas
-            for tree in self.tree_sprites:
-                tree_col = tree.rect.centerx // self.tile_size
-                tree_row = tree.rect.centery // self.tile_size
-                grid_sprite = self.grid_sprites.get((tree_row, tree_col))
-                if grid_sprite and grid_sprite.image.get_alpha() <= 20:  # Revealed area
-                    self.display_surface.blit(tree.image, tree.rect)
-        else:
-            # No fog of war, draw all trees
-            self.tree_sprites.draw(self.display_surface)
-        
-        self.villager_sprites.draw(self.display_surface)
-        self.scout_sprites.draw(self.display_surface)
+    def draw_panel(self):
+
+        # The panel repaints itself only when the values it shows have changed
+        return self.panel.draw(self.display_surface)
 
-        self.display_surface.set_clip(prev_clip)
-        self.draw_health_bars()
+    def cull(self):
+
+        # Only units in view are handed to the renderer
+        self.culler.begin_frame()
+        self.visible_units = self.culler.query('units', self.units, self.camera.rect, len(self.units))
+        # Only units on screen need their animation frame picked
+        for unit in self.visible_units:
+            unit.sync_image()
+
+    def draw(self):
+
+        # Terrain, resources and fog come pre-baked in the background; only
+        # changed cells, moving units, overlays and the panel are redrawn,
+        # and the whole view when the camera moved
+        self.cull()
+        self.dirty_rects = self.renderer.render(
+            self.visible_units,
+            self.terrain.flush(self.camera.rect),
+            self.draw_health_bars,
+            self.draw_panel,
+            self.camera.offset,
+        )
+
+    def run(self):
 
-        bottom_panel(self.display_surface)
\ No newline at end of file
+        self.update()
+        if not self.headless:
+            self.draw()
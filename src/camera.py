@@ -0,0 +1,35 @@
+import pygame
+
+
+class Camera:
+    """The part of the world shown on screen, in world pixels.
+
+    rect is kept inside the world; offset is what to subtract from a world
+    position to get its screen position.
+    """
+
+    def __init__(self, view_size, world_size):
+        self.world_rect = pygame.Rect((0, 0), world_size)
+        self.rect = pygame.Rect((0, 0), (min(view_size[0], world_size[0]), min(view_size[1], world_size[1])))
+
+    @property
+    def offset(self):
+        return self.rect.topleft
+
+    def move(self, dx, dy):
+        self.rect.move_ip(dx, dy)
+        self.rect.clamp_ip(self.world_rect)
+
+    def center_on(self, x, y):
+        self.rect.center = (x, y)
+        self.rect.clamp_ip(self.world_rect)
+
+    def to_screen(self, rect):
+        return rect.move(-self.rect.x, -self.rect.y)
+
+    def to_world(self, pos):
+        return pos[0] + self.rect.x, pos[1] + self.rect.y
+
+    def screen_rect(self):
+        """The viewport in screen coordinates."""
+        return pygame.Rect((0, 0), self.rect.size)
@@ -0,0 +1,95 @@
+import string
+
+LETTERS = string.ascii_lowercase
+# Rows the original two-letter labels ('aa'..'zz') could name
+LEGACY_ROWS = len(LETTERS) ** 2
+
+
+def row_label(row):
+    """Letter prefix naming a row: 'aa'..'zz' for the first 676 rows as
+    before, then 'aaa'..'zzz' for the next 17576, and so on."""
+    width, offset = 2, 0
+    while row - offset >= len(LETTERS) ** width:
+        offset += len(LETTERS) ** width
+        width += 1
+    value = row - offset
+    letters = []
+    for _ in range(width):
+        value, digit = divmod(value, len(LETTERS))
+        letters.append(LETTERS[digit])
+    return ''.join(reversed(letters))
+
+
+def parse_row_label(prefix):
+    """Inverse of row_label(); raises ValueError for a malformed prefix."""
+    if len(prefix) < 2 or not all(ch in LETTERS for ch in prefix):
+        raise ValueError(f"invalid row label {prefix!r}")
+    offset = sum(len(LETTERS) ** width for width in range(2, len(prefix)))
+    value = 0
+    for ch in prefix:
+        value = value * len(LETTERS) + ord(ch) - ord('a')
+    return offset + value
+
+
+def parse_label(label):
+    """Split a string cell id such as 'ab12' into (row, col)."""
+    split = len(label) - len(label.lstrip(LETTERS))
+    col_str = label[split:]
+    if not col_str.isdigit():
+        raise ValueError(f"invalid cell label {label!r}")
+    return parse_row_label(label[:split]), int(col_str)
+
+
+class CellGrid:
+    """Integer cell ids for a (rows, cols) tile grid: id = row * cols + col.
+
+    Converting between ids, (row, col) and pixel centers is arithmetic, so
+    it costs the same on any map size. label()/parse() translate to and from
+    the string ids ('aa0', 'ab12', ...) used by older code and saved data.
+    """
+
+    def __init__(self, rows, cols, tile_size):
+        self.rows = rows
+        self.cols = cols
+        self.tile_size = tile_size
+
+    def __len__(self):
+        return self.rows * self.cols
+
+    def __contains__(self, cell_id):
+        return isinstance(cell_id, int) and 0 <= cell_id < self.rows * self.cols
+
+    def in_bounds(self, row, col):
+        return 0 <= row < self.rows and 0 <= col < self.cols
+
+    def cell_id(self, row, col):
+        return row * self.cols + col
+
+    def row_col(self, cell_id):
+        return divmod(cell_id, self.cols)
+
+    def center(self, cell_id):
+        """Pixel center (x, y) of a cell."""
+        row, col = divmod(cell_id, self.cols)
+        half = self.tile_size // 2
+        return col * self.tile_size + half, row * self.tile_size + half
+
+    def cell_at(self, x, y):
+        """Id of the cell containing pixel (x, y), or None outside the grid."""
+        row, col = int(y // self.tile_size), int(x // self.tile_size)
+        if self.in_bounds(row, col):
+            return row * self.cols + col
+        return None
+
+    def label(self, cell_id):
+        row, col = divmod(cell_id, self.cols)
+        return row_label(row) + str(col)
+
+    def parse(self, cell):
+        """Integer id for cell, given either an id or a string label."""
+        if isinstance(cell, str):
+            row, col = parse_label(cell)
+            if not self.in_bounds(row, col):
+                raise ValueError(f"cell label {cell!r} is outside the {self.rows}x{self.cols} grid")
+            return row * self.cols + col
+        return int(cell)
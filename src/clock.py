@@ -0,0 +1,28 @@
+import pygame
+
+
+class RealTimeClock:
+    """Wall-clock time source used by the windowed game loop."""
+
+    def get_ticks(self):
+        return pygame.time.get_ticks()
+
+
+class SimulationClock:
+    """Fixed-timestep time source for headless runs.
+
+    Time only moves when advance() is called, so one simulation tick always
+    covers the same number of milliseconds regardless of how fast the CPU is.
+    """
+
+    def __init__(self, fps=60):
+        self.step_ms = 1000 / fps
+        self.ticks = 0.0
+        self.frame = 0
+
+    def get_ticks(self):
+        return int(self.ticks)
+
+    def advance(self, steps=1):
+        self.ticks += self.step_ms * steps
+        self.frame += steps
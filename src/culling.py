@@ -0,0 +1,36 @@
+class ViewCuller:
+    """Picks the objects worth drawing this frame by querying a spatial index
+    with the visible rectangle.
+
+    Each query adds to the per-frame counters: submitted is what the index
+    returned, culled is the rest of the population it was asked about.
+    counts holds the same split per category for the last frame.
+    """
+
+    def __init__(self, margin=0):
+        # Extra pixels around the view; objects in them are picked too
+        self.margin = margin
+        self.submitted = 0
+        self.culled = 0
+        self.counts = {}
+
+    def begin_frame(self):
+        self.submitted = 0
+        self.culled = 0
+        self.counts = {}
+
+    def query(self, category, index, view_rect, population):
+        """Items of index overlapping view_rect; population is the total
+        number of items the caller would otherwise have drawn."""
+        items = index.query_rect(view_rect.inflate(2 * self.margin, 2 * self.margin)) if population else []
+        culled = max(population - len(items), 0)
+        self.submitted += len(items)
+        self.culled += culled
+        self.counts[category] = (len(items), culled)
+        return items
+
+    def stats(self):
+        return {'submitted': self.submitted, 'culled': self.culled, **{
+            category: {'submitted': submitted, 'culled': culled}
+            for category, (submitted, culled) in self.counts.items()
+        }}
@@ -0,0 +1,100 @@
+import numpy as np
+import pygame
+
+from src.assets import asset_cache
+
+
+class FogOfWar:
+    """Fog-of-war state held as a (rows, cols) uint8 mask, 1 = revealed.
+
+    Reveals and visibility queries are array operations; the number of
+    revealed cells is kept up to date so percent_explored() is O(1). Drawing
+    uses two shared tiles (grid lines under fog and revealed) picked per
+    cell with cell_tile(), so nothing world-sized is kept in video memory.
+
+    The fog used to be one world-sized overlay surface, built with surfarray
+    and patched on reveal. With the camera, terrain is baked into chunks and
+    Board.draw_terrain_cell blits the fog tile last when it (re)draws a
+    cell, so a reveal only redraws the cells it changed. The overlay took 4
+    bytes per world pixel (38 MB for 64x64 cells of 48 px) and cannot be
+    allocated at all on large generated worlds.
+    """
+
+    FOG_ALPHA = 200
+    REVEALED_ALPHA = 20
+
+    def __init__(self, rows, cols, tile_size, enabled=True):
+        self.rows = rows
+        self.cols = cols
+        self.tile_size = tile_size
+        self.enabled = enabled
+        self.mask = np.zeros((rows, cols), dtype=np.uint8)
+        if not enabled:
+            self.mask[:] = 1
+        self.revealed_count = int(self.mask.sum())
+        self.tiles = None
+        self._disk_offsets = {}
+
+    def _offsets(self, radius):
+        # (dr, dc) offsets of a filled disk, cached per radius
+        offsets = self._disk_offsets.get(radius)
+        if offsets is None:
+            dr, dc = np.mgrid[-radius:radius + 1, -radius:radius + 1]
+            inside = dr * dr + dc * dc <= radius * radius
+            offsets = (dr[inside], dc[inside])
+            self._disk_offsets[radius] = offsets
+        return offsets
+
+    def reveal(self, rows, cols, radius=0):
+        """Reveal cells at (rows, cols), scalars or arrays, plus a disk of radius around each.
+
+        Returns (rows, cols) arrays of the cells that were newly revealed.
+        """
+        rows = np.atleast_1d(np.asarray(rows, dtype=np.intp))
+        cols = np.atleast_1d(np.asarray(cols, dtype=np.intp))
+        if radius > 0:
+            dr, dc = self._offsets(radius)
+            rows = (rows[:, None] + dr[None, :]).ravel()
+            cols = (cols[:, None] + dc[None, :]).ravel()
+        inside = (rows >= 0) & (rows < self.rows) & (cols >= 0) & (cols < self.cols)
+        rows, cols = rows[inside], cols[inside]
+        hidden = self.mask[rows, cols] == 0
+        if not hidden.any():
+            return rows[:0], cols[:0]
+        # A cell may appear twice when disks overlap; count it once
+        flat = np.unique(rows[hidden] * self.cols + cols[hidden])
+        new_rows, new_cols = np.divmod(flat, self.cols)
+        self.mask[new_rows, new_cols] = 1
+        self.revealed_count += len(flat)
+        return new_rows, new_cols
+
+    def is_revealed(self, row, col):
+        return 0 <= row < self.rows and 0 <= col < self.cols and self.mask[row, col] != 0
+
+    def revealed(self, rows, cols):
+        """Boolean array telling which of the (rows, cols) cells are revealed."""
+        rows = np.asarray(rows, dtype=np.intp)
+        cols = np.asarray(cols, dtype=np.intp)
+        inside = (rows >= 0) & (rows < self.rows) & (cols >= 0) & (cols < self.cols)
+        result = np.zeros(rows.shape, dtype=bool)
+        result[inside] = self.mask[rows[inside], cols[inside]] != 0
+        return result
+
+    def percent_explored(self):
+        return 100.0 * self.revealed_count / self.mask.size
+
+    def build_tiles(self):
+        """Build the grid tile at the fogged and revealed alpha levels; the
+        tile's own alpha is replaced, not multiplied."""
+        grid = asset_cache.image('graphics/grid/grid.png', self.tile_size)
+        tiles = []
+        for alpha in (self.FOG_ALPHA, self.REVEALED_ALPHA):
+            tile = pygame.Surface(grid.get_size(), pygame.SRCALPHA)
+            pygame.surfarray.pixels3d(tile)[:] = pygame.surfarray.array3d(grid)
+            pygame.surfarray.pixels_alpha(tile)[:] = alpha
+            tiles.append(tile)
+        self.tiles = tuple(tiles)
+        return self.tiles
+
+    def cell_tile(self, row, col):
+        return self.tiles[1 if self.mask[row, col] else 0]
@@ -1,4 +1,7 @@
 
+from src.clock import RealTimeClock
+from src.randomness import RandomStreams
+
 class GameState:
     def __init__(self):
         self.score = 0
@@ -9,20 +12,37 @@ class GameState:
         # Map settings (populated at game start)
         self.WIDTH = None
         self.HEIGHT = None
+        # Size of the world view on screen; smaller than WIDTH/HEIGHT on large maps
+        self.VIEW_WIDTH = None
+        self.VIEW_HEIGHT = None
         self.TILE_SIZE = None
         self.WORLD_MAP = None
         self.MAP_NAME = None
+        # (row, col) of the home tile, set by the board
+        self.home_cell = None
         # Tree locations: list of (row, col) or (x, y) positions
         self.tree_locations = []
+        # Time source read by units; swapped for a SimulationClock when headless
+        self.clock = RealTimeClock()
+        # Every random draw of the simulation comes from these seeded streams
+        self.random = RandomStreams()
+        # Bumped whenever a value shown on the HUD changes
+        self.revision = 0
+
+    def mark_changed(self):
+        self.revision += 1
 
     def add_wood(self, amount):
         self.wood += amount
+        self.mark_changed()
 
     def add_gold(self, amount):
         self.gold += amount
+        self.mark_changed()
 
     def add_food(self, amount):
         self.food += amount
+        self.mark_changed()
 
     def get_resources(self):
         return {
@@ -33,11 +53,13 @@ class GameState:
 
     def update_score(self, points):
         self.score += points
+        self.mark_changed()
     
     def reset(self):
         self.score = 0
         self.wood = 0
         self.gold = 0
         self.food = 0
+        self.mark_changed()
 
 current_game_state = GameState()
\ No newline at end of file
@@ -0,0 +1,67 @@
+import math
+
+import pygame
+
+from src.game_state import current_game_state
+
+BAR_BACKGROUND = (60, 60, 60)
+BAR_BORDER = (255, 255, 255)
+# Bar width as a fraction of the tile, height in pixels and fill color per kind
+BAR_KINDS = {
+    'tree': (0.8, 6, (139, 69, 19)),
+    'berry_bush': (0.8, 6, (255, 0, 255)),
+    'villager': (0.7, 8, (200, 40, 40)),
+    'scout': (0.7, 8, (40, 200, 40)),
+}
+
+
+class HealthBarCache:
+    """Pre-rendered health bars, so drawing a bar is a single blit.
+
+    A bar is rendered once per (kind, tile size, filled pixels): the fill
+    ratio is quantized to whole pixels of the bar, which is as fine as a
+    bar can show, so each kind has at most one surface per pixel of its
+    width. Cached surfaces must never be mutated.
+    """
+
+    def __init__(self):
+        self._bars = {}
+        self.hits = 0
+        self.misses = 0
+
+    def bar(self, kind, ratio, tile_size):
+        width_factor, height, color = BAR_KINDS[kind]
+        width = tile_size * width_factor
+        fill = int(width * max(0, min(1, ratio)))
+        key = (kind, tile_size, fill)
+        surface = self._bars.get(key)
+        if surface is not None:
+            self.hits += 1
+            return surface
+        self.misses += 1
+        # Same calls as drawing the bar in place, so the pixels match exactly
+        surface = pygame.Surface((math.ceil(width), height))
+        pygame.draw.rect(surface, BAR_BACKGROUND, (0, 0, width, height))
+        pygame.draw.rect(surface, color, (0, 0, fill, height))
+        pygame.draw.rect(surface, BAR_BORDER, (0, 0, width, height), 1)
+        self._bars[key] = surface
+        return surface
+
+    def draw(self, surface, kind, ratio, rect, offset=(0, 0)):
+        """Blit the bar of kind filled to ratio centered above rect (in
+        world coordinates, shifted by offset); returns the rect drawn."""
+        tile_size = current_game_state.TILE_SIZE
+        width = tile_size * BAR_KINDS[kind][0]
+        x = round(rect.centerx - offset[0] - width // 2)
+        return surface.blit(self.bar(kind, ratio, tile_size), (x, rect.top - offset[1]), (0, 0, round(width), BAR_KINDS[kind][1]))
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'bars': len(self._bars)}
+
+    def clear(self):
+        self._bars.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+health_bars = HealthBarCache()
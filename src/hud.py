@@ -0,0 +1,192 @@
+import math
+from collections import OrderedDict
+
+import pygame
+
+from src.config import get as get_config
+from src.game_state import current_game_state
+from agent import rl_agent
+
+# Line height for panel text (avoid overlap)
+PANEL_LINE_HEIGHT = 24
+PANEL_COLOR = (40, 40, 40)
+PANEL_BORDER_COLOR = (100, 100, 100)
+TEXT_COLOR = (255, 255, 255)
+
+
+class TextCache:
+    """Fonts and rendered text shared by every HUD widget.
+
+    A font is created once per size; text is rendered once per (size,
+    string, color) and kept in a least-recently-used cache of at most
+    capacity surfaces, so counters that go back and forth between the same
+    values never render twice. Cached surfaces must never be mutated.
+    """
+
+    def __init__(self, capacity=256):
+        self.capacity = capacity
+        self._fonts = {}
+        self._surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def font(self, size):
+        font = self._fonts.get(size)
+        if font is None:
+            font = self._fonts[size] = pygame.font.SysFont(None, size)
+        return font
+
+    def render(self, text, color=TEXT_COLOR, size=32):
+        key = (size, text, color)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self._surfaces.move_to_end(key)
+            return surface
+        self.misses += 1
+        surface = self._surfaces[key] = self.font(size).render(text, True, color)
+        if len(self._surfaces) > self.capacity:
+            self._surfaces.popitem(last=False)
+        return surface
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'surfaces': len(self._surfaces)}
+
+    def clear(self):
+        self._fonts.clear()
+        self._surfaces.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+text_cache = TextCache()
+
+
+class Label:
+    """One line of panel text, anchored at its left or right edge.
+
+    set() only looks the text up again when it differs from what the label
+    shows; a label set to None is hidden.
+    """
+
+    def __init__(self, align='left'):
+        self.align = align
+        self.text = None
+        self.surface = None
+        self.pos = (0, 0)
+
+    def set(self, text, x, y):
+        """Show text at (x, y); returns True when the label changed."""
+        if text == self.text and (x, y) == self.pos:
+            return False
+        self.text = text
+        self.pos = (x, y)
+        self.surface = text_cache.render(text) if text is not None else None
+        return True
+
+    def draw(self, surface):
+        if self.surface is None:
+            return
+        x, y = self.pos
+        if self.align == 'right':
+            x -= self.surface.get_width()
+        surface.blit(self.surface, (x, y))
+
+
+class BottomPanel:
+    """Retained-mode HUD below the world view.
+
+    The labels are only recomputed when the game state revision or the
+    agent's targets change, and the panel is only repainted when a label
+    actually changed; on other frames draw() is two comparisons.
+    """
+
+    def __init__(self):
+        self.score = Label()
+        self.wood = Label()
+        self.food = Label()
+        self.food_carrier = Label('right')
+        self.wood_carrier = Label('right')
+        self.berry_bush_target = Label('right')
+        self.tree_target = Label('right')
+        self.labels = (self.score, self.wood, self.food, self.food_carrier, self.wood_carrier,
+                       self.berry_bush_target, self.tree_target)
+        self.last_state = None
+
+    def rect(self):
+        base_y = current_game_state.VIEW_HEIGHT or current_game_state.HEIGHT
+        panel_width = current_game_state.VIEW_WIDTH or current_game_state.WIDTH
+        return pygame.Rect(0, base_y, panel_width, get_config('PANEL_HEIGHT', 120))
+
+    @staticmethod
+    def state():
+        # Everything the labels are computed from, compared by identity
+        return current_game_state.revision, rl_agent.berry_bush, rl_agent.tree, rl_agent.villager
+
+    @staticmethod
+    def carriers():
+        # First villager carrying food and first carrying wood, in one pass
+        food = wood = None
+        board = getattr(current_game_state, 'board', None)
+        for villager in getattr(board, 'villager_sprites', ()):
+            if food is None and getattr(villager, 'food_carried', 0) > 0:
+                food = villager
+            if wood is None and getattr(villager, 'wood_carried', 0) > 0:
+                wood = villager
+            if food is not None and wood is not None:
+                break
+        return food, wood
+
+    def refresh(self, panel_rect):
+        """Recompute the labels; returns True when any of them changed."""
+        base_y = panel_rect.top
+        line_y = base_y + 8
+        changed = self.score.set(f"Score: {math.ceil(current_game_state.score)}", 16, line_y)
+        changed |= self.wood.set(f"Wood: {current_game_state.wood}", 128, line_y)
+        changed |= self.food.set(f"Food: {current_game_state.food}", 240, line_y)
+        line_y += PANEL_LINE_HEIGHT
+
+        # Right side of panel: villagers carrying food/wood
+        panel_right_x = panel_rect.right - 16
+        food, wood = self.carriers()
+        text = None
+        if food is not None:
+            text = f"{food.name} carrying Food: {food.food_carried}/{food.max_food_capacity}"
+        changed |= self.food_carrier.set(text, panel_right_x, line_y)
+        if text is not None:
+            line_y += PANEL_LINE_HEIGHT
+        text = None
+        if wood is not None:
+            text = f"{wood.name} carrying Wood: {wood.wood_carried}/{wood.max_wood_capacity}"
+        changed |= self.wood_carrier.set(text, panel_right_x, line_y)
+
+        # Right side: agent targets (fixed Y, independent of villager carry lines above)
+        agent_right_y = base_y + 8
+        villager_name = rl_agent.villager.name if rl_agent.villager else 'None'
+        text = None
+        if rl_agent.berry_bush is not None:
+            text = f"Agent Target Berry Bush: {rl_agent.berry_bush.rect.center} Villager: {villager_name}"
+        changed |= self.berry_bush_target.set(text, panel_right_x, agent_right_y)
+        if text is not None:
+            agent_right_y += PANEL_LINE_HEIGHT
+        text = None
+        if rl_agent.tree is not None:
+            text = f"Agent Target Tree: {rl_agent.tree.rect.center} Villager: {villager_name}"
+        changed |= self.tree_target.set(text, panel_right_x, agent_right_y)
+        return changed
+
+    def draw(self, display_surface, force=False):
+        """Paint the panel if anything on it changed (or force); returns its
+        rect, or None when the panel on screen is still current."""
+        state = self.state()
+        if state == self.last_state and not force:
+            return None
+        self.last_state = state
+        panel_rect = self.rect()
+        if not self.refresh(panel_rect) and not force:
+            return None
+        pygame.draw.rect(display_surface, PANEL_COLOR, panel_rect)
+        pygame.draw.line(display_surface, PANEL_BORDER_COLOR, (0, panel_rect.top), (panel_rect.width, panel_rect.top), 2)
+        for label in self.labels:
+            label.draw(display_surface)
+        return panel_rect
@@ -0,0 +1,177 @@
+import os
+import struct
+import zlib
+
+import numpy as np
+
+# Tile type codes stored in binary maps; the index is the code
+TILE_TYPES = ('grass', 'tree', 'berry_bush', 'home', 'water', 'sand')
+TILE_CODES = {name: code for code, name in enumerate(TILE_TYPES)}
+
+MAGIC = b'EMAP'
+VERSION = 1
+# Payload encodings
+RAW = 0
+ZLIB = 1
+RLE = 2
+COMPRESSION = {'none': RAW, 'zlib': ZLIB, 'rle': RLE}
+
+# magic, version, compression, rows, cols, tile_size, width, height, payload bytes
+HEADER = struct.Struct('<4sHHIIIIII')
+
+
+class MapFormatError(ValueError):
+    pass
+
+
+class TileMap:
+    """A world map held as a (rows, cols) uint8 array of tile codes.
+
+    Indexes like the old list-of-lists maps (world_map[row][col] gives the
+    tile name, len() gives rows) so existing lookups keep working, while
+    tiles exposes the array for vectorized use.
+    """
+
+    def __init__(self, tiles):
+        self.tiles = tiles
+        self.rows, self.cols = tiles.shape
+
+    def __len__(self):
+        return self.rows
+
+    def __getitem__(self, row):
+        return TileRow(self.tiles[row])
+
+    def __iter__(self):
+        for row in range(self.rows):
+            yield TileRow(self.tiles[row])
+
+    def tile_at(self, row, col):
+        return TILE_TYPES[self.tiles[row, col]]
+
+    def count(self, name):
+        return int(np.count_nonzero(self.tiles == TILE_CODES[name]))
+
+    def find(self, name):
+        """(row, col) of the first tile of this type in row-major order, or None."""
+        flat = np.flatnonzero(self.tiles.ravel() == TILE_CODES[name])
+        if len(flat) == 0:
+            return None
+        row, col = divmod(int(flat[0]), self.cols)
+        return row, col
+
+    def to_lists(self):
+        return [[TILE_TYPES[code] for code in row] for row in self.tiles.tolist()]
+
+
+class TileRow:
+
+    def __init__(self, codes):
+        self.codes = codes
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, col):
+        return TILE_TYPES[self.codes[col]]
+
+    def __iter__(self):
+        return (TILE_TYPES[code] for code in self.codes.tolist())
+
+
+class BinaryMap:
+    """Header fields and tiles of a binary map file."""
+
+    def __init__(self, width, height, tile_size, tiles):
+        self.width = width
+        self.height = height
+        self.tile_size = tile_size
+        self.world_map = TileMap(tiles)
+
+
+def encode_tiles(world_map):
+    """uint8 tile-code array for a list-of-lists map of tile names."""
+    try:
+        return np.array([[TILE_CODES[name] for name in row] for row in world_map], dtype=np.uint8)
+    except KeyError as exc:
+        raise MapFormatError(f"unknown tile type {exc.args[0]!r}") from None
+
+
+def _rle_encode(flat):
+    if len(flat) == 0:
+        return struct.pack('<I', 0)
+    starts = np.concatenate(([0], np.flatnonzero(flat[1:] != flat[:-1]) + 1))
+    lengths = np.diff(np.append(starts, len(flat))).astype('<u4')
+    return struct.pack('<I', len(starts)) + lengths.tobytes() + flat[starts].tobytes()
+
+
+def _rle_decode(payload):
+    if len(payload) < 4:
+        raise MapFormatError("truncated run-length payload")
+    (runs,) = struct.unpack_from('<I', payload)
+    # A u4 length and a u1 value per run
+    if len(payload) != 4 + 5 * runs:
+        raise MapFormatError(f"run-length payload of {len(payload)} bytes for {runs} runs")
+    lengths = np.frombuffer(payload, dtype='<u4', count=runs, offset=4)
+    values = np.frombuffer(payload, dtype=np.uint8, count=runs, offset=4 + 4 * runs)
+    return np.repeat(values, lengths)
+
+
+def write_map(path, tiles, tile_size, width=None, height=None, compression='none'):
+    """Write a (rows, cols) tile-code array as a binary map.
+
+    width/height default to the full grid in pixels. Uncompressed maps are
+    memory-mapped on load; zlib and rle trade that for a smaller file.
+    """
+    tiles = np.ascontiguousarray(tiles, dtype=np.uint8)
+    rows, cols = tiles.shape
+    width = cols * tile_size if width is None else width
+    height = rows * tile_size if height is None else height
+    mode = COMPRESSION[compression]
+    if mode == ZLIB:
+        payload = zlib.compress(tiles.tobytes(), 6)
+    elif mode == RLE:
+        payload = _rle_encode(tiles.ravel())
+    else:
+        payload = tiles.tobytes()
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, mode, rows, cols, tile_size, width, height, len(payload)))
+        f.write(payload)
+
+
+def read_map(path):
+    """Load a binary map; raw payloads are returned as a read-only memmap."""
+    with open(path, 'rb') as f:
+        header = f.read(HEADER.size)
+        if len(header) < HEADER.size:
+            raise MapFormatError(f"{path}: truncated header")
+        magic, version, mode, rows, cols, tile_size, width, height, size = HEADER.unpack(header)
+        if magic != MAGIC:
+            raise MapFormatError(f"{path}: not a binary map")
+        if version != VERSION:
+            raise MapFormatError(f"{path}: unsupported map version {version}")
+        if mode == RAW:
+            available = os.fstat(f.fileno()).st_size - HEADER.size
+            if available < rows * cols:
+                raise MapFormatError(f"{path}: expected {rows * cols} tiles, found {available}")
+            tiles = np.memmap(path, dtype=np.uint8, mode='r', offset=HEADER.size, shape=(rows, cols))
+        else:
+            payload = f.read(size)
+            if len(payload) < size:
+                raise MapFormatError(f"{path}: truncated payload, {len(payload)} of {size} bytes")
+            if mode == ZLIB:
+                try:
+                    flat = np.frombuffer(zlib.decompress(payload), dtype=np.uint8)
+                except zlib.error as exc:
+                    raise MapFormatError(f"{path}: {exc}") from None
+            elif mode == RLE:
+                try:
+                    flat = _rle_decode(payload)
+                except MapFormatError as exc:
+                    raise MapFormatError(f"{path}: {exc}") from None
+            else:
+                raise MapFormatError(f"{path}: unknown compression {mode}")
+            if flat.size != rows * cols:
+                raise MapFormatError(f"{path}: expected {rows * cols} tiles, found {flat.size}")
+            tiles = flat.reshape(rows, cols)
+    return BinaryMap(width, height, tile_size, tiles)
@@ -1,16 +1,76 @@
+import argparse
 import importlib.util
 import os
 
+from src.config import get as get_config
+from src.map_format import BinaryMap, encode_tiles, read_map, write_map, COMPRESSION
+from src.worldgen import generate_map
+
 MAPS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'maps')
+BINARY_EXT = '.emap'
+# Map name that asks for a procedural world built from the WORLD_* settings
+GENERATED_MAP = 'generated'
+
+# One load per map per process: main and the board share the same TileMap
+_loaded_maps = {}
 
 def list_maps():
-    """Return a list of available map filenames (without .py extension)."""
-    return [f[:-3] for f in os.listdir(MAPS_DIR) if f.endswith('.py')]
+    """Return a list of available map names, from .py and binary map files."""
+    names = {os.path.splitext(f)[0] for f in os.listdir(MAPS_DIR) if f.endswith(('.py', BINARY_EXT))}
+    return sorted(names)
 
-def load_map(map_name):
-    """Dynamically load a map module and return its WIDTH, HEIGHT, TILE_SIZE, WORLD_MAP."""
+def _load_py_map(map_name):
     map_path = os.path.join(MAPS_DIR, f'{map_name}.py')
     spec = importlib.util.spec_from_file_location(map_name, map_path)
     module = importlib.util.module_from_spec(spec)
     spec.loader.exec_module(module)
-    return module.WIDTH, module.HEIGHT, module.TILE_SIZE, module.WORLD_MAP
+    return BinaryMap(module.WIDTH, module.HEIGHT, module.TILE_SIZE, encode_tiles(module.WORLD_MAP))
+
+def _generate_map(seed):
+    return generate_map(get_config('WORLD_ROWS', 64), get_config('WORLD_COLS', 64),
+                        get_config('WORLD_TILE_SIZE', 48), seed, get_config('WORLD_WORKERS', 1))
+
+def load_map(map_name, world_seed=None):
+    """Return WIDTH, HEIGHT, TILE_SIZE, WORLD_MAP for a map, loading it once per process.
+
+    A binary map (maps/<name>.emap) is preferred over the .py module of the
+    same name; the name 'generated' builds a world from the WORLD_* settings.
+    world_seed builds the generated world from that seed instead of
+    WORLD_SEED; such worlds are generated on every call, not cached.
+    WORLD_MAP is a TileMap: world_map[row][col] gives the tile name.
+    """
+    if map_name == GENERATED_MAP and world_seed is not None:
+        loaded = _generate_map(world_seed)
+        return loaded.width, loaded.height, loaded.tile_size, loaded.world_map
+    loaded = _loaded_maps.get(map_name)
+    if loaded is None:
+        binary_path = os.path.join(MAPS_DIR, map_name + BINARY_EXT)
+        if map_name == GENERATED_MAP:
+            loaded = _generate_map(get_config('WORLD_SEED', 0))
+        elif os.path.exists(binary_path):
+            loaded = read_map(binary_path)
+        else:
+            loaded = _load_py_map(map_name)
+        _loaded_maps[map_name] = loaded
+    return loaded.width, loaded.height, loaded.tile_size, loaded.world_map
+
+def compile_map(map_name, out_path=None, compression='none'):
+    """Convert maps/<name>.py to the binary format; returns the written path."""
+    source = _load_py_map(map_name)
+    out_path = out_path or os.path.join(MAPS_DIR, map_name + BINARY_EXT)
+    write_map(out_path, source.world_map.tiles, source.tile_size, source.width, source.height, compression)
+    return out_path
+
+def clear_cache():
+    _loaded_maps.clear()
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Compile .py maps into the binary map format.")
+    parser.add_argument('maps', nargs='*', help="map names (default: every .py map)")
+    parser.add_argument('--compression', choices=sorted(COMPRESSION), default='none')
+    parser.add_argument('--out-dir', default=MAPS_DIR)
+    args = parser.parse_args()
+    names = args.maps or [f[:-3] for f in os.listdir(MAPS_DIR) if f.endswith('.py')]
+    for name in sorted(names):
+        path = compile_map(name, os.path.join(args.out_dir, name + BINARY_EXT), args.compression)
+        print(f"{name} -> {path}")
@@ -0,0 +1,140 @@
+from collections import deque
+
+import numpy as np
+
+# (d_row, d_col, direction name) in the order ties are broken
+STEPS = ((-1, 0, 'up'), (1, 0, 'down'), (0, -1, 'left'), (0, 1, 'right'))
+
+
+# Incremental repairs remembered for changed_since(); older readers rewrite everything
+CHANGE_LOG = 64
+
+
+class HomeDistanceField:
+    """BFS distance (in tiles) from every walkable cell to the cells next to home.
+
+    Computed once from the walkability grid; when an obstacle disappears the
+    field is repaired incrementally from that cell only. A unit on its way
+    home takes the neighbour with the smallest distance, an O(1) lookup that
+    does not depend on how many units are hauling at once.
+
+    Distances live in an int32 array, with unreachable for cells that cannot
+    reach home. revision is bumped by every change, and changed_since()
+    names the cells an incremental repair touched, so copies of the field
+    (the observation tensor) can be updated cell by cell.
+    """
+
+    def __init__(self, walkable, home_cell):
+        self.rows, self.cols = walkable.shape
+        self.home_cell = home_cell
+        self.unreachable = self.rows * self.cols + 1
+        self._open_cells = np.asarray(walkable, dtype=bool).ravel().tolist()
+        self.revision = 0
+        # (revision, flat cells) of the repairs since the last full compute
+        self._changes = deque(maxlen=CHANGE_LOG)
+        self._computed = 0
+        self.compute()
+
+    def _goals(self):
+        home_row, home_col = self.home_cell
+        for d_row, d_col, _ in STEPS:
+            row, col = home_row + d_row, home_col + d_col
+            if 0 <= row < self.rows and 0 <= col < self.cols and self._open_cells[row * self.cols + col]:
+                yield row * self.cols + col
+
+    def compute(self):
+        """Full BFS from the home-adjacent cells."""
+        # The search runs on a list, which Python indexes faster than an array
+        dist = [self.unreachable] * (self.rows * self.cols)
+        queue = deque()
+        for idx in self._goals():
+            dist[idx] = 0
+            queue.append(idx)
+        self._propagate(dist, queue)
+        self._dist = np.array(dist, dtype=np.int32)
+        self.distances = self._dist.reshape(self.rows, self.cols)
+        self.revision += 1
+        self._computed = self.revision
+        self._changes.clear()
+
+    def _propagate(self, dist, queue, changed=None):
+        open_cells = self._open_cells
+        rows, cols = self.rows, self.cols
+        while queue:
+            idx = queue.popleft()
+            row, col = divmod(idx, cols)
+            next_dist = dist[idx] + 1
+            for d_row, d_col, _ in STEPS:
+                n_row, n_col = row + d_row, col + d_col
+                if 0 <= n_row < rows and 0 <= n_col < cols:
+                    n_idx = n_row * cols + n_col
+                    if open_cells[n_idx] and dist[n_idx] > next_dist:
+                        dist[n_idx] = next_dist
+                        queue.append(n_idx)
+                        if changed is not None:
+                            changed.append(n_idx)
+
+    def open_cell(self, row, col):
+        """An obstacle at (row, col) is gone: distances can only shrink, so
+        relax from that cell outwards instead of recomputing the field."""
+        idx = row * self.cols + col
+        if self._open_cells[idx]:
+            return
+        self._open_cells[idx] = True
+        home_row, home_col = self.home_cell
+        if abs(row - home_row) + abs(col - home_col) == 1:
+            new_dist = 0
+        else:
+            new_dist = min(self.distance_at(row + d_row, col + d_col) + 1 for d_row, d_col, _ in STEPS)
+        if new_dist < self._dist[idx]:
+            self._dist[idx] = new_dist
+            changed = [idx]
+            self._propagate(self._dist, deque([idx]), changed)
+            self.revision += 1
+            self._changes.append((self.revision, np.array(changed, dtype=np.int64)))
+
+    def close_cell(self, row, col):
+        """A new obstacle at (row, col); distances may grow, so recompute."""
+        idx = row * self.cols + col
+        if not self._open_cells[idx]:
+            return
+        self._open_cells[idx] = False
+        self.compute()
+
+    def changed_since(self, revision):
+        """Flat indices (row * cols + col) of the cells whose distance
+        changed after revision, or None when that is no longer known (the
+        field was recomputed, or too many repairs ago)."""
+        if revision < self._computed:
+            return None
+        changes = [cells for change, cells in self._changes if change > revision]
+        if self.revision - revision > len(changes):
+            return None
+        return np.concatenate(changes) if changes else np.empty(0, dtype=np.int64)
+
+    def distance_at(self, row, col):
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            return int(self._dist[row * self.cols + col])
+        return self.unreachable
+
+    def next_step(self, row, col):
+        """(d_row, d_col, direction) toward home from (row, col), or None when
+        already next to home or no route exists."""
+        here = self.distance_at(row, col)
+        best = None
+        best_dist = here
+        for d_row, d_col, direction in STEPS:
+            n_dist = self.distance_at(row + d_row, col + d_col)
+            if n_dist < best_dist:
+                best_dist = n_dist
+                best = (d_row, d_col, direction)
+        if here == 0 or best_dist >= self.unreachable:
+            return None
+        return best
+
+    def as_array(self, cells=None):
+        """Distances as a (rows, cols) int32 array, -1 where home is
+        unreachable; with cells, only the distances of those flat indices."""
+        dist = self.distances.copy() if cells is None else self._dist[cells]
+        dist[dist >= self.unreachable] = -1
+        return dist
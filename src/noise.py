@@ -0,0 +1,139 @@
+import math
+
+import numpy as np
+
+# Rows evaluated at once; bounds the temporaries to a few bands of the output
+BAND_ROWS = 128
+_MASK64 = 0xFFFFFFFFFFFFFFFF
+
+
+def fade(t):
+    return t * t * t * (t * (t * 6 - 15) + 10)
+
+
+def _mix(h):
+    # 64-bit finalizer (splitmix64); uint64 arithmetic wraps as intended
+    h ^= h >> np.uint64(30)
+    h *= np.uint64(0xBF58476D1CE4E5B9)
+    h ^= h >> np.uint64(27)
+    h *= np.uint64(0x94D049BB133111EB)
+    h ^= h >> np.uint64(31)
+    return h
+
+
+def _hash(seed, i, j):
+    # Mixed as an array: numpy warns on overflowing scalar arithmetic
+    key = _mix(np.array([(seed + 0x9E3779B97F4A7C15) & _MASK64], dtype=np.uint64))[0]
+    h = _mix(np.asarray(i, dtype=np.int64).astype(np.uint64) * np.uint64(0xD6E8FEB86659FD93) ^ key)
+    return _mix(h ^ np.asarray(j, dtype=np.int64).astype(np.uint64) * np.uint64(0xA0761D6478BD642F))
+
+
+def lattice_angles(seed, i, j):
+    """Gradient angle at lattice points (i, j), a pure function of seed and
+    position, so any two windows agree where they meet."""
+    # Top 24 bits are exact in float32
+    return (_hash(seed, i, j) >> np.uint64(40)).astype(np.float32) * np.float32(2 * math.pi / (1 << 24))
+
+
+def white_noise(seed, row0, col0, rows, cols):
+    """Uniform float32 values in [0, 1) per cell of a window, consistent
+    across windows like the gradient lattice."""
+    i = np.arange(row0, row0 + rows)[:, None]
+    j = np.arange(col0, col0 + cols)[None, :]
+    return (_hash(seed, i, j) >> np.uint64(40)).astype(np.float32) * np.float32(1.0 / (1 << 24))
+
+
+class NoiseField:
+    """Fractal Perlin noise over an unbounded plane, evaluated in windows.
+
+    Gradients come from hashing (seed, octave, lattice point) instead of a
+    stored random array, so window(r, c, h, w) returns the same values for
+    a cell whichever window it is part of, and large maps can be generated
+    tile by tile. Everything is float32; octaves are added in place into the
+    output, and work is done in bands of BAND_ROWS rows so peak memory stays
+    close to the size of the output.
+
+    period is the size of the first octave's features in cells; each octave
+    divides it by lacunarity and scales its amplitude by persistence.
+    """
+
+    def __init__(self, seed, period=48, octaves=4, persistence=0.5, lacunarity=2.0):
+        self.seed = seed
+        self.period = period
+        self.octaves = octaves
+        self.persistence = persistence
+        self.lacunarity = lacunarity
+
+    def window(self, row0, col0, rows, cols, out=None):
+        """Noise for cells [row0, row0 + rows) x [col0, col0 + cols)."""
+        if out is None:
+            out = np.empty((rows, cols), dtype=np.float32)
+        out[:] = 0
+        col_coords = np.arange(col0, col0 + cols, dtype=np.float64)
+        for band0 in range(0, rows, BAND_ROWS):
+            band = out[band0:band0 + BAND_ROWS]
+            row_coords = np.arange(row0 + band0, row0 + band0 + len(band), dtype=np.float64)
+            scratch = np.empty_like(band)
+            frequency = 1.0 / self.period
+            amplitude = 1.0
+            for octave in range(self.octaves):
+                self._octave(row_coords, col_coords, frequency, self.seed * 64 + octave, scratch)
+                scratch *= np.float32(amplitude)
+                band += scratch
+                frequency *= self.lacunarity
+                amplitude *= self.persistence
+        return out
+
+    def generate(self, rows, cols, out=None):
+        return self.window(0, 0, rows, cols, out)
+
+    def tiles(self, rows, cols, tile=1024):
+        """Yield (row0, col0, window) covering a rows x cols map tile by tile."""
+        for row0 in range(0, rows, tile):
+            for col0 in range(0, cols, tile):
+                yield row0, col0, self.window(row0, col0, min(tile, rows - row0), min(tile, cols - col0))
+
+    @staticmethod
+    def _octave(row_coords, col_coords, frequency, seed, out):
+        # Lattice cell and position inside it along each axis
+        x = row_coords * frequency
+        y = col_coords * frequency
+        i0 = np.floor(x).astype(np.int64)
+        j0 = np.floor(y).astype(np.int64)
+        u = (x - i0).astype(np.float32)[:, None]
+        v = (y - j0).astype(np.float32)[None, :]
+        # Gradients of the small lattice patch under the window
+        i_lat = np.arange(i0[0], i0[-1] + 2)[:, None]
+        j_lat = np.arange(j0[0], j0[-1] + 2)[None, :]
+        angles = lattice_angles(seed, i_lat, j_lat)
+        gx, gy = np.cos(angles), np.sin(angles)
+        ri = i0 - i0[0]
+        cj = j0 - j0[0]
+
+        def ramp(d_row, d_col):
+            # Dot product of the corner gradient with the offset to the corner.
+            # Columns are gathered on the small lattice first, then whole rows
+            # are copied, which is much faster than a 2-D fancy index
+            ramp_out = gx[:, cj + d_col][ri + d_row]
+            ramp_out *= u - d_row
+            ramp_out += gy[:, cj + d_col][ri + d_row] * (v - d_col)
+            return ramp_out
+
+        tu, tv = fade(u), fade(v)
+        # n0 = n00 + tu * (n10 - n00), likewise n1, then blend along columns
+        n0 = ramp(0, 0)
+        n10 = ramp(1, 0)
+        n10 -= n0
+        n10 *= tu
+        n0 += n10
+        n1 = ramp(0, 1)
+        n11 = ramp(1, 1)
+        n11 -= n1
+        n11 *= tu
+        n1 += n11
+        del n10, n11
+        n1 -= n0
+        n1 *= tv
+        n0 += n1
+        np.multiply(n0, np.float32(math.sqrt(2)), out=out)
+        return out
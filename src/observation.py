@@ -0,0 +1,118 @@
+import numpy as np
+
+# Channels of the observation tensor, in order
+CHANNELS = ('terrain', 'trees', 'berry_bushes', 'units', 'fog', 'home_distance')
+CHANNEL = {name: index for index, name in enumerate(CHANNELS)}
+
+
+class ObservationBuilder:
+    """A (channels, rows, cols) float32 tensor of the board for learning
+    agents, kept up to date from board events instead of rebuilt per step.
+
+    Channels (see CHANNELS): terrain holds the occupancy kind of each cell
+    (src.occupancy EMPTY, TREE, ...); trees and berry_bushes the fraction of
+    wood or berries left where one stands; units the number of units whose
+    center is in the cell (units off the grid are not counted); fog 1 where revealed; home_distance the walking
+    distance to home in tiles, -1 where home cannot be reached.
+
+    The board calls resource_changed(), obstacle_removed() and
+    cells_revealed() as things happen; sync() catches up with the units
+    that changed cell and with the home distance after obstacles were
+    removed, touching only what changed. observation() and channel() hand
+    out read-only views of the live tensor, so nothing is copied. Pass out
+    to build into an existing array, e.g. one slot of a batch.
+    """
+
+    def __init__(self, board, out=None):
+        self.board = board
+        shape = (len(CHANNELS), board.grid_rows, board.grid_cols)
+        if out is None:
+            out = np.zeros(shape, dtype=np.float32)
+        elif out.shape != shape or out.dtype != np.float32:
+            raise ValueError(f"observation buffer must be float32 {shape}, got {out.dtype} {out.shape}")
+        self.tensor = out
+        self._view = out.view()
+        self._view.flags.writeable = False
+        # Cell of every unit slot as last counted, -1 when not counted
+        self.unit_cells = np.full(board.units.capacity, -1, dtype=np.int64)
+        # Revision of the home distance field the channel matches, -1 for none
+        self.distance_revision = -1
+        self.rebuild()
+        board.observers.append(self)
+
+    def rebuild(self):
+        """Fill every channel from the board, e.g. after attaching."""
+        board, tensor = self.board, self.tensor
+        tensor[:] = 0
+        tensor[CHANNEL['terrain']] = board.occupancy.kinds
+        for tree in board.tree_sprites:
+            self.resource_changed(tree)
+        for berry_bush in board.berry_bush_sprites:
+            self.resource_changed(berry_bush)
+        tensor[CHANNEL['fog']] = board.fog.mask
+        self.unit_cells[:] = -1
+        self.distance_revision = -1
+        tensor[CHANNEL['home_distance']] = -1
+        self.sync()
+
+    def resource_changed(self, sprite):
+        if hasattr(sprite, 'wood'):
+            channel, left = CHANNEL['trees'], sprite.wood / sprite.max_wood
+        else:
+            channel, left = CHANNEL['berry_bushes'], sprite.berries / sprite.max_berries
+        self.tensor[(channel,) + self.board.occupancy.cell_of(sprite)] = left
+
+    def obstacle_removed(self, sprite, row, col):
+        self.tensor[CHANNEL['terrain'], row, col] = self.board.occupancy.kinds[row, col]
+
+    def cells_revealed(self, rows, cols):
+        self.tensor[CHANNEL['fog'], rows, cols] = 1
+
+    def sync(self):
+        """Move unit counts of units that changed cell and copy the home
+        distances that changed since the last sync."""
+        units, tensor = self.board.units, self.tensor
+        if len(self.unit_cells) < units.capacity:
+            grown = np.full(units.capacity, -1, dtype=np.int64)
+            grown[:len(self.unit_cells)] = self.unit_cells
+            self.unit_cells = grown
+        n = units.used
+        cells = np.full(n, -1, dtype=np.int64)
+        index = units.indices()
+        if len(index):
+            x, y = (units.pos[:, index] + units.size[:, index] // 2) // self.board.tile_size
+            # A center off the grid is in no cell and not counted
+            inside = (x >= 0) & (x < self.board.grid_cols) & (y >= 0) & (y < self.board.grid_rows)
+            cells[index[inside]] = y[inside] * self.board.grid_cols + x[inside]
+        changed = np.flatnonzero(cells != self.unit_cells[:n])
+        # Slots above the high-water mark can only hold removed units
+        stale = np.flatnonzero(self.unit_cells[n:] >= 0) + n
+        if len(changed) or len(stale):
+            counts = tensor[CHANNEL['units']].reshape(-1)
+            old = self.unit_cells[np.concatenate([changed, stale])]
+            np.subtract.at(counts, old[old >= 0], 1)
+            new = cells[changed]
+            np.add.at(counts, new[new >= 0], 1)
+            self.unit_cells[changed] = new
+            self.unit_cells[stale] = -1
+        navigator = self.board.home_navigator
+        if navigator is not None and navigator.revision != self.distance_revision:
+            cells = navigator.changed_since(self.distance_revision)
+            if cells is None:
+                tensor[CHANNEL['home_distance']] = navigator.as_array()
+            else:
+                rows, cols = np.divmod(cells, navigator.cols)
+                tensor[CHANNEL['home_distance'], rows, cols] = navigator.as_array(cells)
+            self.distance_revision = navigator.revision
+
+    def observation(self):
+        """Read-only (channels, rows, cols) view of the live tensor."""
+        return self._view
+
+    def channel(self, name):
+        """Read-only (rows, cols) view of one channel."""
+        return self._view[CHANNEL[name]]
+
+    def detach(self):
+        if self in self.board.observers:
+            self.board.observers.remove(self)
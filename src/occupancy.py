@@ -0,0 +1,78 @@
+import numpy as np
+import pygame
+
+# Obstacle kinds stored in the grid
+EMPTY = 0
+TREE = 1
+BERRY_BUSH = 2
+HOME = 3
+WATER = 4
+
+
+class TerrainObstacle:
+    """Stand-in returned by collide() for an impassable terrain cell, which
+    has no sprite of its own."""
+
+    def __init__(self, rect):
+        self.rect = rect
+
+
+class OccupancyGrid:
+    """Which static obstacle (tree, bush, home, water) stands on each tile.
+
+    kinds is a (rows, cols) uint8 array for vectorized use (walkability,
+    observations); obstacles maps (row, col) to the sprite itself. A unit
+    collision check only looks at the few cells its rect overlaps.
+    """
+
+    def __init__(self, rows, cols, tile_size):
+        self.rows = rows
+        self.cols = cols
+        self.tile_size = tile_size
+        self.kinds = np.zeros((rows, cols), dtype=np.uint8)
+        self.obstacles = {}
+
+    def cell_of(self, sprite):
+        return sprite.rect.centery // self.tile_size, sprite.rect.centerx // self.tile_size
+
+    def add(self, sprite, kind):
+        row, col = self.cell_of(sprite)
+        self.kinds[row, col] = kind
+        self.obstacles[(row, col)] = sprite
+
+    def block(self, row, col, kind=WATER):
+        """Mark a cell impassable without a sprite, e.g. water."""
+        self.kinds[row, col] = kind
+
+    def remove(self, sprite):
+        """Clear the cell of sprite; returns its (row, col)."""
+        row, col = self.cell_of(sprite)
+        if self.obstacles.get((row, col)) is sprite:
+            del self.obstacles[(row, col)]
+            self.kinds[row, col] = EMPTY
+        return row, col
+
+    def kind_at(self, row, col):
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            return int(self.kinds[row, col])
+        return EMPTY
+
+    def walkable(self):
+        """Boolean (rows, cols) array, True where no obstacle stands."""
+        return self.kinds == EMPTY
+
+    def collide(self, rect):
+        """Return the first obstacle whose rect overlaps rect, or None."""
+        size = self.tile_size
+        obstacles = self.obstacles
+        kinds = self.kinds
+        for row in range(max(rect.top // size, 0), min((rect.bottom - 1) // size, self.rows - 1) + 1):
+            for col in range(max(rect.left // size, 0), min((rect.right - 1) // size, self.cols - 1) + 1):
+                obstacle = obstacles.get((row, col))
+                if obstacle is not None:
+                    if obstacle.rect.colliderect(rect):
+                        return obstacle
+                elif kinds[row, col] == WATER:
+                    # The cell rect always overlaps rect here
+                    return TerrainObstacle(pygame.Rect(col * size, row * size, size, size))
+        return None
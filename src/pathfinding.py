@@ -0,0 +1,138 @@
+import heapq
+
+import numpy as np
+
+# 4-connected moves as (d_row, d_col)
+NEIGHBOURS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+
+class GridPathfinder:
+    """A* over a (rows, cols) walkability grid.
+
+    Uses a Manhattan heuristic, a binary heap ordered by (f, h) so ties go to
+    nodes closer to the goal, and parent pointers for path reconstruction.
+    Cells are handled as flat indices (row * cols + col) internally.
+    nodes_expanded holds the count for the most recent query, and
+    out_of_budget whether it gave up on its max_expansions budget.
+    """
+
+    def __init__(self, walkable):
+        self.walkable = np.array(walkable, dtype=bool)
+        self.rows, self.cols = self.walkable.shape
+        self._open_cells = self.walkable.ravel().tolist()
+        self.nodes_expanded = 0
+        self.out_of_budget = False
+
+    def set_walkable(self, row, col, value=True):
+        self.walkable[row, col] = value
+        self._open_cells[row * self.cols + col] = bool(value)
+
+    def find_path(self, start, goal, max_expansions=None):
+        """Return the list of (row, col) cells from start to goal inclusive, or [] if unreachable.
+
+        The start cell itself does not need to be walkable. With
+        max_expansions, the search gives up and returns [] once that many
+        nodes were expanded without reaching the goal, which bounds the
+        cost of a query whatever the map (see benchmarks/pathfinding.py).
+        """
+        rows, cols = self.rows, self.cols
+        open_cells = self._open_cells
+        start_row, start_col = start
+        goal_row, goal_col = goal
+        self.nodes_expanded = 0
+        self.out_of_budget = False
+        if not (0 <= start_row < rows and 0 <= start_col < cols and 0 <= goal_row < rows and 0 <= goal_col < cols):
+            return []
+        start_idx = start_row * cols + start_col
+        goal_idx = goal_row * cols + goal_col
+        if start_idx == goal_idx:
+            return [(start_row, start_col)]
+        if not open_cells[goal_idx]:
+            return []
+
+        parents = {start_idx: -1}
+        g_score = {start_idx: 0}
+        h = abs(start_row - goal_row) + abs(start_col - goal_col)
+        heap = [(h, h, start_idx)]
+        heappush, heappop = heapq.heappush, heapq.heappop
+        expanded = 0
+        while heap:
+            f, h, idx = heappop(heap)
+            g = f - h
+            if g > g_score[idx]:
+                continue  # stale heap entry
+            expanded += 1
+            if idx == goal_idx:
+                self.nodes_expanded = expanded
+                return self._reconstruct(parents, idx)
+            if expanded == max_expansions:
+                self.nodes_expanded = expanded
+                self.out_of_budget = True
+                return []
+            row, col = divmod(idx, cols)
+            next_g = g + 1
+            for d_row, d_col in NEIGHBOURS:
+                n_row, n_col = row + d_row, col + d_col
+                if n_row < 0 or n_row >= rows or n_col < 0 or n_col >= cols:
+                    continue
+                n_idx = n_row * cols + n_col
+                if not open_cells[n_idx]:
+                    continue
+                old_g = g_score.get(n_idx)
+                if old_g is not None and old_g <= next_g:
+                    continue
+                g_score[n_idx] = next_g
+                parents[n_idx] = idx
+                n_h = abs(n_row - goal_row) + abs(n_col - goal_col)
+                heappush(heap, (next_g + n_h, n_h, n_idx))
+        self.nodes_expanded = expanded
+        return []
+
+    def _reconstruct(self, parents, idx):
+        cols = self.cols
+        path = []
+        while idx != -1:
+            path.append(divmod(idx, cols))
+            idx = parents[idx]
+        path.reverse()
+        return path
+
+
+class BlockedCellsPathfinder(GridPathfinder):
+    """GridPathfinder over a grid that is open except for a set of blocked
+    cells. set_blocked() only updates the cells that changed since the last
+    call, so repeated queries with (mostly) the same obstacles do not pay
+    for the whole grid again."""
+
+    def __init__(self, rows, cols):
+        super().__init__(np.ones((rows, cols), dtype=bool))
+        self.blocked = set()
+        self._cells = frozenset()
+
+    def set_blocked(self, cells):
+        if not isinstance(cells, (set, frozenset)):
+            cells = set(cells)
+        if cells == self._cells:
+            return
+        self._cells = frozenset(cells)
+        rows, cols = self.rows, self.cols
+        cells = {(row, col) for row, col in cells if 0 <= row < rows and 0 <= col < cols}
+        for row, col in self.blocked - cells:
+            self.set_walkable(row, col, True)
+        for row, col in cells - self.blocked:
+            self.set_walkable(row, col, False)
+        self.blocked = cells
+
+
+def find_path(start, end, pathfinder, tile_size):
+    """Pixel-space A*: start/end are (x, y) tile centers, result is a list of (x, y) centers.
+
+    pathfinder is a GridPathfinder, or a walkability grid to build one from
+    (which costs a pass over the whole grid).
+    """
+    if not isinstance(pathfinder, GridPathfinder):
+        pathfinder = GridPathfinder(pathfinder)
+    cells = pathfinder.find_path((start[1] // tile_size, start[0] // tile_size),
+                                 (end[1] // tile_size, end[0] // tile_size))
+    half = tile_size // 2
+    return [(col * tile_size + half, row * tile_size + half) for row, col in cells]
@@ -0,0 +1,31 @@
+import random
+import zlib
+
+import numpy as np
+
+
+class RandomStreams:
+    """Seeded random numbers for the whole simulation, one named stream per
+    concern.
+
+    stream(name) is a random.Random and generator(name) a NumPy Generator,
+    both derived from (seed, name) only, so a draw in one stream (say a
+    tile picking its artwork) never shifts what another one (unit AI)
+    produces, and the same seed gives the same world and the same run in
+    any process. Without a seed one is drawn from the OS; it is kept in
+    seed so the run can be reproduced.
+    """
+
+    def __init__(self, seed=None):
+        self.seed = random.SystemRandom().randrange(1 << 32) if seed is None else seed
+        self.streams = {}
+
+    def stream(self, name):
+        stream = self.streams.get(name)
+        if stream is None:
+            stream = self.streams[name] = random.Random(f"{self.seed}:{name}")
+        return stream
+
+    def generator(self, name):
+        """A new NumPy Generator for name; the same on every call."""
+        return np.random.default_rng([self.seed, zlib.crc32(name.encode())])
@@ -0,0 +1,104 @@
+import pygame
+
+# Draw order of the board, bottom to top. Terrain, resources and fog are
+# static and baked into the terrain chunks by TerrainLayer; units are drawn
+# by a LayeredDirty group of screen-space stand-ins; overlays and the panel
+# are painted last.
+LAYER_TERRAIN = 0
+LAYER_RESOURCES = 1
+LAYER_FOG = 2
+LAYER_UNITS = 3
+LAYER_OVERLAYS = 4
+LAYER_PANEL = 5
+
+
+class ScreenSprite(pygame.sprite.DirtySprite):
+    """Stand-in drawn in place of a world sprite, at its screen position.
+
+    The world sprite's rect is only read, never moved, so drawing leaves
+    unit positions (and the store revision) alone.
+    """
+
+    def __init__(self, sprite):
+        self._layer = sprite._layer
+        super().__init__()
+        # Image and position change every frame
+        self.dirty = 2
+
+    def follow(self, sprite, dx, dy):
+        self.image = sprite.image
+        self.rect = sprite.rect.move(-dx, -dy)
+
+
+class RenderPipeline:
+    """Dirty-rect renderer: every sprite is drawn once and only changed
+    rectangles are returned for pygame.display.update(rects).
+
+    Overlays (health bars) are painted immediate-mode on top of the sprites;
+    their rectangles are restored from the background on the next frame.
+    Sprites live in world coordinates; each frame the ones passed to
+    render() are drawn through screen-space stand-ins, and the stand-ins of
+    sprites no longer passed are dropped and their last rect repainted.
+    background and view_rect are in screen coordinates.
+    """
+
+    def __init__(self, display_surface, background, view_rect):
+        self.display_surface = display_surface
+        self.sprites = pygame.sprite.LayeredDirty()
+        # World sprite -> its stand-in in self.sprites
+        self.screen_sprites = {}
+        self.view_rect = view_rect
+        self.sprites.clear(display_surface, background)
+        self.sprites.set_clip(view_rect)
+        # The first frame paints the whole view
+        self.sprites.repaint_rect(view_rect)
+        self.overlay_rects = []
+
+    def sync(self, sprites, offset):
+        # Stand-ins are kept while their sprite stays in view, so the group
+        # keeps their draw order and only views entered or left change it
+        dx, dy = offset
+        previous, current = self.screen_sprites, {}
+        for sprite in sprites:
+            screen_sprite = previous.pop(sprite, None)
+            if screen_sprite is None:
+                screen_sprite = ScreenSprite(sprite)
+                self.sprites.add(screen_sprite)
+            screen_sprite.follow(sprite, dx, dy)
+            current[sprite] = screen_sprite
+        # The group repaints the last rect of every stand-in it loses
+        if previous:
+            self.sprites.remove(*previous.values())
+        self.screen_sprites = current
+
+    def render(self, sprites, repaint_rects, draw_overlays, draw_panel, offset=(0, 0)):
+        """Draw one frame and return the list of screen rects that changed.
+
+        sprites: the world sprites to draw this frame, e.g. the units the
+            culler found in view.
+        repaint_rects: background areas that changed since the last frame.
+        draw_overlays(): paints overlays, returns the rects it touched.
+        draw_panel(): paints the panel, returns its rect or None when nothing
+            changed.
+        offset: camera position, subtracted from sprite rects when drawn.
+        """
+        for rect in repaint_rects:
+            self.sprites.repaint_rect(rect)
+        for rect in self.overlay_rects:
+            self.sprites.repaint_rect(rect)
+
+        self.sync(sprites, offset)
+        rects = self.sprites.draw(self.display_surface)
+
+        # Keep overlays of sprites near the edge out of the panel
+        prev_clip = self.display_surface.get_clip()
+        self.display_surface.set_clip(self.view_rect)
+        overlay_rects = [rect.clip(self.view_rect) for rect in draw_overlays() if rect]
+        self.display_surface.set_clip(prev_clip)
+        self.overlay_rects = [rect for rect in overlay_rects if rect]
+        rects.extend(self.overlay_rects)
+
+        panel_rect = draw_panel()
+        if panel_rect:
+            rects.append(panel_rect)
+        return rects
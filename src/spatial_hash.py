@@ -0,0 +1,189 @@
+import math
+
+
+class SpatialHash:
+    """Uniform-grid spatial hash over rects, keyed on square cells of
+    cell_size pixels.
+
+    Each item is stored in every cell its rect overlaps. update() is
+    incremental: an item that stays within the same cells costs one tuple
+    comparison. Pair, rect, radius and nearest queries only look at occupied
+    cells near the query, so their cost follows local density, not
+    population. The board indexes trees and berry bushes with it in blocks
+    of 8x8 tiles; units collide through UnitStore.collide_units, which does
+    the same broad phase over its arrays.
+    """
+
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self.buckets = {}
+        self.item_cells = {}
+        self.item_rects = {}
+        # Range of bucket coordinates ever used and largest rect side seen,
+        # both bound the nearest() ring search
+        self.bounds = None
+        self.max_extent = 0
+
+    def __len__(self):
+        return len(self.item_cells)
+
+    def __contains__(self, item):
+        return item in self.item_cells
+
+    def _cells_for(self, rect):
+        size = self.cell_size
+        # right/bottom are exclusive, so a rect ending on a cell border stays out of the next cell
+        col0, col1 = rect.left // size, (rect.right - 1) // size
+        row0, row1 = rect.top // size, (rect.bottom - 1) // size
+        if col0 == col1 and row0 == row1:
+            return ((row0, col0),)
+        return tuple((row, col) for row in range(row0, row1 + 1) for col in range(col0, col1 + 1))
+
+    def update(self, item, rect):
+        """Insert item, or move it to the cells covered by rect."""
+        self.item_rects[item] = rect
+        cells = self._cells_for(rect)
+        old_cells = self.item_cells.get(item)
+        if old_cells == cells:
+            return
+        if old_cells:
+            for cell in old_cells:
+                bucket = self.buckets[cell]
+                bucket.discard(item)
+                if not bucket:
+                    del self.buckets[cell]
+        for cell in cells:
+            self.buckets.setdefault(cell, set()).add(item)
+        self.item_cells[item] = cells
+        self.max_extent = max(self.max_extent, rect.width, rect.height)
+        (row0, col0), (row1, col1) = cells[0], cells[-1]
+        if self.bounds is None:
+            self.bounds = [row0, col0, row1, col1]
+        else:
+            bounds = self.bounds
+            bounds[0], bounds[1] = min(bounds[0], row0), min(bounds[1], col0)
+            bounds[2], bounds[3] = max(bounds[2], row1), max(bounds[3], col1)
+
+    insert = update
+
+    def remove(self, item):
+        cells = self.item_cells.pop(item, None)
+        self.item_rects.pop(item, None)
+        if not cells:
+            return
+        for cell in cells:
+            bucket = self.buckets.get(cell)
+            if bucket is not None:
+                bucket.discard(item)
+                if not bucket:
+                    del self.buckets[cell]
+
+    def clear(self):
+        self.buckets.clear()
+        self.item_cells.clear()
+        self.item_rects.clear()
+        self.bounds = None
+        self.max_extent = 0
+
+    def candidate_pairs(self):
+        """Broad phase: every pair of items sharing at least one cell, once."""
+        seen = set()
+        for bucket in self.buckets.values():
+            if len(bucket) < 2:
+                continue
+            items = list(bucket)
+            for i in range(len(items)):
+                for j in range(i + 1, len(items)):
+                    a, b = items[i], items[j]
+                    key = (id(a), id(b)) if id(a) < id(b) else (id(b), id(a))
+                    if key not in seen:
+                        seen.add(key)
+                        yield a, b
+
+    def colliding_pairs(self):
+        """Pairs of items whose rects actually overlap."""
+        rects = self.item_rects
+        for a, b in self.candidate_pairs():
+            if rects[a].colliderect(rects[b]):
+                yield a, b
+
+    def query_rect(self, rect):
+        """Items whose rects overlap rect."""
+        found = set()
+        for cell in self._cells_for(rect):
+            bucket = self.buckets.get(cell)
+            if bucket:
+                found.update(bucket)
+        return [item for item in found if self.item_rects[item].colliderect(rect)]
+
+    def query_radius(self, x, y, radius):
+        """Items whose rect centers lie within radius pixels of (x, y)."""
+        size = self.cell_size
+        col0, col1 = math.floor((x - radius) / size), math.floor((x + radius) / size)
+        row0, row1 = math.floor((y - radius) / size), math.floor((y + radius) / size)
+        found = set()
+        for row in range(row0, row1 + 1):
+            for col in range(col0, col1 + 1):
+                bucket = self.buckets.get((row, col))
+                if bucket:
+                    found.update(bucket)
+        radius_sq = radius * radius
+        result = []
+        for item in found:
+            cx, cy = self.item_rects[item].center
+            if (cx - x) ** 2 + (cy - y) ** 2 <= radius_sq:
+                result.append(item)
+        return result
+
+    def nearest(self, x, y, k=1, max_distance=None):
+        """The k items whose rect centers are closest to (x, y) by Manhattan
+        distance, nearest first. Ties are broken by center (y, x) so results
+        do not depend on insertion order.
+
+        Searches rings of cells outward from (x, y) and stops once no
+        unvisited ring can hold anything closer than the k-th best so far.
+        """
+        if not self.item_cells or k <= 0:
+            return []
+        size = self.cell_size
+        row, col = math.floor(y / size), math.floor(x / size)
+        min_row, min_col, max_row, max_col = self.bounds
+        max_ring = max(row - min_row, max_row - row, col - min_col, max_col - col, 0)
+        rects = self.item_rects
+        seen = set()
+        best = []
+        for ring in range(max_ring + 1):
+            # Centers of items not seen yet are at least this far away
+            ring_floor = max((ring - 1) * size - self.max_extent, 0)
+            if max_distance is not None and ring_floor > max_distance:
+                break
+            if len(best) >= k and best[k - 1][0] < ring_floor:
+                break
+            for cell in self._ring(row, col, ring):
+                bucket = self.buckets.get(cell)
+                if not bucket:
+                    continue
+                for item in bucket:
+                    if item in seen:
+                        continue
+                    seen.add(item)
+                    cx, cy = rects[item].center
+                    distance = abs(cx - x) + abs(cy - y)
+                    if max_distance is None or distance <= max_distance:
+                        best.append((distance, cy, cx, id(item), item))
+            best.sort(key=lambda entry: entry[:4])
+            del best[k:]
+        return [entry[4] for entry in best]
+
+    @staticmethod
+    def _ring(row, col, ring):
+        # Cells at Chebyshev distance exactly ring from (row, col)
+        if ring == 0:
+            yield row, col
+            return
+        for c in range(col - ring, col + ring + 1):
+            yield row - ring, c
+            yield row + ring, c
+        for r in range(row - ring + 1, row + ring):
+            yield r, col - ring
+            yield r, col + ring
@@ -0,0 +1,133 @@
+from collections import OrderedDict
+
+import pygame
+
+from src.assets import display_ready
+
+
+class TerrainLayer:
+    """Static ground baked into chunks of chunk_size x chunk_size cells.
+
+    The layer owns no sprites; draw_cell(surface, row, col, origin) paints
+    one cell onto a surface whose top-left sits at world pixel origin. A
+    chunk is baked the first time the view touches it and kept in an LRU
+    cache of at most capacity chunks, so memory follows the viewport rather
+    than the world. The visible chunks are composed into surface, a
+    viewport-sized background; afterwards only cells marked dirty (a tree
+    chopped down, a fog cell revealed, ...) are repainted.
+    """
+
+    def __init__(self, view_size, tile_size, grid_size, draw_cell, chunk_size=32, capacity=None):
+        self.tile_size = tile_size
+        self.rows, self.cols = grid_size
+        self.draw_cell = draw_cell
+        self.chunk_size = chunk_size
+        self.chunk_px = chunk_size * tile_size
+        if capacity is None:
+            # Twice the most chunks one view can overlap, so scrolling back
+            # and forth does not rebake
+            capacity = 2 * (view_size[0] // self.chunk_px + 2) * (view_size[1] // self.chunk_px + 2)
+        self.capacity = capacity
+        self.surface = self._new_surface(view_size)
+        self.chunks = OrderedDict()
+        self.dirty = {}
+        self.view = None
+        self.baked = 0
+        self.evicted = 0
+
+    @staticmethod
+    def _new_surface(size):
+        surface = pygame.Surface(size)
+        return surface.convert() if display_ready() else surface
+
+    def _chunk_origin(self, key):
+        return key[1] * self.chunk_px, key[0] * self.chunk_px
+
+    def _bake_chunk(self, key):
+        chunk_row, chunk_col = key
+        row0, col0 = chunk_row * self.chunk_size, chunk_col * self.chunk_size
+        row1, col1 = min(row0 + self.chunk_size, self.rows), min(col0 + self.chunk_size, self.cols)
+        surface = self._new_surface(((col1 - col0) * self.tile_size, (row1 - row0) * self.tile_size))
+        surface.fill((0, 0, 0))
+        origin = self._chunk_origin(key)
+        for row in range(row0, row1):
+            for col in range(col0, col1):
+                self.draw_cell(surface, row, col, origin)
+        self.baked += 1
+        return surface
+
+    def chunk(self, key):
+        """Baked surface of chunk (chunk_row, chunk_col), most recently used last."""
+        surface = self.chunks.get(key)
+        if surface is None:
+            surface = self.chunks[key] = self._bake_chunk(key)
+            while len(self.chunks) > self.capacity:
+                old_key, _ = self.chunks.popitem(last=False)
+                self.dirty.pop(old_key, None)
+                self.evicted += 1
+        else:
+            self.chunks.move_to_end(key)
+        return surface
+
+    def chunks_in(self, rect):
+        """Keys of the chunks a world rect overlaps."""
+        size = self.chunk_px
+        last_row = (self.rows - 1) // self.chunk_size
+        last_col = (self.cols - 1) // self.chunk_size
+        for chunk_row in range(max(rect.top // size, 0), min((rect.bottom - 1) // size, last_row) + 1):
+            for chunk_col in range(max(rect.left // size, 0), min((rect.right - 1) // size, last_col) + 1):
+                yield chunk_row, chunk_col
+
+    def mark_dirty(self, row, col):
+        # Chunks not in the cache pick the change up when they are baked
+        key = (row // self.chunk_size, col // self.chunk_size)
+        if key in self.chunks:
+            self.dirty.setdefault(key, set()).add((row, col))
+
+    def compose(self, view_rect):
+        """Blit the chunks under view_rect into the background surface."""
+        self.surface.fill((0, 0, 0))
+        for key in self.chunks_in(view_rect):
+            x, y = self._chunk_origin(key)
+            self.surface.blit(self.chunk(key), (x - view_rect.x, y - view_rect.y))
+        self.view = view_rect.copy()
+
+    bake = compose
+
+    def flush(self, view_rect):
+        """Repaint only the cells that changed since the last flush.
+
+        Returns the changed rects in screen coordinates: the whole view when
+        the camera moved, otherwise the repainted cells inside it.
+        """
+        changed = []
+        t = self.tile_size
+        for key, cells in self.dirty.items():
+            surface = self.chunks[key]
+            origin_x, origin_y = self._chunk_origin(key)
+            prev_clip = surface.get_clip()
+            for row, col in cells:
+                local = pygame.Rect(col * t - origin_x, row * t - origin_y, t, t)
+                surface.set_clip(local)
+                surface.fill((0, 0, 0), local)
+                self.draw_cell(surface, row, col, (origin_x, origin_y))
+                changed.append((surface, local, local.move(origin_x, origin_y)))
+            surface.set_clip(prev_clip)
+        self.dirty.clear()
+
+        if view_rect != self.view:
+            self.compose(view_rect)
+            return [pygame.Rect((0, 0), view_rect.size)]
+        rects = []
+        for surface, local, world in changed:
+            if world.colliderect(view_rect):
+                screen = world.move(-view_rect.x, -view_rect.y)
+                self.surface.blit(surface, screen, local)
+                rects.append(screen)
+        return rects
+
+    def draw(self, surface):
+        surface.blit(self.surface, (0, 0))
+
+    def stats(self):
+        return {'loaded': len(self.chunks), 'baked': self.baked, 'evicted': self.evicted}
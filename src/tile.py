@@ -1,51 +1,14 @@
-import random
-from glob import glob
 import pygame
 from src.game_state import current_game_state
-from src.config import get as get_config
+from src.assets import asset_cache
+from src.render import LAYER_RESOURCES
 
-class GreenGrass(pygame.sprite.Sprite):
-    def __init__(self, pos, groups, id):
-        super().__init__(groups)
-        self.images = glob('graphics/grass/*.png')
-        self.image = pygame.image.load(random.choice(self.images)).convert_alpha()
-        self.image = pygame.transform.scale(self.image, (current_game_state.TILE_SIZE, current_game_state.TILE_SIZE))
-        self.rect = self.image.get_rect(topleft=pos)
-        self.id = id
-
-class Sand(pygame.sprite.Sprite):
-    def __init__(self, pos, groups, id):
-        super().__init__(groups)
-        self.images = glob('graphics/sand/*.png')
-        self.image = pygame.image.load(random.choice(self.images)).convert_alpha()
-        self.rect = self.image.get_rect(topleft=pos)
-        self.id = id
+class Home(pygame.sprite.Sprite):
 
-class Water(pygame.sprite.Sprite):
-    def __init__(self, pos, groups, id):
-        super().__init__(groups)
-        self.images = glob('graphics/water/*.png')
-        self.image = pygame.image.load(random.choice(self.images)).convert_alpha()
-        self.image = pygame.transform.scale(self.image, (current_game_state.TILE_SIZE, current_game_state.TILE_SIZE))
-        self.rect = self.image.get_rect(topleft=pos)
-        self.id = id
+    _layer = LAYER_RESOURCES
 
-class Grid(pygame.sprite.Sprite):
     def __init__(self, pos, groups, id):
-        
         super().__init__(groups)
-        self.image = pygame.image.load('graphics/grid/grid.png').convert_alpha()
-        self.image = pygame.transform.scale(self.image, (current_game_state.TILE_SIZE, current_game_state.TILE_SIZE))
-        fog_enabled = get_config('FOG_OF_WAR', True)
-        alpha_val = 200 if fog_enabled else 20
-        self.image.set_alpha(alpha_val)
+        self.image = asset_cache.image('graphics/grid/home.png', current_game_state.TILE_SIZE)
         self.rect = self.image.get_rect(center=pos)
         self.id = id
-
-class Home(pygame.sprite.Sprite):
-    def __init__(self, pos, groups, id):
-        super().__init__(groups)
-        self.image = pygame.image.load('graphics/grid/home.png').convert_alpha()
-        self.image = pygame.transform.scale(self.image, (current_game_state.TILE_SIZE, current_game_state.TILE_SIZE))
-        self.rect = self.image.get_rect(center=pos)
-        self.id = id
\ No newline at end of file
@@ -0,0 +1,598 @@
+import numpy as np
+import pygame
+
+from src.animation import FACINGS, animation_clock
+
+# Facing codes, in the row order of the unit sprite sheets
+UP, LEFT, DOWN, RIGHT = range(len(FACINGS))
+FACING_CODES = {name: code for code, name in enumerate(FACINGS)}
+
+# Random walk of AI units: up, down, left, right or idle (-1), mostly moving
+AI_FACINGS = np.array([UP, DOWN, LEFT, RIGHT, -1])
+AI_DIRECTIONS = np.array([[0.0, 0.0, -1.0, 1.0, 0.0], [-1.0, 1.0, 0.0, 0.0, 0.0]])
+AI_WEIGHTS = np.array([4, 4, 4, 4, 1]) / 17
+# Range of milliseconds an AI unit keeps one direction, inclusive
+AI_DURATION = (300, 1500)
+# AI timer of units that do not pick their own directions
+NEVER = np.iinfo(np.int64).max
+# Up to this many units, collide_units() tests every pair directly
+ALL_PAIRS_LIMIT = 64
+# Above it, bucket keys are looked up in a dense table while there are at
+# most this many keys per unit
+DENSE_KEYS_PER_UNIT = 32
+_UPPER = np.triu(np.ones((ALL_PAIRS_LIMIT, ALL_PAIRS_LIMIT), dtype=bool), 1)
+# Side in pixels of the blocks query_rect() buckets units in; a block key
+# is its row shifted left by BLOCK_KEY_BITS, or'ed with its column
+QUERY_BLOCK = 256
+BLOCK_KEY_BITS = 24
+
+# Columns of the store: name, dtype and rows. Two-row columns hold x in
+# row 0 and y in row 1, so both axes are updated by one array operation.
+COLUMNS = (
+    ('pos', np.int64, 2), ('prev', np.int64, 2), ('size', np.int64, 2),
+    ('dir', np.float64, 2), ('speed', np.float64, 1),
+    ('health', np.float64, 1),
+    ('facing', np.int8, 1), ('last_facing', np.int8, 1),
+    ('anim_start', np.int64, 1), ('walking', np.bool_, 1),
+    ('moving', np.bool_, 1), ('working', np.bool_, 1),
+    ('ai', np.bool_, 1), ('ai_next_change', np.int64, 1),
+    ('reverses', np.bool_, 1), ('reverse', np.bool_, 1),
+    ('vision', np.int64, 1), ('fog_cell', np.int64, 2),
+    ('alive', np.bool_, 1),
+)
+
+
+def _column_array(dtype, rows, capacity):
+    return np.zeros((rows, capacity) if rows > 1 else capacity, dtype=dtype)
+
+
+class UnitStore:
+    """Simulation state of every unit as a structure of NumPy arrays.
+
+    Each unit owns one slot across all COLUMNS: position and size of its
+    rect, direction, speed, health, facing and animation start, AI timer and
+    collision flags. step() advances all units per tick in a fixed number of
+    array operations (AI direction picks, movement, bounds clamping, walk
+    animation restarts); collide_units() and collide_terrain() flag
+    collisions for reversal. A tick costs a fixed few dozen array
+    operations plus well under a microsecond per unit.
+
+    Slots of removed units are reused; owners holds the sprite of each slot
+    (or None for units without one). anim_start is the tick of clock at
+    which each unit's current animation started.
+
+    The fixed part is kept small: scalar guards skip the reversal pass
+    when nothing was flagged and the AI pass until the earliest AI timer
+    runs out, and revision, bumped whenever a position may have changed,
+    lets collide_terrain() and moved_cells() return at once when no unit
+    moved since their last call, and query_rect() reuse its block index.
+    Code writing positions directly must call moved() (UnitSprite.rect
+    does).
+    """
+
+    def __init__(self, capacity=64, seed=None, clock=animation_clock):
+        self.clock = clock
+        self.capacity = max(capacity, 1)
+        for name, dtype, rows in COLUMNS:
+            setattr(self, name, _column_array(dtype, rows, self.capacity))
+        self.owners = [None] * self.capacity
+        # Slots in use are all below used; count of them are alive
+        self.used = 0
+        self.count = 0
+        self.free = []
+        self._indices = None
+        # Highest top-left corner of each slot inside the last world size,
+        # and the last (col, row) of the last grid collided with
+        self._limits = None
+        self._last_cell = None
+        self.rng = np.random.default_rng(seed)
+        # Some unit is flagged to reverse; earliest AI timer; units that reverse
+        self.reversing = False
+        self._ai_due = NEVER
+        self.reversing_units = 0
+        # Bumped whenever positions may have changed
+        self.revision = 0
+        self._clamp_revision = -1
+        self._terrain_revision = -1
+        self._cells_revision = -1
+        # Block index of query_rect(), rebuilt when revision moves on
+        self._blocks = None
+        self._blocks_revision = -1
+        self._block_keys = None
+
+    def __len__(self):
+        return self.count
+
+    def _grow(self):
+        capacity = self.capacity * 2
+        for name, dtype, rows in COLUMNS:
+            column = _column_array(dtype, rows, capacity)
+            column[..., :self.capacity] = getattr(self, name)
+            setattr(self, name, column)
+        self.owners.extend([None] * (capacity - self.capacity))
+        self.capacity = capacity
+
+    def add(self, rect, speed, health=100, vision=0, ai=False, reverses=False, owner=None):
+        """Add a unit with rect (x, y, w, h); returns its slot."""
+        if self.free:
+            index = self.free.pop()
+        else:
+            if self.used == self.capacity:
+                self._grow()
+            index = self.used
+            self.used += 1
+        for name, _, _ in COLUMNS:
+            getattr(self, name)[..., index] = 0
+        x, y, w, h = rect
+        self.pos[:, index] = self.prev[:, index] = x, y
+        self.size[:, index] = w, h
+        self.speed[index] = speed
+        self.health[index] = health
+        self.vision[index] = vision
+        self.ai[index] = ai
+        self.ai_next_change[index] = 0 if ai else NEVER
+        self._ai_due = min(self._ai_due, self.ai_next_change[index])
+        self.reverses[index] = reverses
+        self.reversing_units += reverses
+        self.anim_start[index] = self.clock.ticks
+        self.facing[index] = self.last_facing[index] = DOWN
+        self.fog_cell[:, index] = -1
+        self.alive[index] = True
+        self.owners[index] = owner
+        self.count += 1
+        self._indices = None
+        self._blocks = None
+        self._limits = None
+        self.revision += 1
+        return index
+
+    def remove(self, index):
+        if not self.alive[index]:
+            return
+        # A free slot never moves or acts until it is reused
+        self.alive[index] = False
+        self.dir[:, index] = 0
+        self.ai[index] = False
+        self.ai_next_change[index] = NEVER
+        self.working[index] = False
+        self.reversing_units -= bool(self.reverses[index])
+        self.reverses[index] = False
+        self.owners[index] = None
+        self.free.append(index)
+        self.count -= 1
+        self._indices = None
+        self._blocks = None
+
+    def clear(self):
+        for index in self.indices().tolist():
+            self.remove(index)
+
+    def indices(self):
+        """Slots of the live units, cached until a unit is added or removed."""
+        if self._indices is None:
+            self._indices = np.flatnonzero(self.alive[:self.used])
+        return self._indices
+
+    def _live(self):
+        # Slots of the live units and a selector for their columns: a plain
+        # slice, which copies nothing, while no slot below used is free
+        index = self.indices()
+        return index, slice(None, self.used) if len(index) == self.used else index
+
+    def _limit(self, width, height):
+        if self._limits is None or self._limits[0] != (width, height, self.used):
+            self._limits = (width, height, self.used), np.maximum(np.array([[width], [height]]) - self.size[:, :self.used], 0)
+        return self._limits[1]
+
+    def moved(self):
+        """Note that positions were written outside step()."""
+        self.revision += 1
+
+    def set_ai(self, index, ai):
+        self.ai[index] = ai
+        self.ai_next_change[index] = 0 if ai else NEVER
+        if ai:
+            self._ai_due = 0
+
+    def flag_reverse(self, index, reverse=True):
+        self.reverse[index] = reverse
+        self.reversing |= bool(reverse)
+
+    def rect(self, index):
+        x, y = self.pos[:, index].tolist()
+        w, h = self.size[:, index].tolist()
+        return pygame.Rect(x, y, w, h)
+
+    def step(self, now, width, height):
+        """Advance every unit by one tick at clock time now (ms), keeping
+        them inside a width x height world."""
+        n = self.used
+        if not n:
+            return
+        pos, direction, facing = self.pos[:, :n], self.dir[:, :n], self.facing[:n]
+
+        # Units that hit something last tick turn around along one axis
+        if self.reversing:
+            reverse = self.reverse[:n] & self.reverses[:n]
+            flip_x = reverse & (np.abs(direction[0]) == 1)
+            flip_y = reverse & ~flip_x & (np.abs(direction[1]) == 1)
+            direction[0, flip_x] *= -1
+            direction[1, flip_y] *= -1
+            facing[flip_x] = np.where(direction[0, flip_x] > 0, RIGHT, LEFT)
+            facing[flip_y] = np.where(direction[1, flip_y] > 0, DOWN, UP)
+            self.reverse[:n] = False
+            self.reversing = False
+
+        # Kept so collisions can send units back to where they were
+        self.prev[:, :n] = pos
+
+        # AI units pick a new random direction when their current one runs
+        # out; units without AI never run out
+        if now > self._ai_due:
+            pick = (self.ai_next_change[:n] < now).nonzero()[0]
+            choice = self.rng.choice(len(AI_FACINGS), size=len(pick), p=AI_WEIGHTS)
+            direction[:, pick] = AI_DIRECTIONS[:, choice]
+            facing[pick] = np.where(AI_FACINGS[choice] >= 0, AI_FACINGS[choice], facing[pick])
+            self.ai_next_change[pick] = now + self.rng.integers(AI_DURATION[0], AI_DURATION[1] + 1, size=len(pick))
+            self._ai_due = np.minimum.reduce(self.ai_next_change[:n])
+
+        # Move along the normalized direction, rounding half away from zero
+        # like pygame does for float rect coordinates
+        norm = np.hypot(direction[0], direction[1])
+        moving = np.greater(norm, 0, out=self.moving[:n])
+        if np.count_nonzero(moving):
+            np.divide(direction, norm, out=direction, where=moving)
+            offset = direction * self.speed[:n]
+            offset += np.copysign(0.5, offset)
+            pos += offset.astype(np.int64)
+            self.revision += 1
+
+        # Clamp to the world; units that can turn around do so next tick
+        if self.revision != self._clamp_revision:
+            self._clamp_revision = self.revision
+            clamped = np.minimum(pos, self._limit(width, height))
+            np.maximum(clamped, 0, out=clamped)
+            outside = clamped != pos
+            if np.count_nonzero(outside):
+                pos[:] = clamped
+                outside = outside.any(axis=0)
+                outside &= self.reverses[:n]
+                self.reverse[:n] |= outside
+                self.reversing = True
+
+        # Working units (chopping, gathering) stand still facing their work;
+        # units that start walking restart their walk animation
+        working = self.working[:n]
+        walking = moving
+        if np.count_nonzero(working):
+            direction[:, working] = 0
+            np.copyto(facing, self.last_facing[:n], where=working)
+            walking = moving > working
+        np.copyto(self.last_facing[:n], facing, where=walking)
+        np.copyto(self.anim_start[:n], self.clock.ticks, where=walking > self.walking[:n])
+        self.walking[:n] = walking
+
+    def collide_units(self, cell_size):
+        """Flag every pair of overlapping units to reverse.
+
+        Up to ALL_PAIRS_LIMIT units every pair is tested in one (n, n)
+        comparison. Beyond that, units are bucketed in cells at least as
+        large as any of them, so an overlapping pair sits in the same or
+        neighbouring cells; each bucket is matched against itself and four
+        neighbours through a sorted key array. Returns the (a, b) slot
+        arrays of the colliding pairs.
+        """
+        index, live = self._live()
+        if len(index) < 2:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        (x, y), (w, h) = self.pos[:, live], self.size[:, live]
+        if len(index) <= ALL_PAIRS_LIMIT:
+            right, bottom = x + w, y + h
+            overlap = x[:, None] < right
+            overlap &= x < right[:, None]
+            overlap &= y[:, None] < bottom
+            overlap &= y < bottom[:, None]
+            overlap &= _UPPER[:len(index), :len(index)]
+            a, b = overlap.nonzero()
+            if len(a):
+                a, b = index[a], index[b]
+                self.reverse[a] = True
+                self.reverse[b] = True
+                self.reversing = True
+            return a, b
+        size = max(int(cell_size), int(w.max()), int(h.max()), 1)
+        col, row = x // size, y // size
+        span = int(col.max() - col.min()) + 3
+        # One column of margin on each side so neighbour keys never wrap rows
+        key = (row - row.min()) * span + (col - col.min() + 1)
+        # Work in sorted order: the neighbour keys of sorted keys are sorted
+        # too, which keeps the searches cheap
+        order = np.argsort(key)
+        sorted_key = key[order]
+        units = np.arange(len(index))
+        # Where units are dense, look buckets up in a table of every key
+        # (up to the last neighbour key) instead of searching for them
+        keys = int(sorted_key[-1]) + span + 2
+        table = keys <= DENSE_KEYS_PER_UNIT * len(index)
+        if table:
+            bucket_size = np.bincount(sorted_key, minlength=keys)
+            bucket_start = np.cumsum(bucket_size) - bucket_size
+        firsts, seconds = [], []
+        for d_row, d_col in ((0, 0), (0, 1), (1, -1), (1, 0), (1, 1)):
+            target = sorted_key + (d_row * span + d_col)
+            if table:
+                lo, counts = bucket_start[target], bucket_size[target]
+            else:
+                lo = np.searchsorted(sorted_key, target, 'left')
+                counts = np.searchsorted(sorted_key, target, 'right') - lo
+            total = int(counts.sum())
+            if not total:
+                continue
+            a = np.repeat(units, counts)
+            b = np.repeat(lo - (np.cumsum(counts) - counts), counts) + np.arange(total)
+            if (d_row, d_col) == (0, 0):
+                keep = a < b
+                a, b = a[keep], b[keep]
+            a, b = order[a], order[b]
+            keep = (x[a] < x[b] + w[b]) & (x[b] < x[a] + w[a]) & (y[a] < y[b] + h[b]) & (y[b] < y[a] + h[a])
+            firsts.append(a[keep])
+            seconds.append(b[keep])
+        if not firsts:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        a, b = index[np.concatenate(firsts)], index[np.concatenate(seconds)]
+        self.reverse[a] = True
+        self.reverse[b] = True
+        self.reversing = True
+        return a, b
+
+    def collide_terrain(self, kinds, tile_size):
+        """Send units overlapping a blocked cell (kinds != 0) back to their
+        position before this tick's step and flag them to reverse.
+
+        Units are at most one tile across, so only the cells under their four
+        corners are looked up. Returns (slots, rows, cols): the units hit and,
+        for each, the first blocked cell in row-major order, as
+        OccupancyGrid.collide() finds it. Nothing is looked up when no unit
+        moved since the last call.
+        """
+        if self.revision == self._terrain_revision:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty, empty
+        self._terrain_revision = self.revision
+        index, live = self._live()
+        grid_rows, grid_cols = kinds.shape
+        # Cells of the top-left and bottom-right corners: (corner, axis, unit)
+        pos = self.pos[:, live]
+        cells = np.empty((2,) + pos.shape, dtype=np.int64)
+        cells[0] = pos
+        np.add(pos, self.size[:, live], out=cells[1])
+        cells[1] -= 1
+        cells //= tile_size
+        if self._last_cell is None or self._last_cell[0] != kinds.shape:
+            self._last_cell = kinds.shape, np.array([[grid_cols - 1], [grid_rows - 1]])
+        np.minimum(cells, self._last_cell[1], out=cells)
+        # Flat cell of each corner pair (top/bottom row, left/right column)
+        flat = cells[:, None, 1] * grid_cols + cells[None, :, 0]
+        blocked = kinds.ravel().take(flat).reshape(4, len(index))
+        if not np.count_nonzero(blocked):
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty, empty
+        hit = blocked.any(axis=0)
+        slots = index[hit]
+        self.pos[:, slots] = self.prev[:, slots]
+        self.reverse[slots] = True
+        self.reversing = True
+        self.revision += 1
+        corner = blocked[:, hit].argmax(axis=0)
+        rows, cols = np.divmod(flat.reshape(4, len(index))[:, hit][corner, np.arange(len(slots))], grid_cols)
+        return slots, rows, cols
+
+    def moved_cells(self, tile_size):
+        """Units whose center entered another cell since the last call, as
+        (slots, rows, cols) of their new cells."""
+        if self.revision == self._cells_revision:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty, empty
+        self._cells_revision = self.revision
+        index, live = self._live()
+        cell = self.size[:, live] // 2
+        cell += self.pos[:, live]
+        cell //= tile_size
+        changed = (cell != self.fog_cell[:, live]).any(axis=0)
+        index, cell = index[changed], cell[:, changed]
+        self.fog_cell[:, index] = cell
+        return index, cell[1], cell[0]
+
+    def dead(self):
+        """Slots of live units whose health ran out."""
+        index = self.indices()
+        return index[self.health[index] <= 0]
+
+    def _block_index(self):
+        # Live slots sorted by the QUERY_BLOCK block of their top-left
+        # corner, with the sorted block keys. Built by one sort after units
+        # are added or removed; after moves only the units that entered
+        # another block are taken out and inserted again
+        if self._blocks is not None and self._blocks_revision == self.revision:
+            return self._blocks
+        used = self.used
+        block = self.pos[:, :used] // QUERY_BLOCK
+        np.maximum(block, 0, out=block)
+        key = (block[1] << BLOCK_KEY_BITS) | block[0]
+        if self._blocks is None:
+            index = self.indices()
+            order = np.argsort(key[index], kind='stable')
+            slots, keys = index[order], key[index][order]
+        else:
+            slots, keys = self._blocks
+            moved = np.flatnonzero((key != self._block_keys[:used]) & self.alive[:used])
+            if len(moved):
+                leaving = np.zeros(used, dtype=bool)
+                leaving[moved] = True
+                staying = ~leaving[slots]
+                slots, keys = slots[staying], keys[staying]
+                moved = moved[np.argsort(key[moved], kind='stable')]
+                at = np.searchsorted(keys, key[moved], 'right')
+                slots, keys = np.insert(slots, at, moved), np.insert(keys, at, key[moved])
+        self._block_keys = key
+        self._blocks = slots, keys
+        self._blocks_revision = self.revision
+        return self._blocks
+
+    def query_rect(self, rect):
+        """Owners of the units overlapping rect, in slot order.
+
+        Units are bucketed in QUERY_BLOCK blocks by their top-left corner
+        (units left or above the world in the first row or column), so only
+        the blocks under rect, widened up and left by the largest unit, are
+        read: each block row is one slice of the sorted slots.
+        """
+        if not self.count:
+            return []
+        slots, keys = self._block_index()
+        reach_w, reach_h = self.size[:, :self.used].max(axis=1).tolist()
+        left = max((rect.left - reach_w) // QUERY_BLOCK, 0)
+        right = max((rect.right - 1) // QUERY_BLOCK, 0)
+        top = max((rect.top - reach_h) // QUERY_BLOCK, 0)
+        bottom = max((rect.bottom - 1) // QUERY_BLOCK, 0)
+        rows = np.arange(top, bottom + 1) << BLOCK_KEY_BITS
+        starts = np.searchsorted(keys, rows | left, 'left')
+        ends = np.searchsorted(keys, rows | right, 'right')
+        found = np.concatenate([slots[start:end] for start, end in zip(starts.tolist(), ends.tolist())])
+        (x, y), (w, h) = self.pos[:, found], self.size[:, found]
+        inside = (x < rect.right) & (x + w > rect.left) & (y < rect.bottom) & (y + h > rect.top)
+        owners = self.owners
+        return [owners[i] for i in np.sort(found[inside]).tolist() if owners[i] is not None]
+
+
+class UnitDirection:
+    """Vector2-like view of one unit's direction in its store."""
+
+    __slots__ = ('store', 'index')
+
+    def __init__(self, store, index):
+        self.store = store
+        self.index = index
+
+    @property
+    def x(self):
+        return float(self.store.dir[0, self.index])
+
+    @x.setter
+    def x(self, value):
+        self.store.dir[0, self.index] = value
+
+    @property
+    def y(self):
+        return float(self.store.dir[1, self.index])
+
+    @y.setter
+    def y(self, value):
+        self.store.dir[1, self.index] = value
+
+    def magnitude(self):
+        return float(np.hypot(self.x, self.y))
+
+
+def _column(name, cast):
+    # Attribute backed by one slot of a UnitStore column
+    def get(self):
+        return cast(getattr(self.store, name)[self.index])
+
+    def set(self, value):
+        getattr(self.store, name)[self.index] = value
+
+    return property(get, set)
+
+
+def _facing(name):
+    def get(self):
+        return FACINGS[getattr(self.store, name)[self.index]]
+
+    def set(self, value):
+        getattr(self.store, name)[self.index] = FACING_CODES[value]
+
+    return property(get, set)
+
+
+class UnitSprite(pygame.sprite.Sprite):
+    """Sprite of a unit whose state lives in a UnitStore.
+
+    rect, direction, speed, health and the other simulation attributes are
+    views of the unit's slot, so game code reads and writes them as before
+    while the store moves everything at once. rect returns a new Rect on
+    every read: assign it back to move the unit. The sprite itself only
+    picks its image for drawing, in sync_image().
+    """
+
+    speed = _column('speed', float)
+    health = _column('health', float)
+    anim_start = _column('anim_start', int)
+    ai_mode = property(lambda self: bool(self.store.ai[self.index]),
+                       lambda self, ai: self.store.set_ai(self.index, ai))
+    reverse_next_move = property(lambda self: bool(self.store.reverse[self.index]),
+                                 lambda self, reverse: self.store.flag_reverse(self.index, reverse))
+    # Busy with an action in place (chopping, gathering)
+    working = _column('working', bool)
+    current_direction = _facing('facing')
+    last_move_direction = _facing('last_facing')
+
+    def __init__(self, groups, store, rect, speed, **unit):
+        self.store = store if store is not None else UnitStore(1)
+        self.index = self.store.add(rect, speed, owner=self, **unit)
+        super().__init__(groups)
+
+    @property
+    def rect(self):
+        return self.store.rect(self.index)
+
+    @rect.setter
+    def rect(self, rect):
+        self.store.pos[:, self.index] = rect[0], rect[1]
+        self.store.moved()
+
+    @property
+    def prev_rect(self):
+        return pygame.Rect(*self.store.prev[:, self.index].tolist(), *self.store.size[:, self.index].tolist())
+
+    @prev_rect.setter
+    def prev_rect(self, rect):
+        self.store.prev[:, self.index] = rect[0], rect[1]
+
+    @property
+    def direction(self):
+        return UnitDirection(self.store, self.index)
+
+    @direction.setter
+    def direction(self, vector):
+        self.store.dir[:, self.index] = vector
+
+    @property
+    def is_moving(self):
+        return bool(self.store.moving[self.index])
+
+    def kill(self):
+        super().kill()
+        if self.store.owners[self.index] is self:
+            self.store.remove(self.index)
+
+    def restart_animation(self):
+        self.anim_start = self.store.clock.ticks
+
+    def action_frames(self):
+        """Frames of the action a working unit is busy with."""
+        return ()
+
+    def sync_image(self):
+        """Pick the image for the unit's state at the current animation
+        tick: its action while working, otherwise walking, or the first walk
+        frame when standing still."""
+        store, index = self.store, self.index
+        if store.working[index]:
+            frames = self.action_frames()
+        else:
+            frames = self.frames[FACINGS[store.facing[index]]]
+            if not store.walking[index]:
+                frames = frames[:1]
+        if frames:
+            self.image = frames[store.clock.frame(store.anim_start[index], len(frames))]
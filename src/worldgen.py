@@ -0,0 +1,256 @@
+import argparse
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from src.noise import NoiseField, white_noise
+from src.map_format import TILE_CODES, BinaryMap, write_map, COMPRESSION
+
+# Noise fields per world, in the order they are stored
+FIELDS = ('elevation', 'forest', 'thicket')
+# Threshold estimates look at no more than about this many cells
+THRESHOLD_SAMPLE = 1 << 20
+# Side of the square chunks dispatched to worker processes
+CHUNK = 512
+
+
+class WorldParams:
+    """Seed, densities and noise shape of a world; small enough to send to
+    worker processes with every chunk.
+
+    Densities are fractions of the whole map. Water fills the lowest
+    elevation, sand the band just above it; trees cluster where the forest
+    field is highest and berry bushes where the (jittered) thicket field is,
+    both on remaining grass.
+    """
+
+    def __init__(self, seed=0, water=0.08, sand=0.05, trees=0.12, berry_bushes=0.02, period=48, octaves=4):
+        self.seed = seed
+        self.water = water
+        self.sand = sand
+        self.trees = trees
+        self.berry_bushes = berry_bushes
+        self.period = period
+        self.octaves = octaves
+
+    def noise_fields(self):
+        # Each field is its own noise stream of the seed
+        return (
+            NoiseField(self.seed * 3, self.period, self.octaves),
+            NoiseField(self.seed * 3 + 1, self.period // 2 or 1, max(self.octaves - 1, 1)),
+            NoiseField(self.seed * 3 + 2, self.period // 4 or 1, max(self.octaves - 2, 1)),
+        )
+
+
+def fill_fields(params, fields, row0, col0, rows, cols):
+    """Write the noise of one window into fields, a (3, R, C) float32 array.
+
+    Windows of the same world agree on every cell, so chunks can be filled
+    in any order or process.
+    """
+    window = (slice(row0, row0 + rows), slice(col0, col0 + cols))
+    for index, noise in enumerate(params.noise_fields()):
+        noise.window(row0, col0, rows, cols, out=fields[index][window])
+    # Scatter inside the thicket patches so bushes do not form solid blocks
+    fields[2][window] += np.float32(0.25) * white_noise(params.seed * 3 + 2, row0, col0, rows, cols)
+
+
+def _upper_quantile(values, fraction):
+    # Value above which `fraction` of values lie; +inf selects nothing
+    if fraction <= 0 or values.size == 0:
+        return np.inf
+    return float(np.quantile(values, 1.0 - fraction))
+
+
+def _only(values, mask):
+    # values with the cells outside mask moved below every other value, so
+    # they count towards the total but are never selected; a finite floor
+    # rather than -inf, which np.quantile would interpolate into inf - inf
+    # when the cut falls among them (tiny maps)
+    if values.size == 0:
+        return values
+    return np.where(mask, values, values.min() - 1.0)
+
+
+def thresholds(params, fields):
+    """Cut-off values turning the noise fields into the configured densities.
+
+    Computed on the whole map up to THRESHOLD_SAMPLE cells, on an evenly
+    strided sample beyond that, so densities are exact on small maps and
+    very close on huge ones.
+    """
+    step = max(1, math.ceil(math.sqrt(fields[0].size / THRESHOLD_SAMPLE)))
+    elevation, forest, thicket = (np.ascontiguousarray(field[::step, ::step]) for field in fields)
+    lowland = _upper_quantile(-elevation, params.water + params.sand)
+    water = _upper_quantile(-elevation, params.water)
+    grass = -elevation < lowland
+    tree = _upper_quantile(_only(forest, grass), params.trees)
+    grass &= forest < tree
+    bush = _upper_quantile(_only(thicket, grass), params.berry_bushes)
+    return lowland, water, tree, bush
+
+
+def classify(fields, cuts, tiles, row0, col0, rows, cols):
+    """Tile codes for one window from its noise and the thresholds."""
+    window = (slice(row0, row0 + rows), slice(col0, col0 + cols))
+    elevation, forest, thicket = (field[window] for field in fields)
+    lowland, water, tree, bush = cuts
+    out = tiles[window]
+    out[:] = TILE_CODES['grass']
+    depth = -elevation
+    out[depth >= lowland] = TILE_CODES['sand']
+    out[depth >= water] = TILE_CODES['water']
+    grass = out == TILE_CODES['grass']
+    tree_mask = grass & (forest >= tree)
+    out[tree_mask] = TILE_CODES['tree']
+    out[grass & ~tree_mask & (thicket >= bush)] = TILE_CODES['berry_bush']
+
+
+def place_home(tiles):
+    """Put home on the grass cell nearest the center whose 3x3 neighbourhood
+    is all grass, so units can spawn and drop resources around it. Searches
+    a window around the center, doubling it until something is found."""
+    rows, cols = tiles.shape
+    radius = 32
+    while True:
+        row0, row1 = max(rows // 2 - radius, 0), min(rows // 2 + radius, rows)
+        col0, col1 = max(cols // 2 - radius, 0), min(cols // 2 + radius, cols)
+        found = _clear_cell(tiles, row0, row1, col0, col1)
+        if found is not None or (row0 == 0 and col0 == 0 and row1 == rows and col1 == cols):
+            break
+        radius *= 2
+    if found is None:
+        # No 3x3 clearing anywhere: settle for any grass cell
+        grass = np.flatnonzero(tiles == TILE_CODES['grass'])
+        if len(grass) == 0:
+            return None
+        found = divmod(int(grass[0]), cols)
+    tiles[found] = TILE_CODES['home']
+    return found
+
+
+def _clear_cell(tiles, row0, row1, col0, col1):
+    rows, cols = tiles.shape
+    grass = tiles[row0:row1, col0:col1] == TILE_CODES['grass']
+    height, width = grass.shape
+    if height < 3 or width < 3:
+        return None
+    clear = np.ones((height - 2, width - 2), dtype=bool)
+    for d_row in range(3):
+        for d_col in range(3):
+            clear &= grass[d_row:height - 2 + d_row, d_col:width - 2 + d_col]
+    cand_rows, cand_cols = np.nonzero(clear)
+    if len(cand_rows) == 0:
+        return None
+    cand_rows = cand_rows + row0 + 1
+    cand_cols = cand_cols + col0 + 1
+    nearest = np.argmin(np.abs(cand_rows - rows // 2) + np.abs(cand_cols - cols // 2))
+    return int(cand_rows[nearest]), int(cand_cols[nearest])
+
+
+def generate_world(rows, cols, seed=0, workers=1, **params):
+    """Generate a (rows, cols) uint8 tile-code array from a seed.
+
+    With workers > 1 the map is split into CHUNK x CHUNK chunks generated by
+    a process pool (see generate_world_parallel); the result is identical.
+    Every step is an array operation, and the same seed always gives the
+    same map.
+    """
+    params = WorldParams(seed, **params)
+    if workers > 1:
+        return generate_world_parallel(rows, cols, params, workers)
+    fields = np.empty((len(FIELDS), rows, cols), dtype=np.float32)
+    fill_fields(params, fields, 0, 0, rows, cols)
+    tiles = np.empty((rows, cols), dtype=np.uint8)
+    classify(fields, thresholds(params, fields), tiles, 0, 0, rows, cols)
+    place_home(tiles)
+    return tiles
+
+
+def chunks(rows, cols, size=CHUNK):
+    """(row0, col0, rows, cols) windows covering the map."""
+    return [(row0, col0, min(size, rows - row0), min(size, cols - col0))
+            for row0 in range(0, rows, size) for col0 in range(0, cols, size)]
+
+
+def _attach(name, shape, dtype):
+    memory = shared_memory.SharedMemory(name=name)
+    return memory, np.ndarray(shape, dtype=dtype, buffer=memory.buf)
+
+
+def _fill_chunk(fields_name, shape, params, window):
+    # Worker side: only names, shapes and the window travel through the pool
+    memory, fields = _attach(fields_name, (len(FIELDS),) + shape, np.float32)
+    try:
+        fill_fields(params, fields, *window)
+    finally:
+        del fields
+        memory.close()
+
+
+def _classify_chunk(fields_name, tiles_name, shape, cuts, window):
+    fields_memory, fields = _attach(fields_name, (len(FIELDS),) + shape, np.float32)
+    tiles_memory, tiles = _attach(tiles_name, shape, np.uint8)
+    try:
+        classify(fields, cuts, tiles, *window)
+    finally:
+        del fields, tiles
+        fields_memory.close()
+        tiles_memory.close()
+
+
+def generate_world_parallel(rows, cols, params, workers=None, chunk=CHUNK):
+    """generate_world() over a process pool.
+
+    The noise fields and the tile array live in shared memory; workers fill
+    them chunk by chunk in place, so no array is pickled. The parent only
+    estimates the thresholds between the two passes and places home.
+    """
+    workers = workers or os.cpu_count() or 1
+    shape = (rows, cols)
+    windows = chunks(rows, cols, chunk)
+    fields_memory = shared_memory.SharedMemory(create=True, size=max(len(FIELDS) * rows * cols * 4, 1))
+    tiles_memory = shared_memory.SharedMemory(create=True, size=max(rows * cols, 1))
+    try:
+        fields = np.ndarray((len(FIELDS),) + shape, dtype=np.float32, buffer=fields_memory.buf)
+        tiles = np.ndarray(shape, dtype=np.uint8, buffer=tiles_memory.buf)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for _ in pool.map(_fill_chunk, *zip(*[(fields_memory.name, shape, params, w) for w in windows])):
+                pass
+            cuts = thresholds(params, fields)
+            for _ in pool.map(_classify_chunk, *zip(*[(fields_memory.name, tiles_memory.name, shape, cuts, w) for w in windows])):
+                pass
+        result = tiles.copy()
+        del fields, tiles
+    finally:
+        fields_memory.close()
+        fields_memory.unlink()
+        tiles_memory.close()
+        tiles_memory.unlink()
+    place_home(result)
+    return result
+
+
+def generate_map(rows, cols, tile_size, seed=0, workers=1, **params):
+    """generate_world() wrapped like a loaded map, for load_map()."""
+    tiles = generate_world(rows, cols, seed, workers, **params)
+    return BinaryMap(cols * tile_size, rows * tile_size, tile_size, tiles)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Generate a world and save it as a binary map.")
+    parser.add_argument('out', help="output .emap path")
+    parser.add_argument('--rows', type=int, default=256)
+    parser.add_argument('--cols', type=int, default=256)
+    parser.add_argument('--tile-size', type=int, default=48)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=1, help="worker processes (0: one per core)")
+    parser.add_argument('--compression', choices=sorted(COMPRESSION), default='rle')
+    args = parser.parse_args()
+    world = generate_world(args.rows, args.cols, args.seed, args.workers or os.cpu_count())
+    write_map(args.out, world, args.tile_size, compression=args.compression)
+    counts = {name: int(np.count_nonzero(world == code)) for name, code in TILE_CODES.items()}
+    print(f"{args.out}: {args.rows}x{args.cols} seed {args.seed} {counts}")
@@ -0,0 +1,66 @@
+import pytest
+
+from src.animation import FACINGS, AnimationClock, AnimationLibrary
+from src.units import RIGHT, UnitSprite, UnitStore
+
+WALK = 'graphics/villager/walk.png'
+
+
+@pytest.fixture
+def library():
+    return AnimationLibrary()
+
+
+def test_clock_frame_follows_the_ticks_since_start():
+    clock = AnimationClock(speed=0.5)
+    clock.advance(7)
+    assert clock.frame(7, 4) == 0
+    assert clock.frame(3, 4) == 2
+    # Wraps around the animation, and empty animations show frame 0
+    assert clock.frame(0, 3) == 0
+    assert clock.frame(0, 0) == 0
+
+
+def test_sheets_are_sliced_once_and_shared(library):
+    frames = library.sheet(WALK, 4, 9, 48)
+    assert library.sheet(WALK, 4, 9, 48) is frames
+    assert library.sheet(WALK, 4, 9, 32) is not frames
+    assert library.stats() == {'hits': 1, 'misses': 2, 'sheets': 2}
+    assert list(frames) == list(FACINGS)
+    assert all(len(row) == 9 and row[0].get_size() == (48, 48) for row in frames.values())
+    with pytest.raises(TypeError):
+        frames['up'] = ()
+
+
+def test_missing_sheets(library, tmp_path):
+    missing = str(tmp_path / 'missing.png')
+    assert dict(library.sheet(missing, 4, 6, 48, optional=True)) == {facing: () for facing in FACINGS}
+    with pytest.raises(FileNotFoundError):
+        library.sheet(str(tmp_path / 'other.png'), 4, 6, 48)
+
+
+class Walker(UnitSprite):
+    def __init__(self, store, frames):
+        super().__init__((), store, (0, 0, 48, 48), 1)
+        self.frames = frames
+
+
+def test_units_show_the_shared_frame_of_their_own_start(library):
+    frames = library.sheet(WALK, 4, 9, 48)
+    clock = AnimationClock(speed=1)
+    store = UnitStore(clock=clock)
+    first, second = Walker(store, frames), Walker(store, frames)
+    clock.advance(2)
+    second.restart_animation()
+    for unit in (first, second):
+        store.facing[unit.index] = RIGHT
+        store.walking[unit.index] = True
+    clock.advance(3)
+    first.sync_image()
+    second.sync_image()
+    assert first.image is frames['right'][5]
+    assert second.image is frames['right'][3]
+    # Standing still shows the first frame
+    store.walking[first.index] = False
+    first.sync_image()
+    assert first.image is frames['right'][0]
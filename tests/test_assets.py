@@ -0,0 +1,44 @@
+import pytest
+
+from src.assets import AssetCache
+
+GRID = 'graphics/grid/grid.png'
+
+
+@pytest.fixture
+def cache():
+    return AssetCache()
+
+
+def test_one_surface_per_path_and_size(cache):
+    first = cache.image(GRID, 48)
+    assert cache.image(GRID, (48, 48)) is first
+    assert first.get_size() == (48, 48)
+    assert cache.image(GRID, 32) is not first
+    assert cache.stats() == {'hits': 1, 'misses': 2, 'surfaces': 2}
+
+
+def test_alpha_variants_leave_the_base_alone(cache):
+    base = cache.image(GRID, 48)
+    base_alpha = base.get_alpha()
+    faded = cache.image(GRID, 48, alpha=20)
+    assert faded is not base
+    assert faded.get_alpha() == 20
+    assert base.get_alpha() == base_alpha
+    assert cache.image(GRID, 48, alpha=20) is faded
+
+
+def test_variants_are_globbed_once(cache, tmp_path):
+    (tmp_path / 'b.png').write_bytes(b'')
+    (tmp_path / 'a.png').write_bytes(b'')
+    pattern = str(tmp_path / '*.png')
+    paths = cache.variants(pattern)
+    assert [path.rsplit('/', 1)[-1] for path in paths] == ['a.png', 'b.png']
+    (tmp_path / 'c.png').write_bytes(b'')
+    assert cache.variants(pattern) is paths
+
+
+def test_clear(cache):
+    cache.image(GRID, 48)
+    cache.clear()
+    assert cache.stats() == {'hits': 0, 'misses': 0, 'surfaces': 0}
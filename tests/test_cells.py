@@ -0,0 +1,44 @@
+import pytest
+
+from src.cells import LEGACY_ROWS, CellGrid, parse_label, parse_row_label, row_label
+
+
+def test_legacy_labels_are_unchanged():
+    assert row_label(0) == 'aa'
+    assert row_label(1) == 'ab'
+    assert row_label(26) == 'ba'
+    assert row_label(LEGACY_ROWS - 1) == 'zz'
+    assert row_label(LEGACY_ROWS) == 'aaa'
+
+
+def test_row_labels_round_trip():
+    labels = set()
+    for row in list(range(2000)) + list(range(LEGACY_ROWS + 26 ** 3 - 5, LEGACY_ROWS + 26 ** 3 + 5)):
+        label = row_label(row)
+        assert parse_row_label(label) == row
+        labels.add(label)
+    assert len(labels) == 2010
+
+
+@pytest.mark.parametrize('label', ['', 'a', 'a1', 'aa', 'AA1', 'a-1', 'aa1x'])
+def test_malformed_labels(label):
+    with pytest.raises(ValueError):
+        parse_label(label)
+
+
+def test_grid_ids_labels_and_pixels():
+    grid = CellGrid(30, 40, 48)
+    cell_id = grid.cell_id(27, 13)
+    assert grid.row_col(cell_id) == (27, 13)
+    assert grid.label(cell_id) == 'bb13'
+    assert grid.parse('bb13') == cell_id
+    assert grid.parse(cell_id) == cell_id
+    assert grid.center(cell_id) == (13 * 48 + 24, 27 * 48 + 24)
+    assert grid.cell_at(*grid.center(cell_id)) == cell_id
+    assert grid.cell_at(-1, 0) is None and grid.cell_at(40 * 48, 0) is None
+    assert len(grid) == 1200 and cell_id in grid and 1200 not in grid
+
+
+def test_labels_outside_the_grid():
+    with pytest.raises(ValueError):
+        CellGrid(10, 10, 48).parse('bb0')
@@ -0,0 +1,30 @@
+from src.clock import SimulationClock
+
+
+def test_time_only_moves_on_advance():
+    clock = SimulationClock(60)
+    assert clock.get_ticks() == 0
+    assert clock.get_ticks() == 0
+    clock.advance()
+    assert clock.get_ticks() == 16
+    assert clock.frame == 1
+
+
+def test_steps_do_not_drift():
+    # Step times are summed as floats and truncated, so the reading may be
+    # a millisecond short, but the error does not grow with time
+    clock = SimulationClock(60)
+    for minutes in range(1, 61):
+        for _ in range(60 * 60):
+            clock.advance()
+        assert 0 <= minutes * 60 * 1000 - clock.get_ticks() <= 1
+    other = SimulationClock(60)
+    other.advance(60 * 60 * 60)
+    assert other.frame == clock.frame
+    assert abs(other.get_ticks() - clock.get_ticks()) <= 1
+
+
+def test_fps_sets_the_step():
+    clock = SimulationClock(20)
+    clock.advance(3)
+    assert clock.get_ticks() == 150
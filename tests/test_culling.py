@@ -0,0 +1,91 @@
+import numpy as np
+import pygame
+import pytest
+
+from src.culling import ViewCuller
+from src.render import LAYER_UNITS, RenderPipeline
+from src.units import QUERY_BLOCK, UnitStore
+
+
+def random_rect(rng, extent=3000):
+    return (int(rng.integers(-500, extent)), int(rng.integers(-500, extent)),
+            int(rng.integers(1, 60)), int(rng.integers(1, 60)))
+
+
+def overlapping(store, rect):
+    # Owners of the units overlapping rect, by testing every unit
+    index = store.indices()
+    (x, y), (w, h) = store.pos[:, index], store.size[:, index]
+    inside = (x < rect.right) & (x + w > rect.left) & (y < rect.bottom) & (y + h > rect.top)
+    return [store.owners[i] for i in index[inside].tolist()]
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_query_rect_matches_brute_force(seed):
+    rng = np.random.default_rng(seed)
+    store = UnitStore(4)
+    for _ in range(200):
+        store.add(random_rect(rng), 1, owner=object())
+    for _ in range(40):
+        # Adds, removes and moves all change what the block index holds
+        if store.count and rng.random() < 0.3:
+            store.remove(int(rng.choice(store.indices())))
+        if rng.random() < 0.3:
+            store.add(random_rect(rng), 1, owner=object())
+        if store.count and rng.random() < 0.6:
+            store.pos[:, store.indices()] += rng.integers(-QUERY_BLOCK, QUERY_BLOCK, size=(2, store.count))
+            store.moved()
+        rect = pygame.Rect(int(rng.integers(-800, 3000)), int(rng.integers(-800, 3000)),
+                           int(rng.integers(0, 1500)), int(rng.integers(0, 1500)))
+        assert store.query_rect(rect) == overlapping(store, rect)
+
+
+class Index:
+    def __init__(self, items):
+        self.items = items
+
+    def query_rect(self, rect):
+        return [item for item in self.items if item.colliderect(rect)]
+
+
+def test_culler_counts_submitted_and_culled():
+    rects = [pygame.Rect(x, 0, 10, 10) for x in range(0, 1000, 100)]
+    culler = ViewCuller(margin=20)
+    culler.begin_frame()
+    # Only the rect at 200 is in view; the margin adds the ones at 100 and 300
+    view = pygame.Rect(115, 0, 170, 10)
+    assert culler.query('units', Index(rects), view, len(rects)) == rects[1:4]
+    assert culler.query('trees', Index(rects), pygame.Rect(2000, 0, 10, 10), len(rects)) == []
+    assert culler.stats() == {'submitted': 3, 'culled': 17,
+                              'units': {'submitted': 3, 'culled': 7},
+                              'trees': {'submitted': 0, 'culled': 10}}
+    culler.begin_frame()
+    assert culler.stats() == {'submitted': 0, 'culled': 0}
+
+
+class Unit(pygame.sprite.Sprite):
+    _layer = LAYER_UNITS
+
+    def __init__(self, x, y):
+        super().__init__()
+        self.image = pygame.Surface((10, 10))
+        self.image.fill((255, 255, 255))
+        self.rect = pygame.Rect(x, y, 10, 10)
+
+
+def test_render_draws_stand_ins_at_screen_positions():
+    screen = pygame.Surface((100, 100))
+    renderer = RenderPipeline(screen, pygame.Surface((100, 100)), pygame.Rect(0, 0, 100, 100))
+    units = [Unit(500, 500), Unit(560, 520)]
+    renderer.render(units, (), list, lambda: None, (480, 490))
+    assert screen.get_at((25, 15)) == (255, 255, 255)
+    assert screen.get_at((85, 35)) == (255, 255, 255)
+    # World rects are only read
+    assert units[0].rect.topleft == (500, 500)
+
+    # The unit that left the view loses its stand-in and its last rect is cleared
+    rects = renderer.render(units[:1], (), list, lambda: None, (480, 490))
+    assert list(renderer.screen_sprites) == units[:1]
+    assert len(renderer.sprites) == 1
+    assert pygame.Rect(80, 30, 10, 10) in rects
+    assert screen.get_at((85, 35)) == (0, 0, 0)
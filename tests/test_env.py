@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+
+from agent.env import OBSERVATION_FIELDS, EmpireEnv, SyncVectorEnv
+from src.map_loader import GENERATED_MAP
+
+
+def run(env, seed, steps=10):
+    observations = [env.reset(seed)]
+    rewards = []
+    for step in range(steps):
+        obs, reward, done, info = env.step([step % 2, 1 - step % 2] if step % 4 == 0 else None)
+        observations.append(obs)
+        rewards.append(reward)
+    return np.array(observations), rewards
+
+
+def test_reset_and_step_shapes():
+    env = EmpireEnv('map_1', villagers=2, ticks_per_step=5, max_steps=3)
+    obs = env.reset(0)
+    assert obs.shape == (len(OBSERVATION_FIELDS),) and obs.dtype == np.float32
+    for _ in range(3):
+        obs, reward, done, info = env.step()
+    assert done and info['truncated']
+    assert {'wood_workers', 'food_workers'} <= set(info)
+
+
+def test_same_seed_same_run():
+    first = run(EmpireEnv('map_2', villagers=2, ticks_per_step=10), 3)
+    second = run(EmpireEnv('map_2', villagers=2, ticks_per_step=10), 3)
+    np.testing.assert_array_equal(first[0], second[0])
+    assert first[1] == second[1]
+
+
+def test_generated_worlds_follow_the_seed():
+    env = EmpireEnv(GENERATED_MAP, villagers=1)
+    env.reset(1)
+    first = env.state.WORLD_MAP.tiles.copy()
+    env.reset(1)
+    np.testing.assert_array_equal(env.state.WORLD_MAP.tiles, first)
+    env.reset(2)
+    assert (env.state.WORLD_MAP.tiles != first).any()
+    assert env.settings()['world_seed'] == 2
+
+    fixed = EmpireEnv(GENERATED_MAP, villagers=1, world_seed=1)
+    fixed.reset(2)
+    np.testing.assert_array_equal(fixed.state.WORLD_MAP.tiles, first)
+    assert fixed.settings()['world_seed'] == 1
+    assert EmpireEnv('map_1').episode_world_seed() is None
+
+
+def test_one_environment_steps_at_a_time():
+    first, second = EmpireEnv('map_1', villagers=1), EmpireEnv('map_1', villagers=1)
+    first.reset(0)
+    second.reset(0)
+    with first._running_alone():
+        with pytest.raises(RuntimeError):
+            second.step()
+    # Interleaved steps keep to their own worlds
+    first.step()
+    second.step()
+    assert first.board is not second.board
+    assert first.state.clock.get_ticks() == second.state.clock.get_ticks()
+
+
+def test_vector_env_resets_finished_environments():
+    envs = SyncVectorEnv(3, seed=4, villagers=1, ticks_per_step=5, max_steps=2)
+    obs = envs.reset()
+    assert obs.shape == (3, len(OBSERVATION_FIELDS))
+    assert [env.state.random.seed for env in envs.envs] == [4, 5, 6]
+    envs.step()
+    obs, rewards, dones, infos = envs.step([[0], None, [1]])
+    assert dones.all() and len(infos) == 3 and rewards.shape == (3,)
+    # Every environment started over from its seed advanced by the count
+    assert [env.state.random.seed for env in envs.envs] == [7, 8, 9]
+    np.testing.assert_array_equal(obs, np.stack([env.observe() for env in envs.envs]))
+
+
+def test_vector_env_shares_one_grid_batch():
+    envs = SyncVectorEnv(2, villagers=1, ticks_per_step=5, observation='grid')
+    obs = envs.reset()
+    assert not obs.flags.writeable
+    for env, slot in zip(envs.envs, obs):
+        np.testing.assert_array_equal(slot, env.builder.tensor)
+    obs, *_ = envs.step()
+    for env, slot in zip(envs.envs, obs):
+        np.testing.assert_array_equal(slot, env.builder.tensor)
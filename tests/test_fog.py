@@ -0,0 +1,42 @@
+import numpy as np
+
+from src.fog import FogOfWar
+
+
+def test_reveal_returns_only_new_cells():
+    fog = FogOfWar(10, 12, 48)
+    rows, cols = fog.reveal([2, 2, 5], [3, 3, 7])
+    assert sorted(zip(rows.tolist(), cols.tolist())) == [(2, 3), (5, 7)]
+    rows, cols = fog.reveal(2, 3)
+    assert len(rows) == len(cols) == 0
+    assert fog.revealed_count == 2
+    assert fog.is_revealed(5, 7) and not fog.is_revealed(0, 0)
+
+
+def test_disk_reveal_is_clipped_and_counted_once():
+    fog = FogOfWar(10, 10, 48)
+    # Two overlapping disks, one running off the corner
+    rows, cols = fog.reveal([0, 1], [0, 1], radius=2)
+    expected = np.zeros((10, 10), dtype=np.uint8)
+    for row in range(10):
+        for col in range(10):
+            if min((row - r) ** 2 + (col - c) ** 2 for r, c in ((0, 0), (1, 1))) <= 4:
+                expected[row, col] = 1
+    np.testing.assert_array_equal(fog.mask, expected)
+    assert len(rows) == fog.revealed_count == int(expected.sum())
+    assert fog.percent_explored() == 100.0 * expected.sum() / 100
+
+
+def test_revealed_query():
+    fog = FogOfWar(4, 4, 48)
+    fog.reveal(1, 2)
+    result = fog.revealed(np.array([1, 1, -1, 9]), np.array([2, 3, 0, 0]))
+    assert result.tolist() == [True, False, False, False]
+
+
+def test_disabled_fog_starts_revealed():
+    fog = FogOfWar(3, 5, 48, enabled=False)
+    assert fog.revealed_count == 15
+    assert fog.percent_explored() == 100.0
+    rows, _ = fog.reveal(1, 1, radius=3)
+    assert len(rows) == 0
@@ -0,0 +1,57 @@
+import pygame
+import pytest
+
+from agent.env import EmpireEnv
+from src.game_state import current_game_state
+from src.health_bars import BAR_BACKGROUND, BAR_BORDER, BAR_KINDS, HealthBarCache
+
+TILE = 48
+
+
+@pytest.fixture
+def cache():
+    return HealthBarCache()
+
+
+def test_bars_are_shared_per_filled_pixel(cache):
+    half = cache.bar('tree', 0.5, TILE)
+    # 0.8 * 48 = 38.4 pixels wide: both ratios fill 19 of them
+    assert cache.bar('tree', 0.51, TILE) is half
+    assert cache.bar('tree', 0.53, TILE) is not half
+    assert cache.bar('berry_bush', 0.5, TILE) is not half
+    assert cache.bar('tree', -1, TILE) is cache.bar('tree', 0, TILE)
+    assert cache.bar('tree', 2, TILE) is cache.bar('tree', 1, TILE)
+    assert cache.stats() == {'hits': 3, 'misses': 5, 'bars': 5}
+
+
+@pytest.mark.parametrize('kind', sorted(BAR_KINDS))
+@pytest.mark.parametrize('ratio', [0, 0.3, 0.77, 1])
+def test_bars_match_drawing_in_place(cache, monkeypatch, kind, ratio):
+    monkeypatch.setattr(current_game_state, 'TILE_SIZE', TILE)
+    width_factor, height, color = BAR_KINDS[kind]
+    width = TILE * width_factor
+    rect = pygame.Rect(200, 100, TILE, TILE)
+    offset = (150, 40)
+    x = round(rect.centerx - offset[0] - width // 2)
+    expected = pygame.Surface((200, 200))
+    bar = (x, rect.top - offset[1], width, height)
+    pygame.draw.rect(expected, BAR_BACKGROUND, bar)
+    pygame.draw.rect(expected, color, (bar[0], bar[1], int(width * ratio), height))
+    pygame.draw.rect(expected, BAR_BORDER, bar, 1)
+    screen = pygame.Surface((200, 200))
+    drawn = cache.draw(screen, kind, ratio, rect, offset)
+    assert drawn == pygame.Rect(x, rect.top - offset[1], round(width), height)
+    assert pygame.image.tobytes(screen, 'RGB') == pygame.image.tobytes(expected, 'RGB')
+
+
+def test_only_damaged_resources_get_bars():
+    env = EmpireEnv('map_1', villagers=1)
+    env.reset(0)
+    board = env.board
+    assert not board.damaged_resources
+    env.activate()
+    tree = next(iter(board.tree_sprites))
+    tree.reduce_wood(1)
+    assert board.damaged_resources == {tree}
+    tree.reduce_wood(tree.wood)
+    assert not board.damaged_resources
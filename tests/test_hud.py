@@ -0,0 +1,55 @@
+import pygame
+import pytest
+
+from src.game_state import GameState, current_game_state
+from src.hud import BottomPanel, Label, TextCache
+
+
+@pytest.fixture
+def state(monkeypatch):
+    pygame.font.init()
+    state = GameState()
+    state.WIDTH, state.HEIGHT = 640, 360
+    monkeypatch.setattr(current_game_state, '__dict__', state.__dict__)
+    return current_game_state
+
+
+def test_text_is_rendered_once_per_key():
+    pygame.font.init()
+    cache = TextCache(capacity=2)
+    wood = cache.render('Wood: 1')
+    assert cache.render('Wood: 1') is wood
+    assert cache.render('Wood: 1', size=24) is not wood
+    cache.render('Wood: 1')
+    # The least recently used surface goes first
+    cache.render('Food: 1')
+    assert cache.stats() == {'hits': 2, 'misses': 3, 'surfaces': 2}
+    assert cache.render('Wood: 1') is wood
+    assert cache.stats()['misses'] == 3
+    cache.render('Wood: 1', size=24)
+    assert cache.stats()['misses'] == 4
+
+
+def test_label_reports_changes(state):
+    label = Label()
+    assert label.set('Score: 0', 16, 8)
+    assert not label.set('Score: 0', 16, 8)
+    assert label.set('Score: 0', 16, 32)
+    assert label.set(None, 16, 32) and label.surface is None
+
+
+def test_panel_repaints_only_when_a_label_changes(state):
+    screen = pygame.Surface((640, 480))
+    panel = BottomPanel()
+    assert panel.draw(screen) == pygame.Rect(0, 360, 640, 120)
+    assert panel.draw(screen) is None
+    # Changes go unnoticed until the revision moves on
+    state.wood = 5
+    assert panel.draw(screen) is None
+    state.add_food(0)
+    assert panel.draw(screen) == pygame.Rect(0, 360, 640, 120)
+    assert panel.wood.text == 'Wood: 5'
+    # A new revision with the same text repaints nothing
+    state.mark_changed()
+    assert panel.draw(screen) is None
+    assert panel.draw(screen, force=True) == pygame.Rect(0, 360, 640, 120)
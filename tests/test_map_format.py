@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+
+from src.map_format import COMPRESSION, HEADER, TILE_CODES, MapFormatError, TileMap, encode_tiles, read_map, write_map
+
+
+def random_tiles(rows, cols, seed=0):
+    # Long runs, as real maps have, plus some noise so RLE sees short runs too
+    rng = np.random.default_rng(seed)
+    tiles = np.repeat(rng.integers(0, len(TILE_CODES), size=rows * cols // 8 + 1), 8)[:rows * cols]
+    noise = rng.random(rows * cols) < 0.1
+    tiles[noise] = rng.integers(0, len(TILE_CODES), size=int(noise.sum()))
+    return tiles.reshape(rows, cols).astype(np.uint8)
+
+
+@pytest.mark.parametrize('compression', sorted(COMPRESSION))
+@pytest.mark.parametrize('shape', [(1, 1), (11, 20), (64, 97)])
+def test_round_trip(tmp_path, compression, shape):
+    tiles = random_tiles(*shape)
+    path = tmp_path / 'map.emap'
+    write_map(path, tiles, 48, compression=compression)
+    loaded = read_map(path)
+    np.testing.assert_array_equal(loaded.world_map.tiles, tiles)
+    assert (loaded.width, loaded.height, loaded.tile_size) == (shape[1] * 48, shape[0] * 48, 48)
+
+
+def test_round_trip_keeps_explicit_size(tmp_path):
+    path = tmp_path / 'map.emap'
+    write_map(path, random_tiles(4, 5), 32, width=150, height=120, compression='rle')
+    loaded = read_map(path)
+    assert (loaded.width, loaded.height, loaded.tile_size) == (150, 120, 32)
+
+
+def test_raw_maps_load_read_only(tmp_path):
+    path = tmp_path / 'map.emap'
+    write_map(path, random_tiles(8, 8), 48)
+    tiles = read_map(path).world_map.tiles
+    with pytest.raises(ValueError):
+        tiles[0, 0] = 1
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / 'map.emap'
+    path.write_bytes(b'EMA')
+    with pytest.raises(MapFormatError):
+        read_map(path)
+    path.write_bytes(b'XXXX' + bytes(40))
+    with pytest.raises(MapFormatError):
+        read_map(path)
+
+
+@pytest.mark.parametrize('compression', sorted(COMPRESSION))
+def test_rejects_truncated_payload(tmp_path, compression):
+    path = tmp_path / 'map.emap'
+    write_map(path, random_tiles(16, 16), 48, compression=compression)
+    data = path.read_bytes()
+    path.write_bytes(data[:-10])
+    with pytest.raises(MapFormatError):
+        read_map(path)
+
+
+def test_rejects_run_count_not_matching_the_payload(tmp_path):
+    path = tmp_path / 'map.emap'
+    write_map(path, random_tiles(16, 16), 48, compression='rle')
+    data = bytearray(path.read_bytes())
+    runs = int.from_bytes(data[HEADER.size:HEADER.size + 4], 'little')
+    data[HEADER.size:HEADER.size + 4] = (runs + 1).to_bytes(4, 'little')
+    path.write_bytes(bytes(data))
+    with pytest.raises(MapFormatError):
+        read_map(path)
+
+
+def test_tile_map_indexes_like_lists():
+    names = [['grass', 'tree', 'home'], ['water', 'sand', 'berry_bush']]
+    world_map = TileMap(encode_tiles(names))
+    assert world_map.to_lists() == names
+    assert [list(row) for row in world_map] == names
+    assert world_map[1][2] == 'berry_bush'
+    assert len(world_map) == 2
+    assert world_map.find('home') == (0, 2)
+    assert world_map.find('tree') == (0, 1)
+    assert world_map.count('grass') == 1
+
+
+def test_unknown_tile_type():
+    with pytest.raises(MapFormatError):
+        encode_tiles([['grass', 'lava']])
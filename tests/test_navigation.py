@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+
+from src.navigation import HomeDistanceField
+
+
+def random_walkable(rng, rows, cols, home):
+    walkable = rng.random((rows, cols)) >= 0.35
+    walkable[home] = False
+    return walkable
+
+
+def assert_same_field(field, walkable, home):
+    np.testing.assert_array_equal(field.as_array(), HomeDistanceField(walkable, home).as_array())
+
+
+def test_distances_around_home():
+    walkable = np.ones((5, 5), dtype=bool)
+    walkable[2, 2] = False
+    distance = HomeDistanceField(walkable, (2, 2)).as_array()
+    assert distance[1, 2] == distance[2, 1] == 0
+    assert distance[0, 0] == 3
+    assert distance[2, 2] == -1
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_incremental_updates_match_a_fresh_compute(seed):
+    rng = np.random.default_rng(seed)
+    rows, cols = 24, 31
+    home = (12, 15)
+    walkable = random_walkable(rng, rows, cols, home)
+    field = HomeDistanceField(walkable, home)
+    for _ in range(60):
+        row, col = int(rng.integers(rows)), int(rng.integers(cols))
+        if (row, col) == home:
+            continue
+        if walkable[row, col]:
+            walkable[row, col] = False
+            field.close_cell(row, col)
+        else:
+            walkable[row, col] = True
+            field.open_cell(row, col)
+        assert_same_field(field, walkable, home)
+
+
+def test_next_step_walks_home():
+    walkable = np.ones((6, 6), dtype=bool)
+    walkable[3, 3] = False
+    walkable[1, 1:5] = False
+    field = HomeDistanceField(walkable, (3, 3))
+    row, col = 0, 2
+    for _ in range(20):
+        step = field.next_step(row, col)
+        if step is None:
+            break
+        row, col = row + step[0], col + step[1]
+        assert walkable[row, col]
+    assert field.distance_at(row, col) == 0
+
+
+def test_next_step_without_a_route():
+    walkable = np.ones((4, 4), dtype=bool)
+    walkable[0, 0] = False
+    walkable[:, 2] = False
+    field = HomeDistanceField(walkable, (0, 0))
+    assert field.next_step(3, 3) is None
+    assert field.as_array()[3, 3] == -1
+
+
+def test_changed_since_names_the_repaired_cells():
+    rng = np.random.default_rng(3)
+    rows, cols = 20, 20
+    home = (10, 10)
+    walkable = random_walkable(rng, rows, cols, home)
+    field = HomeDistanceField(walkable, home)
+    copy, revision = field.as_array(), field.revision
+    for row, col in zip(*np.nonzero(~walkable)):
+        if (row, col) == home:
+            continue
+        field.open_cell(int(row), int(col))
+        cells = field.changed_since(revision)
+        copy.reshape(-1)[cells] = field.as_array(cells)
+        np.testing.assert_array_equal(copy, field.as_array())
+        revision = field.revision
+    field.close_cell(0, 0)
+    assert field.changed_since(revision) is None
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from agent.env import EmpireEnv
+from src.navigation import CHANGE_LOG
+from src.observation import CHANNELS, ObservationBuilder
+
+
+def fresh(board):
+    builder = ObservationBuilder(board)
+    builder.detach()
+    return builder.tensor
+
+
+@pytest.mark.parametrize('map_name', ['map_1', 'map_3'])
+def test_incremental_tensor_matches_a_rebuild(map_name):
+    env = EmpireEnv(map_name, villagers=4, food_share=0.5, observation='grid')
+    obs = env.reset(3)
+    revision = env.board.home_navigator.revision
+    for step in range(120):
+        obs, _, done, _ = env.step()
+        if step % 20 == 19 or done:
+            np.testing.assert_array_equal(obs, fresh(env.board))
+        if done:
+            break
+    # Resources were used up, so the home distances changed along the way
+    assert env.board.home_navigator.revision > revision
+
+
+@pytest.mark.parametrize('removed', [3, 400])
+def test_home_distances_catch_up_after_removals(removed):
+    env = EmpireEnv('generated', villagers=1, observation='grid', world_seed=0)
+    env.reset(0)
+    env.activate()
+    builder, navigator = env.builder, env.board.home_navigator
+    for tree in sorted(env.board.tree_sprites, key=lambda tree: tree.rect.topleft)[:removed]:
+        tree.reduce_wood(tree.wood)
+    # A few removals are copied cell by cell; more than the change log
+    # holds rebuild the whole channel
+    assert navigator.revision > builder.distance_revision
+    assert (navigator.changed_since(builder.distance_revision) is None) == (removed > CHANGE_LOG)
+    builder.sync()
+    np.testing.assert_array_equal(builder.observation(), fresh(env.board))
+
+
+def test_views_are_read_only():
+    env = EmpireEnv('map_1', villagers=1, observation='grid')
+    obs = env.reset(0)
+    assert obs.shape == (len(CHANNELS), env.board.grid_rows, env.board.grid_cols)
+    with pytest.raises(ValueError):
+        obs[0, 0, 0] = 1
+    with pytest.raises(ValueError):
+        env.builder.channel('fog')[0, 0] = 1
+    with pytest.raises(ValueError):
+        ObservationBuilder(env.board, np.zeros(obs.shape, dtype=np.float64))
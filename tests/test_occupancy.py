@@ -0,0 +1,85 @@
+import random
+
+import numpy as np
+import pygame
+import pytest
+
+from agent.env import EmpireEnv
+from src.occupancy import BERRY_BUSH, EMPTY, HOME, TREE, WATER, OccupancyGrid, TerrainObstacle
+
+TILE = 48
+
+
+class Obstacle:
+    # Sprites are only asked for their rect
+
+    def __init__(self, row, col, size=TILE):
+        self.rect = pygame.Rect(0, 0, size, size)
+        self.rect.center = (col * TILE + TILE // 2, row * TILE + TILE // 2)
+
+
+def random_grid(seed, rows=20, cols=30):
+    rng = random.Random(seed)
+    grid = OccupancyGrid(rows, cols, TILE)
+    for row in range(rows):
+        for col in range(cols):
+            draw = rng.random()
+            if draw < 0.1:
+                grid.add(Obstacle(row, col, rng.choice([32, TILE])), rng.choice([TREE, BERRY_BUSH, HOME]))
+            elif draw < 0.15:
+                grid.block(row, col, WATER)
+    return grid, rng
+
+
+def overlapping(grid, rect):
+    # Every obstacle and water cell overlapping rect, by brute force
+    hits = {id(sprite) for sprite in grid.obstacles.values() if sprite.rect.colliderect(rect)}
+    for row, col in zip(*np.nonzero(grid.kinds == WATER)):
+        if pygame.Rect(col * TILE, row * TILE, TILE, TILE).colliderect(rect):
+            hits.add((int(row), int(col)))
+    return hits
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_collide_matches_brute_force(seed):
+    grid, rng = random_grid(seed)
+    for _ in range(200):
+        rect = pygame.Rect(rng.randrange(-60, 30 * TILE), rng.randrange(-60, 20 * TILE),
+                           rng.randrange(1, 60), rng.randrange(1, 60))
+        hit = grid.collide(rect)
+        hits = overlapping(grid, rect)
+        if hit is None:
+            assert not hits
+        elif isinstance(hit, TerrainObstacle):
+            assert (hit.rect.top // TILE, hit.rect.left // TILE) in hits
+        else:
+            assert id(hit) in hits
+
+
+def test_add_and_remove_keep_kinds_in_sync():
+    grid = OccupancyGrid(4, 5, TILE)
+    tree, other = Obstacle(1, 2), Obstacle(1, 2)
+    grid.add(tree, TREE)
+    grid.block(3, 0)
+    assert grid.kind_at(1, 2) == TREE and grid.kind_at(3, 0) == WATER
+    assert grid.kind_at(-1, 0) == grid.kind_at(4, 0) == EMPTY
+    assert grid.walkable().sum() == 4 * 5 - 2
+    # Only the sprite standing there clears the cell
+    assert grid.remove(other) == (1, 2)
+    assert grid.kind_at(1, 2) == TREE
+    assert grid.remove(tree) == (1, 2)
+    assert grid.kind_at(1, 2) == EMPTY and (1, 2) not in grid.obstacles
+
+
+def test_depleted_trees_leave_the_board_grid():
+    env = EmpireEnv('map_1', villagers=1)
+    env.reset(0)
+    board = env.board
+    assert (board.occupancy.kinds == TREE).sum() == len(board.tree_sprites)
+    tree = next(iter(board.tree_sprites))
+    row, col = board.occupancy.cell_of(tree)
+    env.activate()
+    tree.reduce_wood(tree.wood)
+    assert board.occupancy.kind_at(row, col) == EMPTY
+    assert board.occupancy.collide(tree.rect) is None
+    assert board.pathfinder.walkable[row, col]
@@ -0,0 +1,115 @@
+from collections import deque
+
+import numpy as np
+import pytest
+
+from src.pathfinding import BlockedCellsPathfinder, GridPathfinder, find_path
+from src.utils import shortest_path
+
+
+def bfs_length(walkable, start, goal):
+    # Cells on a shortest 4-connected path, start and goal included; 0 if
+    # none. Like GridPathfinder, the start cell need not be walkable
+    rows, cols = walkable.shape
+    if start == goal:
+        return 1
+    if not walkable[goal]:
+        return 0
+    seen = {start: 1}
+    queue = deque([start])
+    while queue:
+        row, col = queue.popleft()
+        if (row, col) == goal:
+            return seen[goal]
+        for d_row, d_col in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+            cell = (row + d_row, col + d_col)
+            if 0 <= cell[0] < rows and 0 <= cell[1] < cols and walkable[cell] and cell not in seen:
+                seen[cell] = seen[row, col] + 1
+                queue.append(cell)
+    return 0
+
+
+def random_grid(rng, rows, cols, blocked):
+    return rng.random((rows, cols)) >= blocked
+
+
+def assert_valid_path(walkable, path, start, goal):
+    assert path[0] == start and path[-1] == goal
+    for (row, col), (next_row, next_col) in zip(path, path[1:]):
+        assert abs(row - next_row) + abs(col - next_col) == 1
+    assert all(walkable[cell] for cell in path[1:])
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_path_lengths_match_bfs(seed):
+    rng = np.random.default_rng(seed)
+    rows, cols = rng.integers(1, 30, size=2)
+    walkable = random_grid(rng, rows, cols, blocked=rng.uniform(0, 0.45))
+    pathfinder = GridPathfinder(walkable)
+    for _ in range(10):
+        start = tuple(int(v) for v in rng.integers(0, (rows, cols)))
+        goal = tuple(int(v) for v in rng.integers(0, (rows, cols)))
+        path = pathfinder.find_path(start, goal)
+        assert len(path) == bfs_length(walkable, start, goal)
+        if path:
+            assert_valid_path(walkable, path, start, goal)
+
+
+def test_unreachable_goal():
+    walkable = np.ones((5, 5), dtype=bool)
+    walkable[:, 2] = False
+    assert GridPathfinder(walkable).find_path((0, 0), (0, 4)) == []
+
+
+def test_set_walkable_opens_a_route():
+    walkable = np.ones((5, 5), dtype=bool)
+    walkable[:, 2] = False
+    pathfinder = GridPathfinder(walkable)
+    pathfinder.set_walkable(4, 2)
+    assert len(pathfinder.find_path((0, 0), (0, 4))) == bfs_length(pathfinder.walkable, (0, 0), (0, 4)) == 13
+    pathfinder.set_walkable(4, 2, False)
+    assert pathfinder.find_path((0, 0), (0, 4)) == []
+
+
+def test_blocked_cells_pathfinder_matches_a_fresh_one():
+    rng = np.random.default_rng(7)
+    pathfinder = BlockedCellsPathfinder(20, 20)
+    for _ in range(30):
+        walkable = random_grid(rng, 20, 20, blocked=0.3)
+        blocked = {(int(row), int(col)) for row, col in zip(*np.nonzero(~walkable))}
+        # Out-of-grid obstacles are ignored
+        pathfinder.set_blocked(blocked | {(-1, 3), (20, 0)})
+        np.testing.assert_array_equal(pathfinder.walkable, walkable)
+        start, goal = (0, 0), (19, 19)
+        assert len(pathfinder.find_path(start, goal)) == len(GridPathfinder(walkable).find_path(start, goal))
+
+
+def test_find_path_in_pixels():
+    walkable = np.ones((3, 4), dtype=bool)
+    walkable[0:2, 1] = False
+    path = find_path((24, 24), (24 + 2 * 48, 24), walkable, 48)
+    assert path[0] == (24, 24) and path[-1] == (120, 24)
+    assert len(path) == 7
+    assert find_path((24, 24), (120, 24), GridPathfinder(walkable), 48) == path
+
+
+def test_shortest_path_follows_obstacle_changes():
+    assert len(shortest_path((24, 24), (24 + 4 * 48, 24), 3, 5, tile_size=48)) == 5
+    wall = {(0, 2), (1, 2)}
+    assert len(shortest_path((24, 24), (24 + 4 * 48, 24), 3, 5, wall, tile_size=48)) == 9
+    assert shortest_path((24, 24), (24 + 4 * 48, 24), 3, 5, wall | {(2, 2)}, tile_size=48) == []
+    assert len(shortest_path((24, 24), (24 + 4 * 48, 24), 3, 5, tile_size=48)) == 5
+
+
+def test_expansion_budget():
+    walkable = np.ones((40, 40), dtype=bool)
+    walkable[1:, 20] = False
+    pathfinder = GridPathfinder(walkable)
+    path = pathfinder.find_path((39, 0), (39, 39))
+    needed = pathfinder.nodes_expanded
+    assert not pathfinder.out_of_budget
+    assert pathfinder.find_path((39, 0), (39, 39), max_expansions=needed) == path
+    assert pathfinder.find_path((39, 0), (39, 39), max_expansions=needed - 1) == []
+    assert pathfinder.out_of_budget and pathfinder.nodes_expanded == needed - 1
+    pathfinder.find_path((0, 0), (0, 1), max_expansions=needed - 1)
+    assert not pathfinder.out_of_budget
@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+from agent.env import EmpireEnv
+from agent.replay import ACTIONS, HEADER, TICK, RecordingError, read_recording, replay
+from src import config
+
+ACTIONS_PLAN = [[0, 1, 1, 0], None, [1, None, 0, 0]]
+
+
+def record(path, map_name='map_3', steps=40, seed=5):
+    env = EmpireEnv(map_name, villagers=4, food_share=0.25, ticks_per_step=5)
+    env.reset(seed)
+    env.record(path)
+    for step in range(steps):
+        env.step(ACTIONS_PLAN[step % 3] if step % 10 == 0 else None)
+    env.close_recording()
+    return env
+
+
+def test_replay_matches(tmp_path):
+    path = tmp_path / 'run.erec'
+    env = record(path)
+    settings, actions, expected = read_recording(path)
+    assert settings == env.settings()
+    assert len(expected) == 40 * 5
+    # Steps 0, 20 and 30 give roles (step 10 leaves them to the scheduler)
+    assert sorted(actions) == [0, 100, 150]
+    checksums, recorded, _ = replay(path)
+    np.testing.assert_array_equal(checksums, recorded)
+
+
+def test_replay_of_a_prefix(tmp_path):
+    path = tmp_path / 'run.erec'
+    record(path)
+    checksums, recorded, _ = replay(path, ticks=30)
+    assert len(checksums) == 30
+    np.testing.assert_array_equal(checksums, recorded)
+
+
+def test_replay_detects_other_actions(tmp_path):
+    path = tmp_path / 'run.erec'
+    record(path)
+    data = bytearray(path.read_bytes())
+    # Turn the first villager of the first action record from wood to food
+    first = data.index(b'A', HEADER.size + HEADER.unpack_from(data)[2])
+    data[first + ACTIONS.size] = 1
+    path.write_bytes(bytes(data))
+    checksums, recorded, _ = replay(path)
+    assert (checksums != recorded).any()
+
+
+def test_truncated_recording_keeps_whole_records(tmp_path):
+    path = tmp_path / 'run.erec'
+    record(path, steps=4)
+    data = path.read_bytes()
+    path.write_bytes(data[:-(TICK.size // 2)])
+    _, _, checksums = read_recording(path)
+    assert len(checksums) == 4 * 5 - 1
+
+
+def test_not_a_recording(tmp_path):
+    path = tmp_path / 'run.erec'
+    path.write_bytes(b'EMAP' + bytes(20))
+    with pytest.raises(RecordingError):
+        read_recording(path)
+
+
+def test_refuses_other_config(tmp_path, monkeypatch):
+    path = tmp_path / 'run.erec'
+    record(path, steps=2)
+    monkeypatch.setitem(config.config, 'FOG_OF_WAR', not config.get('FOG_OF_WAR', True))
+    with pytest.raises(RecordingError, match='FOG_OF_WAR'):
+        replay(path)
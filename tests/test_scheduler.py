@@ -0,0 +1,42 @@
+from collections import Counter
+
+import pytest
+
+from agent.env import EmpireEnv
+
+
+def check_reservations(scheduler):
+    targets = Counter(job.target for job in scheduler.jobs.values() if job.target is not None)
+    assert targets == Counter(scheduler.reservations)
+    assert all(count <= scheduler.workers_per_resource for count in targets.values())
+
+
+@pytest.mark.parametrize('map_name, workers_per_resource', [('map_3', 1), ('map_3', 2), ('map_2', 3)])
+def test_never_more_workers_than_allowed(map_name, workers_per_resource):
+    env = EmpireEnv(map_name, villagers=8, food_share=0.5, workers_per_resource=workers_per_resource,
+                    ticks_per_step=5)
+    env.reset(1)
+    busiest = 0
+    for step in range(150):
+        env.step([step % 2] * 8 if step % 40 == 20 else None)
+        check_reservations(env.scheduler)
+        busiest = max([busiest] + list(env.scheduler.reservations.values()))
+    # Eight villagers on a handful of resources do share them
+    assert busiest == workers_per_resource
+
+
+def test_roles_follow_the_food_share():
+    env = EmpireEnv('map_2', villagers=8, food_share=0.25)
+    env.reset(0)
+    roles = Counter(job.role for job in env.scheduler.jobs.values())
+    assert roles == {'wood': 6, 'food': 2}
+
+
+def test_set_roles():
+    env = EmpireEnv('map_3', villagers=4, food_share=0.0, ticks_per_step=30)
+    env.reset(0)
+    for _ in range(20):
+        env.step([1, 1, 0, None])
+    jobs = list(env.scheduler.jobs.values())
+    assert [job.role for job in jobs[:3]] == ['food', 'food', 'wood']
+    assert jobs[3].wanted is None
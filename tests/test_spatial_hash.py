@@ -0,0 +1,88 @@
+import random
+
+import pygame
+import pytest
+
+from src.spatial_hash import SpatialHash
+
+
+class Item:
+    # Plain hashable items, as sprites are
+
+    def __init__(self, name):
+        self.name = name
+
+    def __repr__(self):
+        return self.name
+
+
+def populate(seed, count=150, cell_size=48):
+    rng = random.Random(seed)
+    index = SpatialHash(cell_size)
+    rects = {}
+    for number in range(count):
+        item = Item(f'item{number}')
+        rect = pygame.Rect(rng.randrange(-200, 2000), rng.randrange(-200, 1500), rng.choice([16, 48, 96]), 48)
+        index.update(item, rect)
+        rects[item] = rect
+    return index, rects, rng
+
+
+def manhattan(rect, x, y):
+    return abs(rect.centerx - x) + abs(rect.centery - y)
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_rect_and_radius_queries_match_brute_force(seed):
+    index, rects, rng = populate(seed)
+    for _ in range(30):
+        query = pygame.Rect(rng.randrange(-300, 2000), rng.randrange(-300, 1500), rng.randrange(1, 400), rng.randrange(1, 400))
+        assert set(index.query_rect(query)) == {item for item, rect in rects.items() if rect.colliderect(query)}
+        x, y, radius = rng.randrange(0, 1800), rng.randrange(0, 1300), rng.randrange(0, 300)
+        expected = {item for item, rect in rects.items()
+                    if (rect.centerx - x) ** 2 + (rect.centery - y) ** 2 <= radius * radius}
+        assert set(index.query_radius(x, y, radius)) == expected
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_pair_queries_match_brute_force(seed):
+    index, rects, _ = populate(seed, count=300)
+    items = list(rects)
+    expected = {frozenset((a, b)) for i, a in enumerate(items) for b in items[i + 1:]
+                if rects[a].colliderect(rects[b])}
+    pairs = [frozenset(pair) for pair in index.colliding_pairs()]
+    assert len(pairs) == len(set(pairs))
+    assert set(pairs) == expected
+    candidates = {frozenset(pair) for pair in index.candidate_pairs()}
+    assert expected <= candidates
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_nearest_matches_brute_force(seed):
+    index, rects, rng = populate(seed)
+    for _ in range(30):
+        x, y, k = rng.randrange(-500, 2500), rng.randrange(-500, 2000), rng.randrange(1, 8)
+        found = index.nearest(x, y, k)
+        distances = sorted(manhattan(rect, x, y) for rect in rects.values())[:k]
+        assert [manhattan(rects[item], x, y) for item in found] == distances
+        limited = index.nearest(x, y, k, max_distance=150)
+        assert [manhattan(rects[item], x, y) for item in limited] == [d for d in distances if d <= 150]
+
+
+def test_update_and_remove():
+    index = SpatialHash(48)
+    item = Item('tree')
+    index.update(item, pygame.Rect(0, 0, 48, 48))
+    assert index.query_rect(pygame.Rect(10, 10, 1, 1)) == [item]
+    index.update(item, pygame.Rect(480, 480, 48, 48))
+    assert index.query_rect(pygame.Rect(10, 10, 1, 1)) == []
+    assert index.nearest(0, 0) == [item]
+    index.remove(item)
+    assert item not in index and len(index) == 0
+    assert index.nearest(0, 0) == [] and not index.buckets
+
+
+def test_rect_ending_on_a_border_stays_in_its_cell():
+    index = SpatialHash(48)
+    index.update(Item('a'), pygame.Rect(0, 0, 48, 48))
+    assert list(index.buckets) == [(0, 0)]
@@ -0,0 +1,140 @@
+import random
+
+import pygame
+import pytest
+
+from src import current_game_state
+from src.board import Board
+from src.camera import Camera
+from src.map_loader import load_map
+from src.terrain import TerrainLayer
+
+TILE = 8
+ROWS, COLS = 40, 50
+VIEW = (96, 64)
+
+
+def cell_color(row, col, version=0):
+    return (row * 5 % 256, col * 5 % 256, version * 60 % 256)
+
+
+class Ground:
+    # draw_cell callback painting each cell a colour of its own; bump
+    # versions[(row, col)] to change a cell
+
+    def __init__(self):
+        self.versions = {}
+        self.calls = 0
+
+    def __call__(self, surface, row, col, origin):
+        self.calls += 1
+        rect = pygame.Rect(col * TILE - origin[0], row * TILE - origin[1], TILE, TILE)
+        surface.fill(cell_color(row, col, self.versions.get((row, col), 0)), rect)
+
+    def render(self, view_rect):
+        # The whole world painted from scratch, cut to view_rect
+        world = pygame.Surface((COLS * TILE, ROWS * TILE))
+        for row in range(ROWS):
+            for col in range(COLS):
+                self(world, row, col, (0, 0))
+        self.calls -= ROWS * COLS
+        return world.subsurface(view_rect)
+
+
+def same_pixels(a, b):
+    return pygame.image.tobytes(a, 'RGB') == pygame.image.tobytes(b, 'RGB')
+
+
+def test_camera_stays_inside_the_world():
+    camera = Camera((100, 80), (400, 300))
+    camera.move(-50, -50)
+    assert camera.offset == (0, 0)
+    camera.move(1000, 1000)
+    assert camera.rect == pygame.Rect(300, 220, 100, 80)
+    camera.center_on(200, 150)
+    assert camera.rect.center == (200, 150)
+    # A view larger than the world shrinks to it
+    assert Camera((800, 600), (400, 300)).rect == pygame.Rect(0, 0, 400, 300)
+
+
+def test_camera_converts_between_screen_and_world():
+    camera = Camera((100, 80), (400, 300))
+    camera.move(120, 40)
+    rect = pygame.Rect(150, 60, 10, 10)
+    screen = camera.to_screen(rect)
+    assert screen.topleft == (30, 20)
+    assert camera.to_world(screen.topleft) == rect.topleft
+    assert camera.screen_rect() == pygame.Rect(0, 0, 100, 80)
+
+
+@pytest.mark.parametrize('chunk_size', [4, 7, 32])
+def test_composed_view_matches_a_full_render(chunk_size):
+    ground = Ground()
+    layer = TerrainLayer(VIEW, TILE, (ROWS, COLS), ground, chunk_size=chunk_size, capacity=6)
+    camera = Camera(VIEW, (COLS * TILE, ROWS * TILE))
+    rng = random.Random(chunk_size)
+    for _ in range(30):
+        camera.move(rng.randrange(-80, 81), rng.randrange(-80, 81))
+        layer.flush(camera.rect)
+        assert same_pixels(layer.surface, ground.render(camera.rect))
+    assert len(layer.chunks) <= 6
+
+
+def test_flush_repaints_only_dirty_cells():
+    ground = Ground()
+    layer = TerrainLayer(VIEW, TILE, (ROWS, COLS), ground, chunk_size=4)
+    camera = Camera(VIEW, (COLS * TILE, ROWS * TILE))
+    camera.move(20, 12)
+    assert layer.flush(camera.rect) == [pygame.Rect((0, 0), VIEW)]
+    assert layer.flush(camera.rect) == []
+
+    ground.versions[(3, 5)] = ground.versions[(30, 40)] = 1
+    layer.mark_dirty(3, 5)
+    layer.mark_dirty(30, 40)
+    calls = ground.calls
+    # (30, 40) is in no baked chunk, so only (3, 5) is repainted
+    assert layer.flush(camera.rect) == [pygame.Rect(5 * TILE - 20, 3 * TILE - 12, TILE, TILE)]
+    assert ground.calls == calls + 1
+    assert same_pixels(layer.surface, ground.render(camera.rect))
+
+    camera.move(TILE, 0)
+    assert layer.flush(camera.rect) == [pygame.Rect((0, 0), VIEW)]
+    assert same_pixels(layer.surface, ground.render(camera.rect))
+
+
+def test_chunks_are_evicted_least_recently_used_first():
+    ground = Ground()
+    layer = TerrainLayer(VIEW, TILE, (ROWS, COLS), ground, chunk_size=4, capacity=3)
+    for key in [(0, 0), (0, 1), (0, 2), (0, 0), (0, 3)]:
+        layer.chunk(key)
+    assert list(layer.chunks) == [(0, 2), (0, 0), (0, 3)]
+    assert layer.stats() == {'loaded': 3, 'baked': 4, 'evicted': 1}
+    # Dirty cells of an evicted chunk go with it
+    layer.mark_dirty(1, 9)
+    layer.chunk((0, 4))
+    assert (0, 2) not in layer.dirty
+
+
+def test_scrolling_leaves_units_alone():
+    pygame.init()
+    width, height, tile_size, world_map = load_map('map_1')
+    current_game_state.WIDTH, current_game_state.HEIGHT = width, height
+    current_game_state.TILE_SIZE, current_game_state.WORLD_MAP = tile_size, world_map
+    current_game_state.VIEW_WIDTH, current_game_state.VIEW_HEIGHT = 640, 360
+    pygame.display.set_mode((640, 480))
+    board = Board()
+    for _ in range(10):
+        board.add_scout()
+    board.update()
+    revision, pos = board.units.revision, board.units.pos.copy()
+    seen = 0
+    for dx, dy in [(0, 0), (30, 5), (-50, 5), (400, 200)]:
+        board.camera.move(dx, dy)
+        board.draw()
+        assert board.units.revision == revision
+        assert (board.units.pos == pos).all()
+        for unit in board.visible_units:
+            sprite = board.renderer.screen_sprites[unit]
+            assert sprite.rect == board.camera.to_screen(unit.rect)
+            seen += 1
+    assert seen
@@ -0,0 +1,104 @@
+import numpy as np
+import pytest
+
+from src.animation import AnimationClock
+from src.units import ALL_PAIRS_LIMIT, DOWN, LEFT, RIGHT, UnitStore
+
+WORLD = (400, 300)
+
+
+def new_store(capacity=4):
+    return UnitStore(capacity, seed=0, clock=AnimationClock())
+
+
+def test_removed_slots_are_reused():
+    store = new_store(2)
+    slots = [store.add((10 * i, 0, 8, 8), 1) for i in range(3)]
+    assert slots == [0, 1, 2] and store.capacity == 4
+    store.remove(1)
+    store.remove(1)
+    assert len(store) == 2 and store.indices().tolist() == [0, 2]
+    assert store.add((50, 50, 4, 4), 2) == 1
+    assert store.rect(1).topleft == (50, 50) and store.speed[1] == 2
+    assert store.indices().tolist() == [0, 1, 2]
+
+
+def test_step_moves_along_the_normalized_direction():
+    store = new_store()
+    unit = store.add((100, 100, 10, 10), 3)
+    store.dir[:, unit] = (1, 1)
+    revision = store.revision
+    store.step(0, *WORLD)
+    # 3 / sqrt(2) = 2.12 per axis, rounded like pygame rounds
+    assert store.rect(unit).topleft == (102, 102)
+    assert store.revision > revision
+    assert store.walking[unit] and store.facing[unit] == DOWN
+
+
+def test_step_clamps_to_the_world_and_reverses():
+    store = new_store()
+    unit = store.add((385, 100, 10, 10), 10, reverses=True)
+    store.dir[:, unit] = (1, 0)
+    store.facing[unit] = RIGHT
+    store.step(0, *WORLD)
+    assert store.rect(unit).left == WORLD[0] - 10
+    assert store.reverse[unit]
+    store.step(0, *WORLD)
+    assert store.dir[0, unit] == -1 and store.facing[unit] == LEFT
+    assert store.rect(unit).left == WORLD[0] - 20
+
+
+def pairs_by_brute_force(store):
+    index = store.indices().tolist()
+    rects = {i: store.rect(i) for i in index}
+    return {(a, b) for a in index for b in index if a < b and rects[a].colliderect(rects[b])}
+
+
+@pytest.mark.parametrize('count', [ALL_PAIRS_LIMIT // 2, ALL_PAIRS_LIMIT * 8])
+@pytest.mark.parametrize('spread', [300, 3000])
+def test_collide_units_matches_brute_force(count, spread):
+    rng = np.random.default_rng(count + spread)
+    store = new_store()
+    for x, y, w, h in zip(*rng.integers(0, spread, size=(2, count)), *rng.integers(4, 40, size=(2, count))):
+        store.add((int(x), int(y), int(w), int(h)), 1)
+    for slot in rng.choice(count, size=count // 10, replace=False).tolist():
+        store.remove(slot)
+    a, b = store.collide_units(32)
+    pairs = {(min(i, j), max(i, j)) for i, j in zip(a.tolist(), b.tolist())}
+    assert len(pairs) == len(a)
+    assert pairs == pairs_by_brute_force(store)
+    assert set(np.flatnonzero(store.reverse).tolist()) == {i for pair in pairs for i in pair}
+
+
+def test_collide_terrain_sends_units_back():
+    kinds = np.zeros((6, 8), dtype=np.int8)
+    kinds[2, 3] = 1
+    store = new_store()
+    unit = store.add((20, 15, 8, 8), 4)
+    other = store.add((60, 40, 8, 8), 4)
+    store.dir[:, unit] = (1, 0)
+    store.step(0, 80, 60)
+    # The unit now covers cells (1..2, 2..3)
+    slots, rows, cols = store.collide_terrain(kinds, 10)
+    assert slots.tolist() == [unit] and (rows.tolist(), cols.tolist()) == ([2], [3])
+    assert store.rect(unit).topleft == (20, 15) and store.reverse[unit]
+    assert not store.reverse[other]
+    # Sending it back moved it, but nothing overlaps the cell any more
+    assert store.collide_terrain(kinds, 10)[0].tolist() == []
+    # Without moves nothing is looked up
+    kinds[:] = 1
+    assert store.collide_terrain(kinds, 10)[0].tolist() == []
+
+
+def test_moved_cells_reports_units_that_changed_cell():
+    store = new_store()
+    still = store.add((0, 0, 10, 10), 1)
+    walker = store.add((12, 0, 10, 10), 4)
+    slots, rows, cols = store.moved_cells(20)
+    assert slots.tolist() == [still, walker] and cols.tolist() == [0, 0]
+    store.dir[:, walker] = (1, 0)
+    store.step(0, *WORLD)
+    # walker's center went from x 17 to 21
+    slots, rows, cols = store.moved_cells(20)
+    assert slots.tolist() == [walker] and (rows.tolist(), cols.tolist()) == ([0], [1])
+    assert store.moved_cells(20)[0].tolist() == []
@@ -0,0 +1,62 @@
+import warnings
+
+import numpy as np
+import pytest
+
+from src.map_format import TILE_CODES
+from src.noise import NoiseField
+from src.worldgen import FIELDS, WorldParams, chunks, fill_fields, generate_world, generate_world_parallel
+
+
+def test_same_seed_same_world():
+    np.testing.assert_array_equal(generate_world(40, 50, seed=3), generate_world(40, 50, seed=3))
+    assert not np.array_equal(generate_world(40, 50, seed=3), generate_world(40, 50, seed=4))
+
+
+def test_noise_windows_agree_on_shared_cells():
+    noise = NoiseField(5, period=16, octaves=3)
+    whole = noise.generate(70, 90)
+    np.testing.assert_array_equal(noise.window(13, 29, 40, 33), whole[13:53, 29:62])
+    for row0, col0, window in noise.tiles(70, 90, tile=32):
+        np.testing.assert_array_equal(window, whole[row0:row0 + window.shape[0], col0:col0 + window.shape[1]])
+
+
+def test_chunked_fields_have_no_seams():
+    params = WorldParams(seed=2)
+    rows, cols = 75, 101
+    whole = np.empty((len(FIELDS), rows, cols), dtype=np.float32)
+    fill_fields(params, whole, 0, 0, rows, cols)
+    chunked = np.full_like(whole, np.nan)
+    windows = chunks(rows, cols, size=32)
+    for window in windows:
+        fill_fields(params, chunked, *window)
+    np.testing.assert_array_equal(chunked, whole)
+    assert sum(window_rows * window_cols for _, _, window_rows, window_cols in windows) == rows * cols
+
+
+def test_parallel_matches_serial():
+    params = WorldParams(seed=7)
+    serial = generate_world(90, 130, seed=7)
+    np.testing.assert_array_equal(generate_world_parallel(90, 130, params, workers=2, chunk=40), serial)
+
+
+def test_densities_and_home():
+    tiles = generate_world(128, 128, seed=1)
+    counts = {name: np.count_nonzero(tiles == code) / tiles.size for name, code in TILE_CODES.items()}
+    assert counts['home'] == pytest.approx(1 / tiles.size)
+    assert counts['water'] == pytest.approx(0.08, abs=0.01)
+    assert counts['tree'] == pytest.approx(0.12, abs=0.02)
+    assert counts['berry_bush'] > 0
+    # Home stands on grass with free cells all around it
+    row, col = np.argwhere(tiles == TILE_CODES['home'])[0]
+    around = tiles[row - 1:row + 2, col - 1:col + 2].copy()
+    around[1, 1] = TILE_CODES['grass']
+    assert (around == TILE_CODES['grass']).all()
+
+
+@pytest.mark.parametrize('side', [1, 2, 3])
+def test_tiny_maps(side):
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        tiles = generate_world(side, side, seed=0)
+    assert tiles.shape == (side, side)